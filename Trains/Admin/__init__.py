@@ -0,0 +1,20 @@
+from Trains.Utils.lazy import lazy_exports
+
+# the submodules are imported on first use of one of their names: BatchedGames needs NumPy, ResultsStore sqlite3,
+# and the Manager and WarmPool multiprocessing
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BatchedGames": "batched_games",
+    "DRAW_CARDS": "batched_games",
+    "Manager": "manager",
+    "TournamentResult": "manager",
+    "GameResult": "referee",
+    "Referee": "referee",
+    "make_deck": "referee",
+    "play_game": "referee",
+    "RefereeGameState": "referee_game_state",
+    "ResultsStore": "results_store",
+    "score_players": "scoring",
+    "TimeBudget": "time_budget",
+    "play_game_with_deadlines": "time_budget",
+    "WarmPool": "warm_pool",
+})
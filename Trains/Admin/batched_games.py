@@ -0,0 +1,250 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Trains.Admin.scoring import score_players
+from Trains.Common.constants import CONNECTION, GAME
+from Trains.Common.map import COLORS, Color, Map, sort_destinations
+from Trains.Common.player_game_state import PlayerGameState
+
+# Actions: DRAW_CARDS, or 1 + the id (in the map's ConnectionIndex) of the connection to acquire.
+DRAW_CARDS = 0
+
+
+class BatchedGames:
+    """
+    Plays num_games independent games of Trains on the same map in lockstep, with every game's state held in NumPy
+    arrays, so that one step applies one move per game with a handful of vectorized operations. Meant for
+    generating self-play data, with an API like a vectorized gym environment: reset() and step(actions), where
+    finished games are scored and immediately restarted.
+
+    The rules are the Referee's, except for the destinations: seat i always gets the (2i)th and (2i + 1)th of the
+    map's sorted destinations, i.e. what the Referee hands out when every player keeps the first two destinations
+    it is offered (like Hold10Strategy). An invalid action (an illegal or unknown connection) ejects the player, whose
+    connections become available again.
+
+    State, by game (K games, P players, C connections, colors in COLORS order):
+        - owner: int8 [K, C], the seat owning each connection, or -1
+        - cards: int32 [K, P, 4], rails: int32 [K, P], alive: bool [K, P]
+        - decks: int8 [K, NUM_TOTAL_CARDS], color ids, and deck_positions: int32 [K], the next card of each deck
+        - active: int32 [K], the seat whose turn it is
+    """
+    def __init__(self, trains_map: Map, num_players: int, num_games: int, *, seed: Optional[int] = None):
+        if not (
+            isinstance(num_players, int)
+            and GAME.MIN_PLAYERS_PER_GAME <= num_players <= GAME.MAX_PLAYERS_PER_GAME
+        ):
+            raise ValueError(f"Number of players must be between {GAME.MIN_PLAYERS_PER_GAME} and "
+                             f"{GAME.MAX_PLAYERS_PER_GAME}.")
+        if not (isinstance(num_games, int) and num_games > 0):
+            raise ValueError("Number of games must be a positive integer.")
+        destinations = sort_destinations(trains_map.get_destinations())
+        num_needed = GAME.NUM_DESTINATION_OPTIONS + GAME.NUM_DESTINATIONS_PER_PLAYER * (num_players - 1)
+        if len(destinations) < num_needed:
+            raise ValueError(f"Map must have at least {num_needed} destinations for {num_players} players.")
+        per_player = GAME.NUM_DESTINATIONS_PER_PLAYER
+        self.__destinations = [set(destinations[i * per_player:(i + 1) * per_player]) for i in range(num_players)]
+
+        self.__trains_map = trains_map
+        self.__connections = trains_map.get_connection_index().get_connections()
+        color_ids = {color: i for i, color in enumerate(COLORS)}
+        self.lengths = np.array([c.get_length() for c in self.__connections], dtype=np.int32)
+        self.colors = np.array([color_ids[c.get_color()] for c in self.__connections], dtype=np.int64)
+        self.num_players = num_players
+        self.num_games = num_games
+        self.num_connections = len(self.__connections)
+        self.__rng = np.random.default_rng(seed)
+
+        shape = (num_games, num_players)
+        self.owner = np.full((num_games, self.num_connections), -1, dtype=np.int8)
+        self.cards = np.zeros(shape + (len(COLORS),), dtype=np.int32)
+        self.rails = np.zeros(shape, dtype=np.int32)
+        self.alive = np.zeros(shape, dtype=bool)
+        self.decks = np.zeros((num_games, GAME.NUM_TOTAL_CARDS), dtype=np.int8)
+        self.deck_positions = np.zeros(num_games, dtype=np.int32)
+        self.active = np.zeros(num_games, dtype=np.int32)
+        # turns left in the last round, or -1 before it starts
+        self.__last_round = np.full(num_games, -1, dtype=np.int32)
+        self.__turns_without_change = np.zeros(num_games, dtype=np.int32)
+
+    @staticmethod
+    def deck_to_ids(deck: List[Color]) -> np.ndarray:
+        """
+        Turn a deck (e.g. from make_deck) into color ids, for reset().
+        """
+        color_ids = {color: i for i, color in enumerate(COLORS)}
+        return np.array([color_ids[color] for color in deck], dtype=np.int8)
+
+    def reset(self, *, decks: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Start every game over, with the given decks ([K, NUM_TOTAL_CARDS] color ids) or random ones, and return the
+        first observation.
+        """
+        self.__restart(np.ones(self.num_games, dtype=bool), decks)
+        return self.observe()
+
+    def __restart(self, games: np.ndarray, decks: Optional[np.ndarray] = None) -> None:
+        num_restarted = int(games.sum())
+        if decks is None:
+            decks = self.__rng.integers(0, len(COLORS), (num_restarted, GAME.NUM_TOTAL_CARDS), dtype=np.int8)
+        elif decks.shape != (num_restarted, GAME.NUM_TOTAL_CARDS):
+            raise ValueError(f"Decks must be an array of shape ({num_restarted}, {GAME.NUM_TOTAL_CARDS}).")
+        self.decks[games] = decks
+        self.owner[games] = -1
+        self.rails[games] = GAME.INITIAL_NUM_RAILS
+        self.alive[games] = True
+        self.active[games] = 0
+        self.__last_round[games] = -1
+        self.__turns_without_change[games] = 0
+        # seat i is dealt the cards at positions NUM_INITIAL_CARDS * i and after
+        dealt = self.decks[games, :GAME.NUM_INITIAL_CARDS * self.num_players].reshape(
+            num_restarted, self.num_players, GAME.NUM_INITIAL_CARDS
+        )
+        self.cards[games] = (dealt[..., None] == np.arange(len(COLORS))).sum(axis=2, dtype=np.int32)
+        self.deck_positions[games] = GAME.NUM_INITIAL_CARDS * self.num_players
+
+    def observe(self) -> Dict[str, np.ndarray]:
+        """
+        Return the state of every game, and the legal actions of its active player (see legal_actions).
+        The arrays are the environment's own, not copies: do not modify them.
+        """
+        return {
+            "owner": self.owner,
+            "cards": self.cards,
+            "rails": self.rails,
+            "alive": self.alive,
+            "active": self.active,
+            "legal": self.legal_actions(),
+        }
+
+    def legal_actions(self) -> np.ndarray:
+        """
+        Return a bool array [K, 1 + C] of the actions the active player of each game may take: drawing cards is
+        always legal, and acquiring a connection is legal if nobody owns it and the player has enough rails and
+        cards of its color.
+        """
+        games = np.arange(self.num_games)
+        rails = self.rails[games, self.active][:, None]
+        cards = self.cards[games, self.active][:, self.colors]
+        legal = np.empty((self.num_games, 1 + self.num_connections), dtype=bool)
+        legal[:, DRAW_CARDS] = True
+        legal[:, 1:] = (self.owner == -1) & (rails >= self.lengths) & (cards >= self.lengths)
+        return legal
+
+    def step(self, actions: Any) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Apply the active player's action in every game, and move every game on to its next turn.
+        Returns the observation, rewards, dones and info:
+            - rewards: float [K, P], every player's final score in games that just finished, 0 otherwise (and for
+              ejected players)
+            - dones: bool [K], the games that just finished; they are restarted, so the observation is of the
+              restarted game
+            - info: "winners" and "ejected", bool [K, P], for the games that just finished
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_games,):
+            raise ValueError(f"Actions must be an array of shape ({self.num_games},).")
+        games = np.arange(self.num_games)
+        active = self.active
+
+        draw = actions == DRAW_CARDS
+        in_range = (actions >= 1) & (actions <= self.num_connections)
+        connections = np.where(in_range, actions - 1, 0)
+        lengths = self.lengths[connections]
+        colors = self.colors[connections]
+        acquire = (
+            in_range
+            & (self.owner[games, connections] == -1)
+            & (self.rails[games, active] >= lengths)
+            & (self.cards[games, active, colors] >= lengths)
+        )
+        eject = ~draw & ~acquire
+
+        acquiring = games[acquire]
+        self.owner[acquiring, connections[acquire]] = active[acquire]
+        self.rails[acquiring, active[acquire]] -= lengths[acquire]
+        self.cards[acquiring, active[acquire], colors[acquire]] -= lengths[acquire]
+
+        num_drawn = np.where(
+            draw, np.minimum(GAME.NUM_CARDS_PER_DRAW, GAME.NUM_TOTAL_CARDS - self.deck_positions), 0
+        )
+        for i in range(GAME.NUM_CARDS_PER_DRAW):
+            drawing = games[num_drawn > i]
+            drawn = self.decks[drawing, self.deck_positions[drawing] + i]
+            self.cards[drawing, active[drawing], drawn] += 1
+        self.deck_positions += num_drawn.astype(np.int32)
+
+        self.alive[games[eject], active[eject]] = False
+        self.owner[(self.owner == active[:, None].astype(np.int8)) & eject[:, None]] = -1
+        num_alive = self.alive.sum(axis=1)
+
+        starts_last_round = ~eject & (self.__last_round < 0) & (self.rails[games, active] < min(CONNECTION.LENGTHS))
+        # the next seat in turn order that is still in the game
+        seats = (active[:, None] + np.arange(1, self.num_players + 1)) % self.num_players
+        next_seats = seats[games, np.argmax(self.alive[games[:, None], seats], axis=1)]
+        self.active = np.where(num_alive > 0, next_seats, active).astype(np.int32)
+
+        changed = acquire | (num_drawn > 0) | eject
+        self.__turns_without_change = np.where(changed, 0, self.__turns_without_change + 1).astype(np.int32)
+        in_last_round = self.__last_round >= 0
+        self.__last_round[in_last_round] -= 1
+        dones = (
+            (in_last_round & (self.__last_round <= 0))
+            | (self.__turns_without_change >= num_alive)
+            | (num_alive == 0)
+        )
+        # counted from the next turn, so that the player who started the last round gets one more turn too
+        self.__last_round[starts_last_round] = num_alive[starts_last_round]
+
+        rewards = np.zeros((self.num_games, self.num_players), dtype=np.float64)
+        winners = np.zeros((self.num_games, self.num_players), dtype=bool)
+        ejected = ~self.alive & dones[:, None]
+        for game in np.flatnonzero(dones):
+            remaining = np.flatnonzero(self.alive[game])
+            if len(remaining) == 0:
+                continue
+            scores = score_players(self.__player_game_states(game))
+            rewards[game, remaining] = scores
+            winners[game, remaining] = np.array(scores) == max(scores)
+        if dones.any():
+            self.__restart(dones)
+        return self.observe(), rewards, dones, {"winners": winners, "ejected": ejected}
+
+    def __player_game_states(self, game: int) -> List[PlayerGameState]:
+        """
+        Return the states of the players still in the given game, in turn order, as the Referee would hold them.
+        """
+        seats = np.flatnonzero(self.alive[game])
+        total_conns = [
+            set(self.__connections[c] for c in np.flatnonzero(self.owner[game] == seat)) for seat in seats
+        ]
+        return [
+            PlayerGameState.trusted(
+                acquired_connections=total_conns[i],
+                destinations=set(self.__destinations[seat]),
+                num_rails=int(self.rails[game, seat]),
+                cards={color: int(self.cards[game, seat, j]) for j, color in enumerate(COLORS)},
+                total_acquired_connections=total_conns,
+                index=i
+            )
+            for i, seat in enumerate(seats)
+        ]
+
+    def get_player_game_state(self, game: int) -> PlayerGameState:
+        """
+        Return the state of the active player of the given game, e.g. to ask an IStrategy for its move.
+        """
+        seats = list(np.flatnonzero(self.alive[game]))
+        return self.__player_game_states(game)[seats.index(self.active[game])]
+
+    def move_to_action(self, move: Any) -> int:
+        """
+        Turn an IStrategy's Move into an action. A connection that is not in the map becomes an action that ejects
+        the player, as it would be in a Referee's game.
+        """
+        if move.is_card_request():
+            return DRAW_CARDS
+        index = self.__trains_map.get_connection_index()
+        if not index.has_connection(move.get_connection()):
+            return -1
+        return 1 + index.get_id(move.get_connection())
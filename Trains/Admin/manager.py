@@ -0,0 +1,240 @@
+import asyncio
+import math
+import random
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Generator, List, Optional, Tuple
+
+from Trains.Admin.referee import GameResult, PlayerCall, Referee, make_deck
+from Trains.Admin.results_store import ResultsStore, strategy_name
+from Trains.Admin.time_budget import TimeBudget
+from Trains.Admin.warm_pool import WarmPool, play_game_on
+from Trains.Common.constants import GAME
+from Trains.Common.map import Color, Map
+from Trains.Player.strategy import IStrategy
+from Trains.Remote.server import run_steps_async
+
+BACKENDS = ("thread", "process", "asyncio")
+
+# One round of a tournament: the tournament ids of the players of each game, and that game's result.
+Round = List[Tuple[List[int], GameResult]]
+# A game to be played: the tournament ids of its players, in seat order, and its deck.
+Game = Tuple[List[int], List[Color]]
+
+
+def allocate_game_sizes(num_players: int) -> List[int]:
+    """
+    Split num_players players into as few games as possible (each of at most MAX_PLAYERS_PER_GAME players) whose
+    sizes differ by at most one, largest games first.
+    Raises ValueError if there are too few players for even one game.
+    """
+    if num_players < GAME.MIN_PLAYERS_PER_GAME:
+        raise ValueError(f"Need at least {GAME.MIN_PLAYERS_PER_GAME} players for a game.")
+    num_games = math.ceil(num_players / GAME.MAX_PLAYERS_PER_GAME)
+    size, num_larger = divmod(num_players, num_games)
+    return [size + 1] * num_larger + [size] * (num_games - num_larger)
+
+
+def partition_players(player_ids: List[int], rng: Optional[random.Random] = None) -> List[List[int]]:
+    """
+    Seat the given players in games sized by allocate_game_sizes, in a random order if rng is given.
+    """
+    player_ids = list(player_ids)
+    if rng is not None:
+        rng.shuffle(player_ids)
+    games = []
+    start = 0
+    for size in allocate_game_sizes(len(player_ids)):
+        games.append(player_ids[start:start + size])
+        start += size
+    return games
+
+
+class TournamentResult:
+    """
+    The outcome of a tournament. Players are identified by their position in the list of players the tournament was
+    started with.
+
+    :param winners: The champion, or every player still standing if the last round could not narrow them down
+                    (e.g. because they all tied).
+    :param ejected: The players that were ejected from a game, in the order they were ejected.
+    :param rounds: Every game of every round.
+    """
+    def __init__(self, *, winners: List[int], ejected: List[int], rounds: List[Round]):
+        self.winners = winners
+        self.ejected = ejected
+        self.rounds = rounds
+
+    def __repr__(self) -> str:
+        return f"TournamentResult(winners={self.winners}, ejected={self.ejected}, rounds={len(self.rounds)})"
+
+
+RoundSteps = Generator[List[Game], List[GameResult], TournamentResult]
+
+
+class Manager:
+    """
+    Runs a knockout tournament: every round seats the remaining players in games of 2 to 8 players (see
+    allocate_game_sizes), plays all of that round's games concurrently, and advances every winner of every game to
+    the next round, until one player is left or a round eliminates nobody.
+
+    Games are played on one of these backends:
+        - "thread": a pool of threads, each playing whole games. Players must be IStrategy instances.
+        - "process": a pool of processes, each playing whole games. Players must be IStrategy instances and are
+          copied into the worker for each game, so changes they make to themselves during a game are lost. Games
+          are played on the given WarmPool (which must have the map), or on one started for the tournament.
+        - "asyncio": one event loop. Players may also be remote stand-ins, i.e. anything with an
+          `async call(method, args, timeout)` such as a ProxyPlayer.
+
+    If a budget is given, every call to a player must meet its deadline, or the player is ejected.
+    If a results store is given, the outcome of every game is recorded in it, under the class names of its players.
+    """
+    def __init__(
+        self,
+        trains_map: Map,
+        players: List[Any],
+        *,
+        backend: str = "thread",
+        max_workers: Optional[int] = None,
+        budget: Optional[TimeBudget] = None,
+        make_deck: Optional[Callable[[], List[Color]]] = None,
+        seed: Optional[int] = None,
+        results: Optional[ResultsStore] = None,
+        pool: Optional[WarmPool] = None
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend must be one of {BACKENDS}.")
+        if backend != "asyncio" and not all(isinstance(player, IStrategy) for player in players):
+            raise ValueError(f"Players of the {backend} backend must be IStrategy instances.")
+        if pool is not None and not (backend == "process" and pool.has_map(trains_map)):
+            raise ValueError("A pool can only be used by the process backend, and must have the tournament's map.")
+        # fails early if the map can't host the largest games
+        Referee(trains_map, min(max(len(players), GAME.MIN_PLAYERS_PER_GAME), GAME.MAX_PLAYERS_PER_GAME))
+        self.__trains_map = trains_map
+        self.__players = list(players)
+        self.__backend = backend
+        self.__max_workers = max_workers
+        self.__budget = budget
+        self.__make_deck = make_deck
+        self.__rng = random.Random(seed)
+        self.__results = results
+        self.__pool = pool
+
+    def __next_deck(self) -> List[Color]:
+        if self.__make_deck is not None:
+            return self.__make_deck()
+        return make_deck(self.__rng.getrandbits(32))
+
+    @staticmethod
+    def __advance(remaining: List[int], games: Round, ejected: List[int]) -> List[int]:
+        """
+        Return the players (by tournament id, in the order they were in) who won their game, and add the players
+        who were ejected to ejected.
+        """
+        winners = set()
+        for player_ids, result in games:
+            winners.update(player_ids[seat] for seat in result.winners)
+            ejected.extend(player_ids[seat] for seat in result.ejected)
+        return [player_id for player_id in remaining if player_id in winners]
+
+    def __rounds(self) -> RoundSteps:
+        """
+        Run the tournament round by round: yields the games of each round (their players and deck), and expects to
+        be sent back their results, in the same order.
+        """
+        remaining = list(range(len(self.__players)))
+        ejected = []
+        rounds = []
+        while len(remaining) >= GAME.MIN_PLAYERS_PER_GAME:
+            games = [(game, self.__next_deck()) for game in partition_players(remaining, self.__rng)]
+            results = yield games
+            rounds.append([(player_ids, result) for (player_ids, _), result in zip(games, results)])
+            self.__record(rounds[-1])
+            winners = self.__advance(remaining, rounds[-1], ejected)
+            if len(winners) == len(remaining):
+                break
+            remaining = winners
+        return TournamentResult(winners=remaining, ejected=ejected, rounds=rounds)
+
+    def __record(self, games: Round) -> None:
+        if self.__results is None:
+            return
+        fingerprint = self.__trains_map.get_fingerprint()
+        for player_ids, result in games:
+            self.__results.record(fingerprint, [strategy_name(self.__players[i]) for i in player_ids], result)
+
+    def run(self) -> TournamentResult:
+        """
+        Play the whole tournament. Use run_async instead to run the asyncio backend inside a running event loop.
+        """
+        if self.__backend == "asyncio":
+            return asyncio.run(self.run_async())
+        if self.__backend == "process":
+            if self.__pool is not None:
+                return self.__run_on(self.__pool.get_executor())
+            with WarmPool([self.__trains_map], max_workers=self.__max_workers) as pool:
+                self.__pool = pool
+                try:
+                    return self.__run_on(pool.get_executor())
+                finally:
+                    self.__pool = None
+        with ThreadPoolExecutor(self.__max_workers) as executor:
+            return self.__run_on(executor)
+
+    def __run_on(self, executor: Executor) -> TournamentResult:
+        steps = self.__rounds()
+        try:
+            games = next(steps)
+            while True:
+                games = steps.send(self.__play_round(executor, games))
+        except StopIteration as stop:
+            return stop.value
+
+    def __play_round(self, executor: Executor, games: List[Game]) -> List[GameResult]:
+        # every game is submitted up front, largest first, so workers never wait on the scheduler
+        if self.__backend == "process":
+            futures = [
+                self.__pool.submit(self.__trains_map, [self.__players[i] for i in player_ids], deck, self.__budget)
+                for player_ids, deck in games
+            ]
+        else:
+            futures = [
+                executor.submit(play_game_on, self.__trains_map, [self.__players[i] for i in player_ids], deck,
+                                self.__budget)
+                for player_ids, deck in games
+            ]
+        return [future.result() for future in futures]
+
+    async def run_async(self) -> TournamentResult:
+        """
+        Play the whole tournament on the running event loop (asyncio backend only).
+        """
+        if self.__backend != "asyncio":
+            raise ValueError("run_async needs the asyncio backend.")
+        steps = self.__rounds()
+        try:
+            games = next(steps)
+            while True:
+                results = await asyncio.gather(
+                    *[self.__play_game_async(player_ids, deck) for player_ids, deck in games]
+                )
+                games = steps.send(list(results))
+        except StopIteration as stop:
+            return stop.value
+
+    async def __play_game_async(self, player_ids: List[int], deck: List[Color]) -> GameResult:
+        players = [self.__players[i] for i in player_ids]
+        referee = Referee(self.__trains_map, len(players), deck=deck)
+        return await run_steps_async(referee.run(), lambda call: self.__call_async(players[call.seat], call))
+
+    async def __call_async(self, player: Any, call: PlayerCall) -> Any:
+        """
+        Make the call on a local strategy or a remote stand-in.
+        Local strategies are called directly (they are CPU bound, so threads would not speed them up), unless there
+        is a budget to enforce, in which case they are called on a thread so they can be timed out.
+        """
+        timeout = self.__budget.get_deadline(call.method) if self.__budget is not None else None
+        if not isinstance(player, IStrategy):
+            return await player.call(call.method, call.args, timeout)
+        if timeout is None:
+            return getattr(player, call.method)(*call.args)
+        return await asyncio.wait_for(asyncio.to_thread(getattr(player, call.method), *call.args), timeout)
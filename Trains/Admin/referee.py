@@ -0,0 +1,260 @@
+import random
+from collections import Counter
+from typing import Any, Callable, Dict, Generator, List, NamedTuple, Optional, Set, Tuple
+
+from Trains.Admin.referee_game_state import RefereeGameState
+from Trains.Admin.scoring import score_players
+from Trains.Common.constants import CONNECTION, GAME
+from Trains.Common.map import COLORS, Color, Destination, Map, sort_destinations
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.strategy import IStrategy, Move
+
+
+class PlayerCall(NamedTuple):
+    """
+    A call the referee needs made on the player in the given seat: one of the IStrategy methods (setup, pick, play,
+    more, win) with its arguments.
+    """
+    seat: int
+    method: str
+    args: Tuple[Any, ...]
+
+
+class PlayerFailure:
+    """
+    The result of a PlayerCall that did not return normally (it raised, timed out, or the player disconnected).
+    """
+    def __init__(self, reason: str):
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"PlayerFailure({self.reason})"
+
+
+class GameResult:
+    """
+    The outcome of one game. Players are identified by their seat (their position in the list of players the game
+    was started with).
+
+    :param scores: Final score of every player that was not ejected.
+    :param winners: Seats of the players with the highest score.
+    :param ejected: Seats of the players that were ejected for misbehaving, in the order they were ejected.
+    """
+    def __init__(self, *, scores: Dict[int, int], winners: List[int], ejected: List[int]):
+        self.scores = scores
+        self.winners = winners
+        self.ejected = ejected
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, GameResult)
+            and self.scores == other.scores
+            and self.winners == other.winners
+            and self.ejected == other.ejected
+        )
+
+    def __repr__(self) -> str:
+        return f"GameResult(scores={self.scores}, winners={self.winners}, ejected={self.ejected})"
+
+
+GameSteps = Generator[PlayerCall, Any, GameResult]
+
+
+def make_deck(seed: Optional[int] = None, num_cards: int = GAME.NUM_TOTAL_CARDS) -> List[Color]:
+    """
+    Make a shuffled deck of cards; the same seed always makes the same deck.
+    """
+    rng = random.Random(seed)
+    return [rng.choice(COLORS) for _ in range(num_cards)]
+
+
+class Referee:
+    """
+    Runs one game of Trains.
+
+    The referee does not call players itself: run() is a generator that yields a PlayerCall whenever it needs a
+    player to do something, and expects to be sent back the value that call returned (or a PlayerFailure). This lets
+    the same game logic be driven by direct calls (play_game), by calls with deadlines, or over the network.
+
+    Players that fail a call, return something invalid, or request a connection they cannot acquire are ejected.
+    """
+    def __init__(self, trains_map: Map, num_players: int, *, deck: Optional[List[Color]] = None):
+        if not isinstance(trains_map, Map):
+            raise ValueError("Input map must be of Map type.")
+        if not (
+            isinstance(num_players, int)
+            and GAME.MIN_PLAYERS_PER_GAME <= num_players <= GAME.MAX_PLAYERS_PER_GAME
+        ):
+            raise ValueError(f"Number of players must be between {GAME.MIN_PLAYERS_PER_GAME} and "
+                             f"{GAME.MAX_PLAYERS_PER_GAME}.")
+        self.__trains_map = trains_map
+        self.__num_players = num_players
+        self.__deck = list(deck) if deck is not None else make_deck()
+        self.__destinations = sort_destinations(trains_map.get_destinations())
+        num_needed = GAME.NUM_DESTINATION_OPTIONS + GAME.NUM_DESTINATIONS_PER_PLAYER * (num_players - 1)
+        if len(self.__destinations) < num_needed:
+            raise ValueError(f"Map must have at least {num_needed} destinations for {num_players} players.")
+
+    @staticmethod
+    def __is_valid_pick(returned: Any, offered: Set[Destination]) -> bool:
+        num_to_return = GAME.NUM_DESTINATION_OPTIONS - GAME.NUM_DESTINATIONS_PER_PLAYER
+        return (
+            isinstance(returned, set)
+            and all(isinstance(d, Destination) for d in returned)
+            and len(returned) == num_to_return
+            and returned.issubset(offered)
+        )
+
+    def run(self) -> GameSteps:
+        """
+        Play the whole game: setup, destination picking, turns until the game is over, scoring, and telling every
+        remaining player whether they won.
+        """
+        ejected = []
+        deck = list(self.__deck)
+        pool = list(self.__destinations)
+        seats = []
+        initial_cards = []
+        chosen_destinations = []
+
+        for seat in range(self.__num_players):
+            cards = deck[:GAME.NUM_INITIAL_CARDS]
+            deck = deck[GAME.NUM_INITIAL_CARDS:]
+            result = yield PlayerCall(seat, "setup", (self.__trains_map, GAME.INITIAL_NUM_RAILS, list(cards)))
+            if isinstance(result, PlayerFailure):
+                ejected.append(seat)
+                continue
+            offered = set(pool[:GAME.NUM_DESTINATION_OPTIONS])
+            returned = yield PlayerCall(seat, "pick", (set([d.copy() for d in offered]),))
+            if not self.__is_valid_pick(returned, offered):
+                ejected.append(seat)
+                continue
+            chosen = offered - returned
+            pool = [d for d in pool if d not in chosen]
+            seats.append(seat)
+            initial_cards.append(cards)
+            chosen_destinations.append(chosen)
+
+        if not seats:
+            return GameResult(scores={}, winners=[], ejected=ejected)
+
+        total_conns = [set() for _ in seats]
+        state = RefereeGameState.trusted(
+            trains_map=self.__trains_map,
+            player_game_states=[
+                PlayerGameState.trusted(
+                    acquired_connections=total_conns[i],
+                    destinations=chosen_destinations[i],
+                    num_rails=GAME.INITIAL_NUM_RAILS,
+                    cards=dict(Counter(initial_cards[i])),
+                    total_acquired_connections=total_conns,
+                    index=i
+                )
+                for i in range(len(seats))
+            ],
+            deck=deck,
+        )
+        state = yield from self.__play_turns(state, seats, ejected)
+        return (yield from self.__finish(state, seats, ejected))
+
+    @staticmethod
+    def __play_turns(state: RefereeGameState, seats: List[int], ejected: List[int]) -> GameSteps:
+        """
+        Play turns until the game is over:
+            - a player ends a turn with fewer rails than the shortest connection; every player (including that one)
+              then gets one last turn
+            - a whole round of turns goes by without any player's state changing
+            - every player has been ejected
+        Returns the final state. seats and ejected are updated as players are ejected.
+        """
+        turns_without_change = 0
+        last_round_turns = None
+        while state.get_num_players() > 0:
+            active_idx = state.get_active_player_idx()
+            seat = seats[active_idx]
+            move = yield PlayerCall(seat, "play", (state.get_active_player_game_state(),))
+            changed = False
+            is_ejected = False
+            starts_last_round = False
+            if isinstance(move, Move) and move.is_connection_request():
+                connection = move.get_connection()
+                if state.can_active_player_acquire_connection(connection):
+                    state = state.acquire_connection_for_active_player(connection)
+                    changed = True
+                else:
+                    is_ejected = True
+            elif isinstance(move, Move):
+                state, cards = state.draw_cards_for_active_player(GAME.NUM_CARDS_PER_DRAW)
+                if cards:
+                    changed = True
+                    result = yield PlayerCall(seat, "more", (list(cards),))
+                    is_ejected = isinstance(result, PlayerFailure)
+            else:
+                is_ejected = True
+
+            if is_ejected:
+                ejected.append(seat)
+                seats.pop(active_idx)
+                state = state.remove_active_player()
+                changed = True
+            else:
+                starts_last_round = (
+                    last_round_turns is None
+                    and state.get_active_player_game_state().get_num_rails() < min(CONNECTION.LENGTHS)
+                )
+                state = state.next_turn()
+
+            turns_without_change = 0 if changed else turns_without_change + 1
+            if last_round_turns is not None:
+                last_round_turns -= 1
+                if last_round_turns <= 0:
+                    break
+            elif starts_last_round:
+                # counted from the next turn, so that the player who started the last round gets one more turn too
+                last_round_turns = state.get_num_players()
+            if turns_without_change >= state.get_num_players():
+                break
+        return state
+
+    @staticmethod
+    def __finish(state: RefereeGameState, seats: List[int], ejected: List[int]) -> GameSteps:
+        """
+        Score the remaining players and tell each of them whether they won.
+        Players that fail to receive the news are ejected, and lose.
+        """
+        scores = dict(zip(seats, score_players(state.get_player_game_states())))
+        best = max(scores.values(), default=None)
+        winners = [seat for seat in seats if scores[seat] == best]
+        for seat in list(seats):
+            result = yield PlayerCall(seat, "win", (seat in winners,))
+            if isinstance(result, PlayerFailure):
+                ejected.append(seat)
+                del scores[seat]
+                if seat in winners:
+                    winners.remove(seat)
+        return GameResult(scores=scores, winners=winners, ejected=ejected)
+
+
+def run_steps(steps: GameSteps, call_player: Callable[[PlayerCall], Any]) -> GameResult:
+    """
+    Drive a game to completion by making every PlayerCall with call_player.
+    Any exception raised by call_player is turned into a PlayerFailure.
+    """
+    try:
+        call = next(steps)
+        while True:
+            try:
+                result = call_player(call)
+            except Exception as e:
+                result = PlayerFailure(f"{call.method} raised {e!r}")
+            call = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+def play_game(trains_map: Map, players: List[IStrategy], *, deck: Optional[List[Color]] = None) -> GameResult:
+    """
+    Play a game between in-process players, calling their methods directly.
+    """
+    referee = Referee(trains_map, len(players), deck=deck)
+    return run_steps(referee.run(), lambda call: getattr(players[call.seat], call.method)(*call.args))
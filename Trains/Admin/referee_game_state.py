@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 
 from Trains.Common.map import Map, Color, Connection
 from Trains.Common.player_game_state import PlayerGameState
@@ -18,6 +18,27 @@ class RefereeGameState:
         self.__deck = self.__validate_card_deck(deck)
         self.__active_player_idx = self.__validate_player_idx(active_player_idx)
 
+    @classmethod
+    def trusted(
+        cls,
+        *,
+        trains_map: Map,
+        player_game_states: List[PlayerGameState],
+        deck: List[Color],
+        active_player_idx: int = 0
+    ) -> "RefereeGameState":
+        """
+        Creates a RefereeGameState without validating any of its inputs.
+        Only for states the referee produces from an already valid state; external inputs must go through the
+        constructor.
+        """
+        state = cls.__new__(cls)
+        state.__trains_map = trains_map
+        state.__player_game_states = player_game_states
+        state.__deck = deck
+        state.__active_player_idx = active_player_idx
+        return state
+
     @staticmethod
     def __validate_map(trains_map: Map) -> Map:
         """
@@ -33,7 +54,7 @@ class RefereeGameState:
         All connections must agree with the map's connections.
         pgs.get_acquired_connections() must be the exact same for all player game states. 
         """
-        map_connections = self.__trains_map.get_connections()
+        connection_index = self.__trains_map.get_connection_index()
         pgs_error = ValueError("Player game states must be list of PlayerGameState.")
         connection_error = ValueError("All connections must be a subset of those in the map.")
         all_connections_error = ValueError("All player connections must be consistent with all player game states.")
@@ -44,12 +65,18 @@ class RefereeGameState:
         for pgs in player_game_states:
             if not isinstance(pgs, PlayerGameState):
                 raise pgs_error
-            for connection in pgs.get_acquired_connections():
-                if connection not in map_connections:
+            acquired_connections = pgs.get_acquired_connections()
+            for connection in acquired_connections:
+                if not connection_index.has_connection(connection):
                     raise connection_error
-            player_connections.append(pgs.get_acquired_connections())
+            player_connections.append(connection_index.to_bitset(acquired_connections))
+        # compared as bitsets over the map's connections, so each comparison is one int comparison per player
         for pgs in player_game_states:
-            if player_connections != pgs.get_all_player_connections():
+            try:
+                all_player_connections = pgs.get_ownership_bitsets(connection_index)
+            except ValueError:
+                raise all_connections_error
+            if player_connections != all_player_connections:
                 raise all_connections_error
         return player_game_states
 
@@ -102,3 +129,79 @@ class RefereeGameState:
         """
         active_pgs = self.get_active_player_game_state()
         return active_pgs.can_acquire_connection(c, self.__trains_map)
+
+    def get_trains_map(self) -> Map:
+        """
+        Get the game map.
+        """
+        return self.__trains_map
+
+    def get_player_game_states(self) -> List[PlayerGameState]:
+        """
+        Get every player's game state, in turn order.
+        """
+        return list(self.__player_game_states)
+
+    def get_num_players(self) -> int:
+        return len(self.__player_game_states)
+
+    def acquire_connection_for_active_player(self, c: Connection) -> "RefereeGameState":
+        """
+        Return the state after the active player acquires the given connection.
+        Assumes the active player can acquire it.
+        """
+        new_active_pgs = self.get_active_player_game_state().obtain_connection(c)
+        total_conns = new_active_pgs.get_all_player_connections()
+        player_game_states = [
+            new_active_pgs if i == self.__active_player_idx else pgs.update_all_player_connections(total_conns, i)
+            for i, pgs in enumerate(self.__player_game_states)
+        ]
+        return RefereeGameState.trusted(
+            trains_map=self.__trains_map,
+            player_game_states=player_game_states,
+            deck=self.__deck,
+            active_player_idx=self.__active_player_idx
+        )
+
+    def draw_cards_for_active_player(self, num_cards: int) -> Tuple["RefereeGameState", List[Color]]:
+        """
+        Return the state after the active player draws (up to) num_cards from the top of the deck, and the cards
+        drawn.
+        """
+        cards = self.__deck[:num_cards]
+        player_game_states = list(self.__player_game_states)
+        player_game_states[self.__active_player_idx] = self.get_active_player_game_state().add_cards(cards)
+        return RefereeGameState.trusted(
+            trains_map=self.__trains_map,
+            player_game_states=player_game_states,
+            deck=self.__deck[num_cards:],
+            active_player_idx=self.__active_player_idx
+        ), cards
+
+    def next_turn(self) -> "RefereeGameState":
+        """
+        Return the state where the next player in turn order is active.
+        """
+        return RefereeGameState.trusted(
+            trains_map=self.__trains_map,
+            player_game_states=self.__player_game_states,
+            deck=self.__deck,
+            active_player_idx=(self.__active_player_idx + 1) % len(self.__player_game_states)
+        )
+
+    def remove_active_player(self) -> "RefereeGameState":
+        """
+        Return the state without the active player: their connections become available again, and the next player
+        in turn order becomes active.
+        If no players remain, the returned state has no active player.
+        """
+        remaining = [pgs for i, pgs in enumerate(self.__player_game_states) if i != self.__active_player_idx]
+        total_conns = [pgs.get_acquired_connections() for pgs in remaining]
+        return RefereeGameState.trusted(
+            trains_map=self.__trains_map,
+            player_game_states=[
+                pgs.update_all_player_connections(total_conns, i) for i, pgs in enumerate(remaining)
+            ],
+            deck=self.__deck,
+            active_player_idx=self.__active_player_idx % len(remaining) if remaining else 0
+        )
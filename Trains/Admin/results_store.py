@@ -0,0 +1,237 @@
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from Trains.Admin.referee import GameResult
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_FLUSH_INTERVAL = 0.5
+# Game ids are reserved from the database this many at a time, so that every store on the same file (e.g. in other
+# processes) hands out different ids without asking the database for every game.
+GAME_IDS_PER_RESERVATION = 100
+
+# One row per seat of every game. score is NULL for ejected players.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seats (
+    game INTEGER NOT NULL,
+    map TEXT NOT NULL,
+    num_players INTEGER NOT NULL,
+    seat INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    score INTEGER,
+    won INTEGER NOT NULL,
+    ejected INTEGER NOT NULL,
+    PRIMARY KEY (game, seat)
+);
+CREATE INDEX IF NOT EXISTS seats_by_strategy ON seats (strategy, won);
+CREATE INDEX IF NOT EXISTS seats_by_map ON seats (map, strategy, won);
+CREATE TABLE IF NOT EXISTS game_ids (next_game INTEGER NOT NULL);
+INSERT INTO game_ids SELECT COALESCE(MAX(game), -1) + 1 FROM seats WHERE NOT EXISTS (SELECT * FROM game_ids);
+"""
+INSERT = "INSERT INTO seats VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+Row = Tuple[int, str, int, int, str, Optional[int], int, int]
+
+
+def strategy_name(player: Any) -> str:
+    """
+    The name a player's games are recorded under: the name of its class.
+    """
+    return type(player).__name__
+
+
+class ResultsStore:
+    """
+    Records game outcomes in a SQLite database, one row per seat, so they can be queried per strategy, map (by
+    fingerprint, see Map.get_fingerprint) and seat.
+
+    record() only queues the outcome: a background thread writes queued outcomes in batches of up to batch_size rows,
+    or whatever is queued after flush_interval seconds, one transaction per batch. The database is in WAL mode, so
+    queries (which open their own connection) never wait on the writer. Commits do not wait for the disk either
+    (synchronous=NORMAL), so outcomes written shortly before a power failure or OS crash can be lost; the database
+    itself stays consistent.
+    The database must be a file, since the writer and the queries use separate connections.
+    Game ids are unique across every store on the same database, but not consecutive.
+    Errors in the writer are raised by the next flush() or close(); a batch that fails to be written is lost, but
+    later batches are still written.
+    """
+    def __init__(self, path: str, *, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        if not (isinstance(batch_size, int) and batch_size > 0):
+            raise ValueError("Batch size must be a positive integer.")
+        self.__path = path
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        connection = self.__connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+        # the game ids reserved by this store and not handed out yet
+        self.__next_game = 0
+        self.__end_of_reserved = 0
+        self.__game_lock = threading.Lock()
+        # rows to write; a threading.Event asks the writer to write everything before it and set the event, and
+        # None asks it to stop
+        self.__queue: "queue.Queue[Any]" = queue.Queue()
+        self.__error: Optional[BaseException] = None
+        self.__closed = False
+        self.__writer = threading.Thread(target=self.__write, daemon=True)
+        self.__writer.start()
+
+    def __connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.__path)
+        # in WAL mode, NORMAL only syncs to disk at checkpoints: commits no longer wait for the disk, and the database
+        # stays consistent, but the last commits can be lost on a power failure or OS crash
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def __reserve_game_ids(self) -> None:
+        connection = self.__connect()
+        try:
+            # an immediate transaction takes the write lock before reading, so no other store reserves the same ids
+            connection.isolation_level = None
+            connection.execute("BEGIN IMMEDIATE")
+            first = connection.execute("SELECT next_game FROM game_ids").fetchone()[0]
+            connection.execute("UPDATE game_ids SET next_game = ?", (first + GAME_IDS_PER_RESERVATION,))
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        self.__next_game = first
+        self.__end_of_reserved = first + GAME_IDS_PER_RESERVATION
+
+    def record(self, map_fingerprint: str, strategies: List[str], result: GameResult) -> int:
+        """
+        Queue the outcome of a game on the map with the given fingerprint, whose seats were taken by players of the
+        given strategies, in seat order. Returns the id of the game.
+        """
+        if self.__closed:
+            raise ValueError("The results store is closed.")
+        with self.__game_lock:
+            if self.__next_game == self.__end_of_reserved:
+                self.__reserve_game_ids()
+            game = self.__next_game
+            self.__next_game += 1
+        winners = set(result.winners)
+        ejected = set(result.ejected)
+        for seat, strategy in enumerate(strategies):
+            self.__queue.put((
+                game, map_fingerprint, len(strategies), seat, strategy, result.scores.get(seat),
+                int(seat in winners), int(seat in ejected)
+            ))
+        return game
+
+    def __write(self) -> None:
+        connection = self.__connect()
+        batch: List[Row] = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.__queue.get(timeout=timeout)
+                except queue.Empty:
+                    # the oldest row of the batch has waited flush_interval: write the batch
+                    item = ()
+                if isinstance(item, tuple) and item:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.__flush_interval
+                    if len(batch) < self.__batch_size:
+                        continue
+                if batch:
+                    self.__write_batch(connection, batch)
+                    batch = []
+                deadline = None
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is None:
+                    return
+        finally:
+            connection.close()
+
+    def __write_batch(self, connection: sqlite3.Connection, batch: List[Row]) -> None:
+        try:
+            with connection:
+                connection.executemany(INSERT, batch)
+        except sqlite3.Error as e:
+            # the first error is the one raised; later batches are written regardless
+            if self.__error is None:
+                self.__error = e
+
+    def __raise_error(self) -> None:
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    def flush(self) -> None:
+        """
+        Wait until every outcome recorded so far is written.
+        """
+        if self.__closed:
+            return
+        done = threading.Event()
+        self.__queue.put(done)
+        done.wait()
+        self.__raise_error()
+
+    def close(self) -> None:
+        """
+        Write every outcome recorded so far, and stop the writer.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__queue.put(None)
+        self.__writer.join()
+        self.__raise_error()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __query(self, sql: str, parameters: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        connection = self.__connect()
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def __where(**filters: Any) -> Tuple[str, Tuple[Any, ...]]:
+        columns = [column for column, value in filters.items() if value is not None]
+        if not columns:
+            return "", ()
+        return " WHERE " + " AND ".join(f"{column} = ?" for column in columns), tuple(filters[c] for c in columns)
+
+    def get_num_games(self, *, map_fingerprint: Optional[str] = None) -> int:
+        """
+        Return the number of games written (on the given map, if any).
+        """
+        where, parameters = self.__where(map=map_fingerprint)
+        return self.__query(f"SELECT COUNT(DISTINCT game) FROM seats{where}", parameters)[0][0]
+
+    def get_win_rates(self, *, map_fingerprint: Optional[str] = None,
+                      seat: Optional[int] = None) -> Dict[str, Tuple[int, int]]:
+        """
+        Return the number of games won and played by every strategy (on the given map and in the given seat, if
+        any). Ties count as wins for every winner.
+        """
+        where, parameters = self.__where(map=map_fingerprint, seat=seat)
+        rows = self.__query(f"SELECT strategy, SUM(won), COUNT(*) FROM seats{where} GROUP BY strategy", parameters)
+        return {strategy: (wins, games) for strategy, wins, games in rows}
+
+    def get_seat_win_rates(self, *, strategy: Optional[str] = None,
+                           map_fingerprint: Optional[str] = None) -> Dict[int, Tuple[int, int]]:
+        """
+        Return the number of games won and played from every seat (by the given strategy and on the given map, if
+        any).
+        """
+        where, parameters = self.__where(strategy=strategy, map=map_fingerprint)
+        rows = self.__query(f"SELECT seat, SUM(won), COUNT(*) FROM seats{where} GROUP BY seat", parameters)
+        return {seat: (wins, games) for seat, wins, games in rows}
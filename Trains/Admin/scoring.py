@@ -0,0 +1,78 @@
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from Trains.Common.constants import GAME
+from Trains.Common.map import City, Connection, Destination
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Utils.graph import is_reachable
+
+
+def make_city_map(connections: Set[Connection]) -> Dict[City, Set[City]]:
+    """
+    Make a mapping between every city of the given connections and the cities it is directly connected to.
+    """
+    city_map = defaultdict(set)
+    for connection in connections:
+        city1, city2 = connection.get_cities()
+        city_map[city1].add(city2)
+        city_map[city2].add(city1)
+    return city_map
+
+
+def is_destination_connected(destination: Destination, connections: Set[Connection]) -> bool:
+    """
+    Determine whether the given connections form a path between the two cities of the destination.
+    """
+    city1, city2 = destination.get_cities()
+    return is_reachable(city1, city2, make_city_map(connections))
+
+
+def longest_path_length(connections: Set[Connection]) -> int:
+    """
+    Return the total length of the longest path that can be made out of the given connections, where a path may
+    visit a city more than once but never uses a connection twice.
+    Exponential in the worst case, but a player can own at most GAME.INITIAL_NUM_RAILS / 3 connections.
+    """
+    edges_by_city = defaultdict(list)
+    for edge_id, connection in enumerate(connections):
+        city1, city2 = connection.get_cities()
+        edges_by_city[city1].append((edge_id, city2, connection.get_length()))
+        edges_by_city[city2].append((edge_id, city1, connection.get_length()))
+
+    def longest_from(city: City, used: Set[int]) -> int:
+        best = 0
+        for edge_id, neighbor, length in edges_by_city[city]:
+            if edge_id not in used:
+                used.add(edge_id)
+                best = max(best, length + longest_from(neighbor, used))
+                used.remove(edge_id)
+        return best
+
+    return max([longest_from(city, set()) for city in edges_by_city] + [0])
+
+
+def score_players(player_game_states: List[PlayerGameState]) -> List[int]:
+    """
+    Score every player at the end of a game, in turn order:
+        - 1 point per segment of each acquired connection
+        - GAME.DESTINATION_POINTS for each connected destination, minus that for each unconnected one
+        - GAME.LONGEST_PATH_POINTS for every player with the longest path
+    """
+    scores = []
+    longest_paths = []
+    for pgs in player_game_states:
+        connections = pgs.get_acquired_connections()
+        score = sum(c.get_length() for c in connections)
+        for destination in pgs.get_destinations():
+            if is_destination_connected(destination, connections):
+                score += GAME.DESTINATION_POINTS
+            else:
+                score -= GAME.DESTINATION_POINTS
+        scores.append(score)
+        longest_paths.append(longest_path_length(connections))
+
+    longest = max(longest_paths + [0])
+    return [
+        score + (GAME.LONGEST_PATH_POINTS if longest > 0 and path == longest else 0)
+        for score, path in zip(scores, longest_paths)
+    ]
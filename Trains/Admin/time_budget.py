@@ -0,0 +1,240 @@
+import bisect
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from Trains.Admin.referee import GameResult, PlayerCall, Referee, run_steps
+from Trains.Common.map import Color, Map
+from Trains.Player.strategy import IStrategy
+
+DEFAULT_DEADLINE = 1.0
+DEFAULT_SETUP_DEADLINE = 5.0
+
+
+class TimeBudget:
+    """
+    How long (in seconds) a player may take to answer each kind of call.
+    setup gets more time by default, since it is handed the whole map.
+    """
+    def __init__(self, default: float = DEFAULT_DEADLINE, **per_method: float):
+        self.__default = default
+        self.__per_method = {"setup": DEFAULT_SETUP_DEADLINE}
+        self.__per_method.update(per_method)
+
+    def get_deadline(self, method: str) -> float:
+        return self.__per_method.get(method, self.__default)
+
+
+class LatencyHistogram:
+    """
+    Counts call latencies in exponentially growing buckets: from 10 microseconds, doubling up to about 10 seconds,
+    plus one bucket for anything slower.
+    """
+    BUCKET_BOUNDS = [1e-5 * 2 ** i for i in range(21)]
+
+    def __init__(self):
+        self.__counts = [0] * (len(self.BUCKET_BOUNDS) + 1)
+        self.__total = 0.0
+        self.__max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.__counts[bisect.bisect_left(self.BUCKET_BOUNDS, seconds)] += 1
+        self.__total += seconds
+        self.__max = max(self.__max, seconds)
+
+    def get_count(self) -> int:
+        return sum(self.__counts)
+
+    def get_total(self) -> float:
+        return self.__total
+
+    def get_max(self) -> float:
+        return self.__max
+
+    def percentile(self, q: float) -> float:
+        """
+        Return the upper bound of the bucket holding the q-th percentile (0 <= q <= 100) of the recorded latencies,
+        or 0 if nothing was recorded. The last bucket has no upper bound, so the max latency is returned for it.
+        """
+        count = self.get_count()
+        if count == 0:
+            return 0.0
+        rank = max(1, round(q / 100 * count))
+        seen = 0
+        for i, bucket_count in enumerate(self.__counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.BUCKET_BOUNDS[i] if i < len(self.BUCKET_BOUNDS) else self.__max
+        return self.__max
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "count": self.get_count(),
+            "total": self.__total,
+            "max": self.__max,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "buckets": {
+                (f"<={bound:g}" if i < len(self.BUCKET_BOUNDS) else f">{self.BUCKET_BOUNDS[-1]:g}"): count
+                for i, (bound, count) in enumerate(zip(self.BUCKET_BOUNDS + [None], self.__counts))
+                if count
+            },
+        }
+
+
+class ThreadStrategyRunner:
+    """
+    Runs one strategy's calls on its own daemon thread.
+    A call that overruns its deadline is abandoned: the thread cannot be killed, but it no longer holds up the game,
+    and being a daemon it does not keep the process alive either.
+    """
+    def __init__(self, strategy: IStrategy):
+        self.__strategy = strategy
+        self.__requests = queue.Queue()
+        self.__is_dead = False
+        threading.Thread(target=self.__work, daemon=True).start()
+
+    def __work(self) -> None:
+        while True:
+            request = self.__requests.get()
+            if request is None:
+                return
+            method, args, future = request
+            try:
+                future.set_result(getattr(self.__strategy, method)(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def call(self, method: str, args: Tuple[Any, ...], timeout: float) -> Any:
+        """
+        Make the call, raising TimeoutError if it does not return within timeout seconds.
+        """
+        if self.__is_dead:
+            raise TimeoutError("An earlier call of this player overran its deadline.")
+        future = Future()
+        self.__requests.put((method, args, future))
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            self.__is_dead = True
+            self.__requests.put(None)
+            raise
+
+    def stop(self) -> None:
+        self.__requests.put(None)
+
+
+def _serve_strategy(strategy: IStrategy, connection: Any) -> None:
+    """
+    The loop of a ProcessStrategyRunner's process: answer (method, args) requests until told to stop.
+    """
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        method, args = request
+        try:
+            connection.send((True, getattr(strategy, method)(*args)))
+        except Exception as e:
+            connection.send((False, repr(e)))
+
+
+class ProcessStrategyRunner:
+    """
+    Runs one strategy in its own process, so a strategy that overruns its deadline can actually be killed.
+    Arguments and results are pickled across the process boundary.
+    """
+    def __init__(self, strategy: IStrategy):
+        context = multiprocessing.get_context()
+        self.__connection, child_connection = context.Pipe()
+        self.__process = context.Process(target=_serve_strategy, args=(strategy, child_connection), daemon=True)
+        self.__process.start()
+        child_connection.close()
+
+    def call(self, method: str, args: Tuple[Any, ...], timeout: float) -> Any:
+        """
+        Make the call, killing the process and raising TimeoutError if it does not return within timeout seconds.
+        """
+        if not self.__process.is_alive():
+            raise TimeoutError("This player's process is not running.")
+        self.__connection.send((method, args))
+        if not self.__connection.poll(timeout):
+            self.kill()
+            raise TimeoutError(f"{method} overran its deadline of {timeout}s.")
+        ok, value = self.__connection.recv()
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+    def kill(self) -> None:
+        self.__process.kill()
+        self.__process.join()
+
+    def is_alive(self) -> bool:
+        return self.__process.is_alive()
+
+    def stop(self) -> None:
+        if self.__process.is_alive():
+            try:
+                self.__connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.__process.join(1)
+            if self.__process.is_alive():
+                self.kill()
+        self.__connection.close()
+
+
+class DeadlineCaller:
+    """
+    Makes a referee's PlayerCalls on in-process strategies, each through its own runner and under the deadline of
+    the given TimeBudget, and records each player's call latencies.
+    With use_processes, every strategy runs in its own process so overrunning players are killed; otherwise they run
+    on their own threads and overrunning calls are abandoned.
+    """
+    def __init__(self, players: List[IStrategy], *, budget: Optional[TimeBudget] = None, use_processes: bool = False):
+        self.__budget = budget if budget is not None else TimeBudget()
+        runner_class = ProcessStrategyRunner if use_processes else ThreadStrategyRunner
+        self.__runners = [runner_class(player) for player in players]
+        self.__histograms = {seat: LatencyHistogram() for seat in range(len(players))}
+
+    def __call__(self, call: PlayerCall) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.__runners[call.seat].call(call.method, call.args, self.__budget.get_deadline(call.method))
+        finally:
+            self.__histograms[call.seat].record(time.perf_counter() - start)
+
+    def get_histograms(self) -> Dict[int, LatencyHistogram]:
+        return dict(self.__histograms)
+
+    def close(self) -> None:
+        for runner in self.__runners:
+            runner.stop()
+
+
+def play_game_with_deadlines(
+    trains_map: Map,
+    players: List[IStrategy],
+    *,
+    budget: Optional[TimeBudget] = None,
+    use_processes: bool = False,
+    deck: Optional[List[Color]] = None
+) -> Tuple[GameResult, Dict[int, LatencyHistogram]]:
+    """
+    Play a game between in-process players where every call must meet its deadline, or the player is ejected.
+    Returns the result and every player's latency histogram, by seat.
+    """
+    referee = Referee(trains_map, len(players), deck=deck)
+    caller = DeadlineCaller(players, budget=budget, use_processes=use_processes)
+    try:
+        result = run_steps(referee.run(), caller)
+    finally:
+        caller.close()
+    return result, caller.get_histograms()
@@ -0,0 +1,163 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from Trains.Admin.referee import GameResult, play_game
+from Trains.Admin.time_budget import TimeBudget, play_game_with_deadlines
+from Trains.Common.map import Color, Map
+from Trains.Common.shared_map import SharedMapTables
+from Trains.Player.strategy import IStrategy
+
+# Imported once by the fork server, so that every worker forked from it starts with them already imported.
+DEFAULT_PRELOAD = (
+    "Trains.Admin.referee",
+    "Trains.Admin.scoring",
+    "Trains.Admin.time_budget",
+    "Trains.Admin.warm_pool",
+    "Trains.Common.adjacency",
+    "Trains.Common.shared_map",
+    "Trains.Player.buy_now_strategy",
+    "Trains.Player.hold_10_strategy",
+)
+# How long each warm_up() task takes, so that every worker gets one of them
+WARM_UP_TASK_SECONDS = 0.05
+
+_worker_maps: Dict[str, Map] = {}
+
+
+def _load_worker_maps(tables_names: Dict[str, str]) -> None:
+    """
+    Runs once in each worker process: builds every map the pool was configured with, by fingerprint, from the
+    tables published in shared memory, along with everything a game builds lazily, so no game has to.
+    """
+    for fingerprint, tables_name in tables_names.items():
+        tables = SharedMapTables.attach(tables_name)
+        try:
+            trains_map = tables.to_map()
+        finally:
+            tables.close()
+        trains_map.get_connection_index()
+        trains_map.get_name_index()
+        _worker_maps[fingerprint] = trains_map
+
+
+def _report_ready() -> int:
+    time.sleep(WARM_UP_TASK_SECONDS)
+    return os.getpid()
+
+
+def play_game_on(
+    trains_map: Map,
+    players: List[IStrategy],
+    deck: List[Color],
+    budget: Optional[TimeBudget]
+) -> GameResult:
+    """
+    Play a game between in-process players, with deadlines if a budget is given.
+    """
+    if budget is None:
+        return play_game(trains_map, players, deck=deck)
+    return play_game_with_deadlines(trains_map, players, budget=budget, deck=deck)[0]
+
+
+def _play_game_in_worker(
+    fingerprint: str,
+    players: List[IStrategy],
+    deck: List[Color],
+    budget: Optional[TimeBudget]
+) -> GameResult:
+    return play_game_on(_worker_maps[fingerprint], players, deck, budget)
+
+
+class WarmPool:
+    """
+    A pool of long-lived worker processes that are ready to play a game on any of a configured set of maps the
+    moment it is submitted.
+
+    Workers are forked from a fork server that has already imported the preload modules (DEFAULT_PRELOAD by
+    default), so they do not import anything themselves. Each worker then builds every map once, from tables the
+    pool publishes in shared memory (see SharedMapTables), instead of unpickling and rebuilding a Map per game.
+    Workers start on first use; call warm_up() to start them all ahead of time.
+    The fork server is shared by the whole process, so the preload modules only apply if it is not running yet.
+    Where there is no fork server (i.e. not on Unix), workers are spawned and import what they need themselves.
+    """
+    def __init__(
+        self,
+        maps: Iterable[Map],
+        *,
+        max_workers: Optional[int] = None,
+        preload: Sequence[str] = DEFAULT_PRELOAD
+    ):
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(list(preload))
+        else:
+            context = multiprocessing.get_context("spawn")
+        self.__tables: Dict[str, SharedMapTables] = {}
+        try:
+            for trains_map in maps:
+                fingerprint = trains_map.get_fingerprint()
+                if fingerprint not in self.__tables:
+                    self.__tables[fingerprint] = SharedMapTables.publish(trains_map)
+        except BaseException:
+            self.__unpublish()
+            raise
+        self.__max_workers = max_workers if max_workers is not None else os.cpu_count() or 1
+        self.__executor = ProcessPoolExecutor(
+            self.__max_workers,
+            mp_context=context,
+            initializer=_load_worker_maps,
+            initargs=({fingerprint: tables.get_name() for fingerprint, tables in self.__tables.items()},)
+        )
+
+    def __unpublish(self) -> None:
+        for tables in self.__tables.values():
+            tables.close()
+            tables.unlink()
+        self.__tables = {}
+
+    def has_map(self, trains_map: Map) -> bool:
+        return trains_map.get_fingerprint() in self.__tables
+
+    def get_executor(self) -> Executor:
+        return self.__executor
+
+    def warm_up(self) -> int:
+        """
+        Start every worker now, and wait for them to have built their maps. Returns the number of workers that
+        answered.
+        """
+        futures = [self.__executor.submit(_report_ready) for _ in range(self.__max_workers)]
+        return len(set(future.result() for future in futures))
+
+    def submit(
+        self,
+        trains_map: Union[Map, str],
+        players: List[IStrategy],
+        deck: List[Color],
+        budget: Optional[TimeBudget] = None
+    ) -> "Future[GameResult]":
+        """
+        Play a game on one of the pool's maps (given as a Map or its fingerprint) in a worker. Players are copied
+        into the worker, so changes they make to themselves during the game are lost.
+        Raises ValueError if the pool was not configured with the map.
+        """
+        fingerprint = trains_map if isinstance(trains_map, str) else trains_map.get_fingerprint()
+        if fingerprint not in self.__tables:
+            raise ValueError("The pool was not configured with this map.")
+        return self.__executor.submit(_play_game_in_worker, fingerprint, players, deck, budget)
+
+    def close(self) -> None:
+        """
+        Wait for the submitted games, stop the workers and free the maps' shared memory.
+        """
+        self.__executor.shutdown()
+        self.__unpublish()
+
+    def __enter__(self) -> "WarmPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from Trains.Common.map import Color, Connection, Map, sort_connections, sort_destinations
+from Trains.Common.map_builder import MapBuilder
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Translations.map_cache import MapCache
+from Trains.Translations.translations import MapTranslation
+from Trains.Utils.map_generator import generate_map
+
+DEFAULT_SIZES = [10, 100]
+CITIES_PER_COMPONENT = 100
+MIN_REPEAT_TIME = 0.05
+REGRESSION_THRESHOLD = 1.2
+
+
+class Benchmark:
+    """
+    A named operation measured over maps of various sizes.
+    make_setup is called once per map size with the generated Map, and returns the zero-argument function to time.
+    """
+    def __init__(self, name: str, make_setup: Callable[[Map], Callable[[], Any]]):
+        self.name = name
+        self.make_setup = make_setup
+
+
+def make_player_game_state(trains_map: Map) -> PlayerGameState:
+    """
+    Make a two-player state where this player (index 0) has plenty of cards and rails and the other player owns
+    every fourth connection of the map.
+    """
+    opponent_conns = set(sort_connections(trains_map.get_connections())[::4])
+    return PlayerGameState(
+        acquired_connections=set(),
+        destinations=set(sort_destinations(trains_map.get_destinations())[:2]),
+        num_rails=45,
+        cards={color: 50 for color in Color.get_all_color_enums()},
+        total_acquired_connections=[set(), opponent_conns]
+    )
+
+
+def first_obtainable_connection(pgs: PlayerGameState, trains_map: Map) -> Connection:
+    return sort_connections(pgs.get_all_obtainable_connections_for_player(trains_map))[0]
+
+
+def _map_construction(trains_map: Map) -> Callable[[], Any]:
+    cities = trains_map.get_cities()
+    connections = trains_map.get_connections()
+    return lambda: Map(cities, connections, height=trains_map.get_height(), width=trains_map.get_width())
+
+
+def _obtain_connection(trains_map: Map) -> Callable[[], Any]:
+    pgs = make_player_game_state(trains_map)
+    connection = first_obtainable_connection(pgs, trains_map)
+    return lambda: pgs.obtain_connection(connection)
+
+
+def _obtainable_connections(trains_map: Map) -> Callable[[], Any]:
+    pgs = make_player_game_state(trains_map)
+    return lambda: pgs.get_all_obtainable_connections_for_player(trains_map)
+
+
+def _map_translation_round_trip(trains_map: Map) -> Callable[[], Any]:
+    return lambda: MapTranslation.json_to_map(MapTranslation.map_to_json(trains_map))
+
+
+def _map_cache_lookup(trains_map: Map) -> Callable[[], Any]:
+    map_as_json = MapTranslation.map_to_json(trains_map)
+    cache = MapCache()
+    cache.get_from_json(map_as_json)
+    return lambda: cache.get_from_json(map_as_json)
+
+
+def _map_builder_edit(trains_map: Map) -> Callable[[], Any]:
+    builder = MapBuilder.from_map(trains_map)
+    connection = sort_connections(trains_map.get_connections())[0]
+
+    def edit():
+        # removing a connection may split its component, and adding it back merges them again
+        builder.remove_connection(connection)
+        builder.add_connection(connection)
+    return edit
+
+
+def _strategy_turn(strategy_class: type) -> Callable[[Map], Callable[[], Any]]:
+    def make_setup(trains_map: Map) -> Callable[[], Any]:
+        pgs = make_player_game_state(trains_map)
+        strategy = strategy_class()
+        strategy.setup(trains_map, pgs.get_num_rails(), [])
+
+        def turn():
+            strategy.pick(trains_map.get_destinations())
+            return strategy.play(pgs)
+        return turn
+    return make_setup
+
+
+BENCHMARKS = [
+    Benchmark("map_construction", _map_construction),
+    Benchmark("map_copy", lambda trains_map: trains_map.copy),
+    Benchmark("map_get_destinations", lambda trains_map: trains_map.get_destinations),
+    Benchmark("pgs_obtain_connection", _obtain_connection),
+    Benchmark("pgs_obtainable_connections", _obtainable_connections),
+    Benchmark("map_translation_round_trip", _map_translation_round_trip),
+    Benchmark("map_cache_lookup", _map_cache_lookup),
+    Benchmark("map_builder_edit", _map_builder_edit),
+    Benchmark("strategy_turn_buy_now", _strategy_turn(BuyNowStrategy)),
+    Benchmark("strategy_turn_hold_10", _strategy_turn(Hold10Strategy)),
+]
+
+# Modules timed by importing them in a fresh interpreter, by benchmark name. Short-lived processes (e.g. validating a
+# map) pay for these imports every time they run.
+IMPORT_BENCHMARKS = {
+    "import_translations": "Trains.Translations.translations",
+    "import_map_cache": "Trains.Translations.map_cache",
+    "import_admin_package": "Trains.Admin",
+}
+
+
+def make_benchmark_map(num_cities: int, seed: int = 0) -> Map:
+    """
+    Make the map used for benchmarks of the given size: 1.5 connections per city, split into components of at most
+    CITIES_PER_COMPONENT cities so the number of destinations grows linearly with the number of cities.
+    """
+    num_components = max(1, num_cities // CITIES_PER_COMPONENT)
+    return generate_map(num_cities, num_components=num_components, seed=seed)
+
+
+def time_function(func: Callable[[], Any], repeats: int, min_repeat_time: float) -> Dict[str, Any]:
+    """
+    Time func: calls are batched so that every repeat takes at least min_repeat_time, and statistics are reported
+    per call, in seconds.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_repeat_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_repeat_time / elapsed) + 1))
+
+    timings = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "number": number,
+        "repeats": repeats,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+    }
+
+
+def time_import(module: str, repeats: int) -> Dict[str, Any]:
+    """
+    Time importing module in a fresh interpreter, as reported by -X importtime (so without the interpreter's own
+    startup), in seconds.
+    """
+    timings = []
+    for _ in range(repeats):
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        ).stderr
+        # lines are "import time: self [us] | cumulative | module", and the module itself is reported last
+        cumulative = [int(line.split("|")[1]) for line in stderr.splitlines() if line.split("|")[-1].strip() == module]
+        timings.append(cumulative[-1] / 1e6)
+    return {
+        "number": 1,
+        "repeats": repeats,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+    }
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    sizes: List[int],
+    *,
+    names: Optional[List[str]] = None,
+    repeats: int = 5,
+    min_repeat_time: float = MIN_REPEAT_TIME,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Run every benchmark (or only the ones in names) over maps of the given sizes, and the import benchmarks, which
+    do not depend on a map and are reported with size 0.
+    Returns the machine-readable results, ready to be dumped as JSON.
+    """
+    benchmarks = [b for b in BENCHMARKS if names is None or b.name in names]
+    results = []
+    for size in sizes:
+        trains_map = make_benchmark_map(size, seed)
+        for benchmark in benchmarks:
+            func = benchmark.make_setup(trains_map)
+            result = {"name": benchmark.name, "size": size}
+            result.update(time_function(func, repeats, min_repeat_time))
+            results.append(result)
+    for name, module in IMPORT_BENCHMARKS.items():
+        if names is None or name in names:
+            results.append({"name": name, "size": 0, **time_import(module, repeats)})
+    return {
+        "meta": {
+            "commit": get_git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = REGRESSION_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Compare two benchmark outputs by their min time per call.
+    Returns one entry per benchmark present in both, flagged as a regression if it got slower by more than threshold.
+    """
+    baseline_by_key = {(r["name"], r["size"]): r for r in baseline["results"]}
+    output = []
+    for result in current["results"]:
+        key = (result["name"], result["size"])
+        if key not in baseline_by_key:
+            continue
+        ratio = result["min"] / baseline_by_key[key]["min"] if baseline_by_key[key]["min"] else float("inf")
+        output.append({
+            "name": result["name"],
+            "size": result["size"],
+            "baseline": baseline_by_key[key]["min"],
+            "current": result["min"],
+            "ratio": ratio,
+            "regression": ratio > threshold,
+        })
+    return output
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Trains hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="number of cities per map")
+    parser.add_argument("--only", nargs="+", help="names of the benchmarks to run")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, names=args.only, repeats=args.repeats, seed=args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        comparison = compare_results(baseline, results, args.threshold)
+        for entry in comparison:
+            flag = "REGRESSION" if entry["regression"] else "ok"
+            print(f"{entry['name']:<30} {entry['size']:>6} {entry['baseline']:.6f}s -> {entry['current']:.6f}s "
+                  f"({entry['ratio']:.2f}x) {flag}", file=sys.stderr)
+        if any(entry["regression"] for entry in comparison):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
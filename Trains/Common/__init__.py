@@ -0,0 +1,26 @@
+from Trains.Utils.lazy import lazy_exports
+
+# the submodules are imported on first use of one of their names
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "CityAdjacency": "adjacency",
+    "ConnectionBitset": "connection_bitset",
+    "ConnectionIndex": "connection_bitset",
+    "CONNECTION": "constants",
+    "GAME": "constants",
+    "MAP": "constants",
+    "CriticalConnectionIndex": "critical_connections",
+    "City": "map",
+    "COLORS": "map",
+    "Color": "map",
+    "Connection": "map",
+    "Destination": "map",
+    "Map": "map",
+    "sort_cities": "map",
+    "sort_connections": "map",
+    "sort_destinations": "map",
+    "MapBuilder": "map_builder",
+    "NameIndex": "name_index",
+    "PlayerGameState": "player_game_state",
+    "SharedMapTables": "shared_map",
+    "SpatialIndex": "spatial_index",
+})
@@ -0,0 +1,100 @@
+from array import array
+from typing import Any, Dict, Iterable, List
+
+from Trains.Common.connection_bitset import ConnectionIndex
+from Trains.Common.map import COLORS, City, sort_cities
+from Trains.Utils.graph import csr_component_ids
+
+
+class CityAdjacency:
+    """
+    A map's cities and connections as a graph in compressed sparse row form, over integer ids:
+        - cities are numbered in name order (see sort_cities)
+        - the neighbors of city i are neighbors[offsets[i]:offsets[i + 1]], and the connection leading to the j-th
+          of them has id connection_ids[j] in the map's ConnectionIndex (so ids agree with ConnectionBitsets), color
+          COLORS[colors[j]] and length lengths[j]
+    Every connection appears twice, once from each of its cities, and parallel connections each appear separately.
+    The rows are flat arrays, so traversals index into them without hashing or allocating anything per step.
+    """
+    def __init__(self, cities: Iterable[City], connection_index: ConnectionIndex):
+        self.__cities = sort_cities(cities)
+        self.__city_ids: Dict[str, int] = {city.get_name(): i for i, city in enumerate(self.__cities)}
+        num_cities = len(self.__cities)
+        connections = connection_index.get_connections()
+        color_ids = {color: i for i, color in enumerate(COLORS)}
+
+        ends = []
+        degrees = [0] * num_cities
+        for connection in connections:
+            city1, city2 = (self.__city_ids[city.get_name()] for city in connection.get_cities())
+            ends.append((city1, city2))
+            degrees[city1] += 1
+            degrees[city2] += 1
+        self.offsets = array("i", [0] * (num_cities + 1))
+        for i, degree in enumerate(degrees):
+            self.offsets[i + 1] = self.offsets[i] + degree
+
+        size = 2 * len(connections)
+        self.neighbors = array("i", [0] * size)
+        self.connection_ids = array("i", [0] * size)
+        self.colors = array("B", [0] * size)
+        self.lengths = array("B", [0] * size)
+        slots = list(self.offsets[:num_cities])
+        for connection_id, ((city1, city2), connection) in enumerate(zip(ends, connections)):
+            color = color_ids[connection.get_color()]
+            for city, neighbor in ((city1, city2), (city2, city1)):
+                slot = slots[city]
+                slots[city] += 1
+                self.neighbors[slot] = neighbor
+                self.connection_ids[slot] = connection_id
+                self.colors[slot] = color
+                self.lengths[slot] = connection.get_length()
+        self.num_cities = num_cities
+        self.num_connections = len(connections)
+        self.__component_ids = None
+
+    def get_city_id(self, city: City) -> int:
+        """
+        Return the id of the given city.
+        Raises ValueError if it is not one of the map's cities.
+        """
+        city_id = self.__city_ids.get(city.get_name())
+        if city_id is None or self.__cities[city_id] != city:
+            raise ValueError(f"{city} is not a city of this map.")
+        return city_id
+
+    def get_city(self, city_id: int) -> City:
+        """
+        Return the city with the given id. The City is shared, not copied.
+        """
+        return self.__cities[city_id]
+
+    def get_cities(self) -> List[City]:
+        """
+        Return every city, in id order.
+        """
+        return list(self.__cities)
+
+    def get_component_ids(self) -> array:
+        """
+        Label every city with the id of its connected component, numbering components in order of their lowest city.
+        Computed on first use, and reused afterwards; do not modify the returned array.
+        """
+        if self.__component_ids is None:
+            self.__component_ids = csr_component_ids(self.offsets, self.neighbors)
+        return self.__component_ids
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Return the rows as NumPy arrays (offsets, neighbors, connection_ids, colors and lengths), sharing memory with
+        this adjacency instead of copying it.
+        NumPy is optional: it is imported on first use, and ImportError is raised if it is not installed.
+        """
+        import numpy as np
+        return {
+            "offsets": np.frombuffer(self.offsets, dtype=np.int32),
+            "neighbors": np.frombuffer(self.neighbors, dtype=np.int32),
+            "connection_ids": np.frombuffer(self.connection_ids, dtype=np.int32),
+            "colors": np.frombuffer(self.colors, dtype=np.uint8),
+            "lengths": np.frombuffer(self.lengths, dtype=np.uint8),
+        }
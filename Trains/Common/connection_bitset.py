@@ -0,0 +1,168 @@
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+from Trains.Common.map import Connection, sort_connections
+
+
+class ConnectionIndex:
+    """
+    Gives each connection of a map a stable integer id: its position when the connections are sorted
+    (see sort_connections), so the same map always numbers its connections the same way.
+    """
+    def __init__(self, connections: Iterable[Connection]):
+        self.__connections = sort_connections(set(connections))
+        self.__ids: Dict[Connection, int] = {c: i for i, c in enumerate(self.__connections)}
+
+    def __len__(self) -> int:
+        return len(self.__connections)
+
+    def has_connection(self, c: Connection) -> bool:
+        return c in self.__ids
+
+    def get_id(self, c: Connection) -> int:
+        """
+        Return the id of the given connection.
+        Raises ValueError if the connection is not in this index.
+        """
+        connection_id = self.__ids.get(c)
+        if connection_id is None:
+            raise ValueError(f"{c} is not a connection of this map.")
+        return connection_id
+
+    def get_connection(self, connection_id: int) -> Connection:
+        """
+        Return the connection with the given id. The Connection is shared, not copied.
+        """
+        return self.__connections[connection_id]
+
+    def get_connections(self) -> List[Connection]:
+        """
+        Return every connection, in id order.
+        """
+        return list(self.__connections)
+
+    def to_bitset(self, connections: Iterable[Connection]) -> "ConnectionBitset":
+        """
+        Turn connections of this index into a ConnectionBitset.
+        """
+        bits = 0
+        for c in connections:
+            bits |= 1 << self.get_id(c)
+        return ConnectionBitset(self, bits)
+
+    def from_ids(self, connection_ids: Iterable[int]) -> "ConnectionBitset":
+        bits = 0
+        for connection_id in connection_ids:
+            if not 0 <= connection_id < len(self.__connections):
+                raise ValueError(f"Connection id {connection_id} is out of range.")
+            bits |= 1 << connection_id
+        return ConnectionBitset(self, bits)
+
+    def empty(self) -> "ConnectionBitset":
+        return ConnectionBitset(self, 0)
+
+    def all(self) -> "ConnectionBitset":
+        return ConnectionBitset(self, (1 << len(self.__connections)) - 1)
+
+
+class ConnectionBitset:
+    """
+    An immutable set of the connections of one ConnectionIndex, stored as an int where bit i is set iff the
+    connection with id i is in the set.
+    Set operations (|, &, -, ^, ~), equality, hashing and size are all done on the int, without touching any
+    Connection.
+    """
+    __slots__ = ("__index", "__bits")
+
+    def __init__(self, index: ConnectionIndex, bits: int = 0):
+        self.__index = index
+        self.__bits = bits
+
+    def get_index(self) -> ConnectionIndex:
+        return self.__index
+
+    def get_bits(self) -> int:
+        return self.__bits
+
+    def __check_same_index(self, other: "ConnectionBitset") -> None:
+        if not isinstance(other, ConnectionBitset) or other.__index is not self.__index:
+            raise ValueError("Can only combine bitsets of the same ConnectionIndex.")
+
+    def __or__(self, other: "ConnectionBitset") -> "ConnectionBitset":
+        self.__check_same_index(other)
+        return ConnectionBitset(self.__index, self.__bits | other.__bits)
+
+    def __and__(self, other: "ConnectionBitset") -> "ConnectionBitset":
+        self.__check_same_index(other)
+        return ConnectionBitset(self.__index, self.__bits & other.__bits)
+
+    def __sub__(self, other: "ConnectionBitset") -> "ConnectionBitset":
+        self.__check_same_index(other)
+        return ConnectionBitset(self.__index, self.__bits & ~other.__bits)
+
+    def __xor__(self, other: "ConnectionBitset") -> "ConnectionBitset":
+        self.__check_same_index(other)
+        return ConnectionBitset(self.__index, self.__bits ^ other.__bits)
+
+    def __invert__(self) -> "ConnectionBitset":
+        return ConnectionBitset(self.__index, self.__index.all().__bits & ~self.__bits)
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, ConnectionBitset)
+            and other.__index is self.__index
+            and other.__bits == self.__bits
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.__bits)
+
+    def __len__(self) -> int:
+        return bin(self.__bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self.__bits != 0
+
+    def __contains__(self, c: Connection) -> bool:
+        return self.__index.has_connection(c) and self.has_id(self.__index.get_id(c))
+
+    def __iter__(self) -> Iterator[Connection]:
+        for connection_id in self.ids():
+            yield self.__index.get_connection(connection_id)
+
+    def __repr__(self) -> str:
+        return f"ConnectionBitset({self.ids()})"
+
+    def has_id(self, connection_id: int) -> bool:
+        return (self.__bits >> connection_id) & 1 == 1
+
+    def add(self, c: Connection) -> "ConnectionBitset":
+        """
+        Return a new bitset that also has the given connection.
+        """
+        return ConnectionBitset(self.__index, self.__bits | (1 << self.__index.get_id(c)))
+
+    def isdisjoint(self, other: "ConnectionBitset") -> bool:
+        self.__check_same_index(other)
+        return self.__bits & other.__bits == 0
+
+    def issubset(self, other: "ConnectionBitset") -> bool:
+        self.__check_same_index(other)
+        return self.__bits & ~other.__bits == 0
+
+    def ids(self) -> List[int]:
+        """
+        Return the ids of the connections in this set, in increasing order.
+        """
+        output = []
+        bits = self.__bits
+        while bits:
+            lowest = bits & -bits
+            output.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return output
+
+    def to_connections(self) -> Set[Connection]:
+        """
+        Return a deep copy of the connections in this set.
+        """
+        return set([c.copy() for c in self])
@@ -13,4 +13,10 @@ class GAME:
     NUM_DESTINATIONS_PER_PLAYER = 2
     INITIAL_NUM_RAILS = 45
     NUM_TOTAL_CARDS = 250
-
+    NUM_INITIAL_CARDS = 4
+    NUM_CARDS_PER_DRAW = 2
+    NUM_DESTINATION_OPTIONS = 5
+    DESTINATION_POINTS = 10
+    LONGEST_PATH_POINTS = 20
+    MIN_PLAYERS_PER_GAME = 2
+    MAX_PLAYERS_PER_GAME = 8
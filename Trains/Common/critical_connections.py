@@ -0,0 +1,140 @@
+from array import array
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from Trains.Common.connection_bitset import ConnectionBitset
+from Trains.Common.map import City, Connection, Destination, Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Utils.graph import csr_bfs_iter, csr_bridges_and_articulation_points, csr_path_edges
+
+
+class CriticalConnectionIndex:
+    """
+    The bridges and articulation points of the part of a map one player can still use: every connection except the
+    ones other players own.
+    A bridge is a connection that, once an opponent acquires it, disconnects every pair of cities it was the only
+    link between; an articulation point is a city every path between some pair of cities goes through.
+
+    Built in linear time over the map's CityAdjacency. When an opponent acquires a connection, only the component
+    that connection was in is searched again; connections acquired by the player itself change nothing, since the
+    player can still use them.
+    """
+    def __init__(self, trains_map: Map, unusable: Optional[ConnectionBitset] = None):
+        self.__index = trains_map.get_connection_index()
+        self.__adjacency = trains_map.get_adjacency()
+        adjacency = self.__adjacency
+        self.__usable = self.__index.all().get_bits()
+        if unusable is not None:
+            self.__usable &= ~unusable.get_bits()
+
+        # the cities of every connection, by connection id
+        self.__ends = array("i", [0] * (2 * adjacency.num_connections))
+        for city_id in range(adjacency.num_cities):
+            for slot in range(adjacency.offsets[city_id], adjacency.offsets[city_id + 1]):
+                connection_id = adjacency.connection_ids[slot]
+                self.__ends[2 * connection_id + (adjacency.neighbors[slot] < city_id)] = city_id
+
+        self.__component_of = array("i", [-1] * adjacency.num_cities)
+        # the bridges and articulation points of every component, by component id
+        self.__critical: Dict[int, Tuple[Set[int], Set[int]]] = {}
+        self.__num_components = 0
+        for city_id in range(adjacency.num_cities):
+            if self.__component_of[city_id] == -1:
+                self.__search(city_id)
+
+    @classmethod
+    def for_player(cls, trains_map: Map, pgs: PlayerGameState) -> "CriticalConnectionIndex":
+        """
+        Build the index for the player whose state is given, leaving out the connections its opponents own.
+        """
+        critical_index = cls(trains_map)
+        critical_index.update(pgs)
+        return critical_index
+
+    def __search(self, root: int) -> None:
+        """
+        Label the component of the given city with a new id, and find its bridges and articulation points.
+        """
+        adjacency = self.__adjacency
+        component = self.__num_components
+        self.__num_components += 1
+        for city_id in csr_bfs_iter(root, adjacency.offsets, adjacency.neighbors, adjacency.connection_ids,
+                                    self.__usable):
+            self.__component_of[city_id] = component
+        self.__critical[component] = csr_bridges_and_articulation_points(
+            adjacency.offsets, adjacency.neighbors, adjacency.connection_ids, self.__usable, roots=[root]
+        )
+
+    def remove(self, connection: Connection) -> None:
+        """
+        Leave the given connection out, e.g. because an opponent acquired it, searching its component again.
+        Does nothing if it was already left out.
+        """
+        connection_id = self.__index.get_id(connection)
+        if not self.__usable >> connection_id & 1:
+            return
+        self.__usable &= ~(1 << connection_id)
+        city1, city2 = self.__ends[2 * connection_id], self.__ends[2 * connection_id + 1]
+        del self.__critical[self.__component_of[city1]]
+        self.__search(city1)
+        if self.__component_of[city2] != self.__component_of[city1]:
+            self.__search(city2)
+
+    def update(self, pgs: PlayerGameState) -> None:
+        """
+        Leave out every connection the opponents of the player whose state is given own, and have not been left out
+        yet.
+        """
+        bitsets = pgs.get_ownership_bitsets(self.__index)
+        for i, owned in enumerate(bitsets):
+            if i != pgs.get_index():
+                for connection_id in owned.ids():
+                    if self.__usable >> connection_id & 1:
+                        self.remove(self.__index.get_connection(connection_id))
+
+    def get_usable(self) -> ConnectionBitset:
+        return ConnectionBitset(self.__index, self.__usable)
+
+    def get_bridges(self) -> ConnectionBitset:
+        """
+        Return every usable connection that is a bridge.
+        """
+        return self.__index.from_ids(
+            connection_id for bridges, _ in self.__critical.values() for connection_id in bridges
+        )
+
+    def is_bridge(self, connection: Connection) -> bool:
+        connection_id = self.__index.get_id(connection)
+        if not self.__usable >> connection_id & 1:
+            return False
+        return connection_id in self.__critical[self.__component_of[self.__ends[2 * connection_id]]][0]
+
+    def get_articulation_points(self) -> Set[City]:
+        return set(
+            self.__adjacency.get_city(city_id) for _, points in self.__critical.values() for city_id in points
+        )
+
+    def get_critical_connections(self, destination: Destination) -> Optional[ConnectionBitset]:
+        """
+        Return the connections every usable path between the cities of the destination goes through: the bridges on
+        any such path. Returns None if the destination cannot be connected anymore.
+        """
+        adjacency = self.__adjacency
+        city1, city2 = (adjacency.get_city_id(city) for city in destination.get_cities())
+        if self.__component_of[city1] != self.__component_of[city2]:
+            return None
+        path = csr_path_edges(city1, city2, adjacency.offsets, adjacency.neighbors, adjacency.connection_ids,
+                              self.__usable)
+        bridges = self.__critical[self.__component_of[city1]][0]
+        return self.__index.from_ids(connection_id for connection_id in path if connection_id in bridges)
+
+    def get_critical_connections_for(self, destinations: Iterable[Destination]) -> ConnectionBitset:
+        """
+        Return the connections critical to any of the given destinations (e.g. an opponent's likely destinations)
+        that can still be connected.
+        """
+        critical = self.__index.empty()
+        for destination in destinations:
+            connections = self.get_critical_connections(destination)
+            if connections is not None:
+                critical |= connections
+        return critical
@@ -1,10 +1,12 @@
+import hashlib
+import json
 import re
 from collections import defaultdict
 from enum import Enum
+from itertools import combinations
 from typing import Optional, Set, Tuple, Any, Iterable, List, Dict
 
 from Trains.Common.constants import CONNECTION, MAP
-from Trains.Utils.utils import bfs
 
 
 class Color(Enum):
@@ -57,6 +59,10 @@ class Color(Enum):
         return color_map.get(s.lower())
 
 
+# every Color, in a fixed order, for when colors are numbered (e.g. in arrays) or drawn from at random
+COLORS = sorted(Color.get_all_color_enums(), key=lambda color: color.value)
+
+
 class City:
     """
     Represents a city in the game.
@@ -75,6 +81,18 @@ class City:
         self.__name = self.__validate_name(name)
         self.__x, self.__y = self.__validate_coords(x, y)
 
+    @classmethod
+    def trusted(cls, name: str, x: int, y: int) -> "City":
+        """
+        Creates a City without validating its name and coordinates.
+        Only for values that are known to be valid, e.g. copies of an existing City.
+        """
+        city = cls.__new__(cls)
+        city.__name = name
+        city.__x = x
+        city.__y = y
+        return city
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, City):
             return False
@@ -149,7 +167,7 @@ class City:
         """
         Returns a copy of a City.
         """
-        return City(self.__name, self.__x, self.__y)
+        return City.trusted(self.__name, self.__x, self.__y)
 
 
 def sort_cities(cities: Iterable[City]) -> List[City]:
@@ -166,6 +184,16 @@ class Destination:
     def __init__(self, cities: Set[City]):
         self.__cities = self.__validate_cities(cities)
 
+    @classmethod
+    def trusted(cls, cities: Set[City]) -> "Destination":
+        """
+        Creates a Destination without validating its cities.
+        Only for values that are known to be valid, e.g. copies of an existing Destination.
+        """
+        destination = cls.__new__(cls)
+        destination.__cities = cities
+        return destination
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Destination):
             return False
@@ -202,7 +230,7 @@ class Destination:
         """
         Returns a deep copy of this Destination.
         """
-        return Destination(self.get_cities())
+        return Destination.trusted(self.get_cities())
 
 
 def sort_destinations(destinations: Set[Destination]) -> List[Destination]:
@@ -230,6 +258,18 @@ class Connection:
         self.__color = color
         self.__validate_connection()
 
+    @classmethod
+    def trusted(cls, cities: Set[City], *, length: int, color: Color) -> "Connection":
+        """
+        Creates a Connection without validating its cities, length and color.
+        Only for values that are known to be valid, e.g. copies of an existing Connection.
+        """
+        connection = cls.__new__(cls)
+        connection.__cities = cities
+        connection.__length = length
+        connection.__color = color
+        return connection
+
     def __eq__(self, other: Any) -> bool:
         """
         Determines whether this Connection is equal to another.
@@ -295,7 +335,7 @@ class Connection:
 
     def copy(self) -> "Connection":
         cities = set([c.copy() for c in self.__cities])
-        return Connection(cities, length=self.__length, color=self.__color)
+        return Connection.trusted(cities, length=self.__length, color=self.__color)
 
 
 def sort_connections(connections: Set[Connection]) -> List[Connection]:
@@ -320,8 +360,43 @@ class Map:
         self.__height, self.__width = self.__validate_height_width(height, width)
         self.__cities = self.__validate_cities(cities)
         self.__connections = self.__validate_connections(connections)
+        self.__spatial_index = None
+        self.__connection_index = None
+        self.__name_index = None
+        self.__adjacency = None
+        self.__fingerprint = None
         self.__destinations = self.__calculate_all_destinations()
 
+    @classmethod
+    def trusted(
+        cls,
+        cities: Set[City],
+        connections: Set[Connection],
+        *,
+        height: int = MAP.MAX_HEIGHT,
+        width: int = MAP.MAX_WIDTH,
+        destinations: Optional[Set[Destination]] = None
+    ) -> "Map":
+        """
+        Creates a Map without validating its size, cities and connections.
+        Only for values that are known to be valid, e.g. copies of an existing Map or maps built by the engine.
+        If the destinations are already known, they are used as is instead of being computed again.
+        """
+        trains_map = cls.__new__(cls)
+        trains_map.__height = height
+        trains_map.__width = width
+        trains_map.__cities = cities
+        trains_map.__connections = connections
+        trains_map.__spatial_index = None
+        trains_map.__connection_index = None
+        trains_map.__name_index = None
+        trains_map.__adjacency = None
+        trains_map.__fingerprint = None
+        trains_map.__destinations = (
+            destinations if destinations is not None else trains_map.__calculate_all_destinations()
+        )
+        return trains_map
+
     @staticmethod
     def __validate_height_width(height: int, width: int) -> Tuple[int, int]:
         """
@@ -420,30 +495,17 @@ class Map:
 
     def __calculate_all_destinations(self) -> Set[Destination]:
         """
-        Uses the city mapping and BFS to find all possible Destinations in this game map.
-        """
-        destinations = set()
-        cities = self.__cities
-        city_map = self.__make_city_map()
-
-        for city in cities:
-            all_cities_reachable_from_city = bfs(city, city_map)
-            for city_neighbor in all_cities_reachable_from_city:
-                if city_neighbor != city:
-                    destinations.add(Destination({city, city_neighbor}))
-        return destinations
-
-    def __make_city_map(self) -> Dict[City, Set[City]]:
-        """
-        Make a mapping between every city and the set of cities directly reachable from this city.
-        Directly reachable from city1 to city2: there exists a Connection between city1 and city2 (or vice-versa).
+        Every pair of cities in the same connected component (see CityAdjacency.get_component_ids) is a Destination.
         """
-        city_map = defaultdict(set)
-        for connection in self.__connections:
-            city1, city2 = connection.get_cities()
-            city_map[city1].add(city2)
-            city_map[city2].add(city1)
-        return city_map
+        adjacency = self.get_adjacency()
+        components: Dict[int, List[City]] = defaultdict(list)
+        for city_id, component in enumerate(adjacency.get_component_ids()):
+            components[component].append(adjacency.get_city(city_id))
+        return set(
+            Destination.trusted({city1, city2})
+            for component in components.values()
+            for city1, city2 in combinations(component, 2)
+        )
 
     def get_destinations(self) -> Set[Destination]:
         """
@@ -452,10 +514,87 @@ class Map:
         """
         return set([d.copy() for d in self.__destinations])
 
+    def get_fingerprint(self) -> str:
+        """
+        Returns a SHA-256 hex digest of this map's content: its size, cities and connections. Equal maps have equal
+        fingerprints, whatever order their cities and connections are in.
+        Computed on first use and reused afterwards.
+        """
+        if self.__fingerprint is None:
+            cities = sorted([c.get_name(), c.get_x(), c.get_y()] for c in self.__cities)
+            connections = sorted(
+                [c.get_name() for c in sort_cities(conn.get_cities())] + [conn.get_color().value, conn.get_length()]
+                for conn in self.__connections
+            )
+            content = json.dumps([self.__width, self.__height, cities, connections], separators=(",", ":"))
+            self.__fingerprint = hashlib.sha256(content.encode()).hexdigest()
+        return self.__fingerprint
+
+    def get_spatial_index(self) -> "SpatialIndex":
+        """
+        Returns a spatial index over this map's cities and connections, for nearest-city and region queries.
+        The index is built on first use and reused afterwards, since a Map never changes.
+        """
+        if self.__spatial_index is None:
+            # imported here since the spatial index depends on the classes in this module
+            from Trains.Common.spatial_index import SpatialIndex
+            self.__spatial_index = SpatialIndex(
+                self.get_cities(), self.get_connections(), width=self.__width, height=self.__height
+            )
+        return self.__spatial_index
+
+    def get_connection_index(self) -> "ConnectionIndex":
+        """
+        Returns the index giving each of this map's connections a stable id, used by ConnectionBitsets.
+        The index is built on first use and reused afterwards.
+        """
+        if self.__connection_index is None:
+            # imported here since the connection index depends on the classes in this module
+            from Trains.Common.connection_bitset import ConnectionIndex
+            self.__connection_index = ConnectionIndex(self.get_connections())
+        return self.__connection_index
+
+    def get_name_index(self) -> "NameIndex":
+        """
+        Returns the index looking up this map's cities and connections by name.
+        The index is built on first use and reused afterwards.
+        """
+        if self.__name_index is None:
+            # imported here since the name index depends on the classes in this module
+            from Trains.Common.name_index import NameIndex
+            self.__name_index = NameIndex(self.get_cities(), self.get_connections())
+        return self.__name_index
+
+    def get_adjacency(self) -> "CityAdjacency":
+        """
+        Returns this map's cities and connections as a graph in compressed sparse row form, over integer ids, for
+        traversals.
+        The adjacency is built on first use and reused afterwards.
+        """
+        if self.__adjacency is None:
+            # imported here since the adjacency depends on the classes in this module
+            from Trains.Common.adjacency import CityAdjacency
+            self.__adjacency = CityAdjacency(self.__cities, self.get_connection_index())
+        return self.__adjacency
+
+    def has_connection(self, c: Connection) -> bool:
+        """
+        Determines whether the given Connection is one of this map's connections, without copying them.
+        """
+        return self.get_connection_index().has_connection(c)
+
     def copy(self) -> "Map":
         """
         Return a deep copy of this Map.
+        The copy shares this map's indexes, which never change.
         """
         cities = set([c.copy() for c in self.__cities])
         conns = set([c.copy() for c in self.__connections])
-        return Map(cities, conns, height=self.__height, width=self.__width)
+        dests = set([d.copy() for d in self.__destinations])
+        trains_map = Map.trusted(cities, conns, height=self.__height, width=self.__width, destinations=dests)
+        trains_map.__spatial_index = self.__spatial_index
+        trains_map.__connection_index = self.__connection_index
+        trains_map.__name_index = self.__name_index
+        trains_map.__adjacency = self.__adjacency
+        trains_map.__fingerprint = self.__fingerprint
+        return trains_map
@@ -0,0 +1,234 @@
+from collections import deque
+from itertools import combinations
+from typing import Dict, Optional, Set, Tuple
+
+from Trains.Common.constants import MAP
+from Trains.Common.map import City, Color, Connection, Destination, Map, sort_cities
+
+
+class MapBuilder:
+    """
+    A mutable map, for building and editing a map one city or connection at a time, which is then frozen into an
+    immutable Map with build().
+
+    Every edit is validated on its own, against the same rules as a Map (unique names and coordinates, cities within
+    the bounds, connections between known cities), so build() does not validate anything again.
+    The builder also keeps track of which cities are connected: adding a connection merges the components of its
+    cities, and removing the last connection between two cities searches only the component they were in to see
+    whether it split. The destinations of each component are computed when the map is built, and reused by later
+    builds until the component changes again.
+    Cities are looked up by name, so that edits never hash a City.
+    """
+    def __init__(self, *, height: int = MAP.MAX_HEIGHT, width: int = MAP.MAX_WIDTH):
+        if not (
+            isinstance(height, int)
+            and isinstance(width, int)
+            and MAP.MIN_WIDTH <= width <= MAP.MAX_WIDTH
+            and MAP.MIN_HEIGHT <= height <= MAP.MAX_HEIGHT
+        ):
+            raise ValueError(f"Height must be an int between {MAP.MIN_HEIGHT} and {MAP.MAX_HEIGHT}. \n"
+                             f"Width must be an int between {MAP.MIN_WIDTH} and {MAP.MAX_WIDTH}. ")
+        self.__height = height
+        self.__width = width
+        self.__cities: Dict[str, City] = {}
+        self.__coords: Set[Tuple[int, int]] = set()
+        self.__connections: Dict[Tuple[str, str, Color, int], Connection] = {}
+        # the number of connections between every pair of neighboring cities
+        self.__neighbors: Dict[str, Dict[str, int]] = {}
+        self.__component_of: Dict[str, int] = {}
+        self.__components: Dict[int, Set[str]] = {}
+        self.__next_component = 0
+        # destinations of the components that have not changed since they were last computed
+        self.__destinations: Dict[int, Set[Destination]] = {}
+
+    @classmethod
+    def from_map(cls, trains_map: Map) -> "MapBuilder":
+        """
+        Start from the cities and connections of the given map.
+        """
+        builder = cls(height=trains_map.get_height(), width=trains_map.get_width())
+        for city in trains_map.get_cities():
+            builder.add_city(city)
+        for connection in trains_map.get_connections():
+            builder.add_connection(connection)
+        return builder
+
+    @staticmethod
+    def __key(connection: Connection) -> Tuple[str, str, Color, int]:
+        city1, city2 = sort_cities(connection.get_cities())
+        return city1.get_name(), city2.get_name(), connection.get_color(), connection.get_length()
+
+    def __new_component(self, names: Set[str]) -> None:
+        component = self.__next_component
+        self.__next_component += 1
+        self.__components[component] = names
+        for name in names:
+            self.__component_of[name] = component
+
+    def add_city(self, city: City) -> None:
+        """
+        Add the given city, in a component of its own.
+        Raises ValueError if it is out of bounds, or if its name or coordinates are taken.
+        """
+        if not isinstance(city, City):
+            raise ValueError("Cities must be City.")
+        name, x, y = city.get_name(), city.get_x(), city.get_y()
+        if not (0 <= x <= self.__width):
+            raise ValueError("City must have x coord between 0 and map width.")
+        if not (0 <= y <= self.__height):
+            raise ValueError("City must have y coord between 0 and map height.")
+        if name in self.__cities:
+            raise ValueError(f"No duplicate city names ({name}).")
+        if (x, y) in self.__coords:
+            raise ValueError(f"Two cities can't have the same coordinates of ({x}, {y}).")
+        self.__cities[name] = city
+        self.__coords.add((x, y))
+        self.__neighbors[name] = {}
+        self.__new_component({name})
+
+    def remove_city(self, name: str) -> None:
+        """
+        Remove the city with the given name, along with every connection to it.
+        Raises ValueError if there is no such city.
+        """
+        if name not in self.__cities:
+            raise ValueError(f"There is no city named {name}.")
+        for key in [key for key in self.__connections if name in key[:2]]:
+            self.remove_connection(self.__connections[key])
+        city = self.__cities.pop(name)
+        self.__coords.discard((city.get_x(), city.get_y()))
+        del self.__neighbors[name]
+        component = self.__component_of.pop(name)
+        del self.__components[component]
+        self.__destinations.pop(component, None)
+
+    def add_connection(self, connection: Connection) -> None:
+        """
+        Add the given connection, merging the components of its cities if they were not connected yet.
+        Raises ValueError if one of its cities is not one of this map's cities, or if the connection already exists.
+        """
+        if not isinstance(connection, Connection):
+            raise ValueError("Connections must be Connection.")
+        for city in connection.get_cities():
+            if self.__cities.get(city.get_name()) != city:
+                raise ValueError("Cities in connections must be specified in the cities of the Map.")
+        key = self.__key(connection)
+        if key in self.__connections:
+            raise ValueError(f"{connection} is already in the map.")
+        self.__connections[key] = connection
+        name1, name2 = key[0], key[1]
+        self.__neighbors[name1][name2] = self.__neighbors[name1].get(name2, 0) + 1
+        self.__neighbors[name2][name1] = self.__neighbors[name2].get(name1, 0) + 1
+
+        component1, component2 = self.__component_of[name1], self.__component_of[name2]
+        if component1 == component2:
+            return
+        # relabel the cities of the smaller component
+        if len(self.__components[component1]) < len(self.__components[component2]):
+            component1, component2 = component2, component1
+        merged = self.__components.pop(component2)
+        for name in merged:
+            self.__component_of[name] = component1
+        self.__components[component1] |= merged
+        self.__destinations.pop(component1, None)
+        self.__destinations.pop(component2, None)
+
+    def remove_connection(self, connection: Connection) -> None:
+        """
+        Remove the given connection. If it was the last connection between its cities, and they are no longer
+        connected, their component is split in two.
+        Raises ValueError if the connection is not in this map.
+        """
+        key = self.__key(connection) if isinstance(connection, Connection) else None
+        if key not in self.__connections:
+            raise ValueError(f"{connection} is not in the map.")
+        del self.__connections[key]
+        name1, name2 = key[0], key[1]
+        self.__neighbors[name1][name2] -= 1
+        self.__neighbors[name2][name1] -= 1
+        if self.__neighbors[name1][name2] > 0:
+            return
+        del self.__neighbors[name1][name2]
+        del self.__neighbors[name2][name1]
+
+        component = self.__component_of[name1]
+        split = self.__split_off(name1, name2)
+        if split is not None:
+            self.__components[component] -= split
+            self.__new_component(split)
+            self.__destinations.pop(component, None)
+
+    def __split_off(self, name1: str, name2: str) -> Optional[Set[str]]:
+        """
+        Search from both cities at once, one city at a time from each side. If the searches meet, the cities are
+        still connected and None is returned; otherwise the search that runs out first has found the smaller side of
+        the split, which is returned. Either way, only the cities of the smaller side are visited (about twice).
+        """
+        searches = [(deque([name1]), {name1}), (deque([name2]), {name2})]
+        while True:
+            for i, (queue, seen) in enumerate(searches):
+                if not queue:
+                    return seen
+                other_seen = searches[1 - i][1]
+                for neighbor in self.__neighbors[queue.popleft()]:
+                    if neighbor in other_seen:
+                        return None
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        queue.append(neighbor)
+
+    def get_city(self, name: str) -> City:
+        """
+        Return the city with the given name. Raises ValueError if there is none.
+        """
+        if name not in self.__cities:
+            raise ValueError(f"There is no city named {name}.")
+        return self.__cities[name]
+
+    def get_cities(self) -> Set[City]:
+        return set(self.__cities.values())
+
+    def get_connections(self) -> Set[Connection]:
+        return set(self.__connections.values())
+
+    def get_num_components(self) -> int:
+        """
+        Return the number of connected components, counting every city without connections as one.
+        """
+        return len(self.__components)
+
+    def are_connected(self, name1: str, name2: str) -> bool:
+        """
+        Determines whether the two named cities are connected by some path of connections.
+        Raises ValueError if either city is not in the map.
+        """
+        self.get_city(name1), self.get_city(name2)
+        return self.__component_of[name1] == self.__component_of[name2]
+
+    def get_destinations(self) -> Set[Destination]:
+        """
+        Return every pair of connected cities, as Map.get_destinations would. Only the components that changed since
+        the last call are enumerated again.
+        """
+        destinations = set()
+        for component, names in self.__components.items():
+            if component not in self.__destinations:
+                cities = [self.__cities[name] for name in names]
+                self.__destinations[component] = set(
+                    Destination.trusted({city1, city2}) for city1, city2 in combinations(cities, 2)
+                )
+            destinations |= self.__destinations[component]
+        return destinations
+
+    def build(self) -> Map:
+        """
+        Freeze the current state of this builder into a Map. Nothing is validated again, since every edit was.
+        Later edits do not change the built Map.
+        """
+        return Map.trusted(
+            self.get_cities(),
+            self.get_connections(),
+            height=self.__height,
+            width=self.__width,
+            destinations=self.get_destinations()
+        )
@@ -0,0 +1,33 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from Trains.Common.map import City, Color, Connection, sort_cities
+
+
+class NameIndex:
+    """
+    Looks up a map's cities by name, and its connections by the names of their cities, their color and their length,
+    so that turning names (e.g. from JSON) back into a map's Cities and Connections needs no linear searches.
+    The Cities and Connections returned are the ones the index was built with, and are shared between lookups.
+    """
+    def __init__(self, cities: Iterable[City], connections: Iterable[Connection]):
+        self.__cities: Dict[str, City] = {city.get_name(): city for city in cities}
+        self.__connections: Dict[Tuple[str, str, Color, int], Connection] = {}
+        for connection in connections:
+            city1, city2 = sort_cities(connection.get_cities())
+            key = (city1.get_name(), city2.get_name(), connection.get_color(), connection.get_length())
+            self.__connections[key] = connection
+
+    def get_city(self, name: str) -> Optional[City]:
+        """
+        Return the city with the given name, or None if the map has no such city.
+        """
+        return self.__cities.get(name)
+
+    def get_connection(self, city1_name: str, city2_name: str, color: Color, length: int) -> Optional[Connection]:
+        """
+        Return the connection between the two named cities (in either order) with the given color and length, or
+        None if the map has no such connection.
+        """
+        if city2_name < city1_name:
+            city1_name, city2_name = city2_name, city1_name
+        return self.__connections.get((city1_name, city2_name, color, length))
@@ -1,5 +1,6 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
+from Trains.Common.connection_bitset import ConnectionBitset, ConnectionIndex
 from Trains.Common.constants import GAME
 from Trains.Common.map import Connection, Destination, Color, Map
 
@@ -35,6 +36,34 @@ class PlayerGameState:
         self.__num_players = len(total_acquired_connections)
         self.__index = self.__get_this_player_index()
 
+    @classmethod
+    def trusted(
+        cls,
+        *,
+        acquired_connections: Set[Connection],
+        destinations: Set[Destination],
+        num_rails: int,
+        cards: Dict[Color, int],
+        total_acquired_connections: List[Set[Connection]],
+        index: Optional[int] = None
+    ) -> "PlayerGameState":
+        """
+        Creates a PlayerGameState without validating any of its inputs.
+        Only for states produced by the engine from an already valid state (e.g. copy() and obtain_connection()).
+        External inputs must go through the constructor.
+
+        :param index: This player's index in total_acquired_connections. Found by searching the list if not given.
+        """
+        pgs = cls.__new__(cls)
+        pgs.__acquired_connections = acquired_connections
+        pgs.__destinations = destinations
+        pgs.__num_rails = num_rails
+        pgs.__cards = cls.__put_all_colors_in_cards(cards)
+        pgs.__total_acquired_connections = total_acquired_connections
+        pgs.__num_players = len(total_acquired_connections)
+        pgs.__index = index if index is not None else pgs.__get_this_player_index()
+        return pgs
+
     @staticmethod
     def __validate_acquired_connections(acquired_connections: Set[Connection]):
         """
@@ -162,7 +191,7 @@ class PlayerGameState:
         """
         has_enough_rails = self.__num_rails >= c.get_length()
         has_enough_colored_cards = self.__cards[c.get_color()] >= c.get_length()
-        connection_in_map = c in trains_map.get_connections()
+        connection_in_map = trains_map.has_connection(c)
         is_connection_unacquired = self.__find_connection_in_total_acquired(c) == -1
         return (
             has_enough_rails
@@ -212,6 +241,12 @@ class PlayerGameState:
             for player_conns in self.__total_acquired_connections
         ]
 
+    def get_ownership_bitsets(self, connection_index: ConnectionIndex) -> List[ConnectionBitset]:
+        """
+        Return every player's connections as bitsets over the given map's connection index, in player order.
+        """
+        return [connection_index.to_bitset(player_conns) for player_conns in self.__total_acquired_connections]
+
     def copy(self) -> "PlayerGameState":
         """
         Return a deep copy of this player game state.
@@ -221,30 +256,67 @@ class PlayerGameState:
         cards = self.get_cards()
         total_conns = self.get_all_player_connections()
 
-        return PlayerGameState(
+        return PlayerGameState.trusted(
             acquired_connections=acquired_conns,
             destinations=dests,
             num_rails=self.__num_rails,
             cards=cards,
-            total_acquired_connections=total_conns
+            total_acquired_connections=total_conns,
+            index=self.__index
         )
 
     def obtain_connection(self, c: Connection) -> "PlayerGameState":
         """
         Obtains the given Connection. Assumes the Connection can be obtained.
+        The new state shares this state's (immutable) Connections and Destinations instead of copying them.
         """
-        new_acquired_connections = set(self.get_acquired_connections()).union({c})
-        dests = self.get_destinations()
+        new_acquired_connections = self.__acquired_connections.union({c.copy()})
         cards = self.get_cards()
         cards[c.get_color()] -= c.get_length()
-        total_conns = self.get_all_player_connections()
+        total_conns = list(self.__total_acquired_connections)
         total_conns[self.__index] = new_acquired_connections
-        return PlayerGameState(
+        return PlayerGameState.trusted(
             acquired_connections=new_acquired_connections,
-            destinations=dests,
+            destinations=set(self.__destinations),
             num_rails=self.__num_rails - c.get_length(),
             cards=cards,
-            total_acquired_connections=total_conns
+            total_acquired_connections=total_conns,
+            index=self.__index
+        )
+
+    def add_cards(self, cards: List[Color]) -> "PlayerGameState":
+        """
+        Return the state of this player after receiving the given cards.
+        """
+        new_cards = self.get_cards()
+        for color in cards:
+            new_cards[color] += 1
+        return PlayerGameState.trusted(
+            acquired_connections=self.__acquired_connections,
+            destinations=self.__destinations,
+            num_rails=self.__num_rails,
+            cards=new_cards,
+            total_acquired_connections=self.__total_acquired_connections,
+            index=self.__index
+        )
+
+    def update_all_player_connections(
+        self,
+        total_acquired_connections: List[Set[Connection]],
+        index: int
+    ) -> "PlayerGameState":
+        """
+        Return the state of this player after the game's connections changed (another player acquired a connection,
+        or players left the game), where this player is now at the given index.
+        ASSUMPTION: total_acquired_connections[index] are this player's connections.
+        """
+        return PlayerGameState.trusted(
+            acquired_connections=total_acquired_connections[index],
+            destinations=self.__destinations,
+            num_rails=self.__num_rails,
+            cards=self.__cards,
+            total_acquired_connections=total_acquired_connections,
+            index=index
         )
 
     def get_all_obtainable_connections_for_player(self, trains_map: Map) -> Set[Connection]:
@@ -0,0 +1,164 @@
+import struct
+from itertools import combinations
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+from Trains.Common.map import COLORS, City, Connection, Destination, Map, sort_cities
+
+MAGIC = b"TRNSMAP1"
+# magic, width, height, number of cities, number of connections, size of the city names in bytes
+HEADER = struct.Struct("<8siiiii")
+
+
+class SharedMapTables:
+    """
+    A map's static tables, laid out flat in one block of shared memory so that other processes can attach to them
+    without copying or unpickling anything:
+        - city_x, city_y, city_components: int32 per city, cities in name order
+        - connection_city1, connection_city2: int32 city ids per connection, connections in the order of the map's
+          ConnectionIndex (so ids agree with ConnectionBitsets)
+        - connection_colors: uint8 index into COLORS per connection
+        - connection_lengths: uint8 per connection
+        - the city names, UTF-8 encoded, NUL separated
+
+    The process that publishes the tables owns the shared memory and must unlink() it once every worker is done.
+    Workers attach() by name. Attaching is meant for processes started by the publisher (e.g. a process pool), which
+    share its resource tracker.
+    """
+    def __init__(self, memory: shared_memory.SharedMemory, is_owner: bool):
+        self.__memory = memory
+        self.__is_owner = is_owner
+        magic, self.width, self.height, num_cities, num_connections, names_size = HEADER.unpack_from(memory.buf)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory {memory.name} does not hold map tables.")
+        self.num_cities = num_cities
+        self.num_connections = num_connections
+
+        offset = HEADER.size
+        views = {}
+        for name, item_size, count, fmt in (
+            ("city_x", 4, num_cities, "i"),
+            ("city_y", 4, num_cities, "i"),
+            ("city_components", 4, num_cities, "i"),
+            ("connection_city1", 4, num_connections, "i"),
+            ("connection_city2", 4, num_connections, "i"),
+            ("connection_colors", 1, num_connections, "B"),
+            ("connection_lengths", 1, num_connections, "B"),
+        ):
+            views[name] = memory.buf[offset:offset + item_size * count].cast(fmt)
+            offset += item_size * count
+        self.city_x = views["city_x"]
+        self.city_y = views["city_y"]
+        self.city_components = views["city_components"]
+        self.connection_city1 = views["connection_city1"]
+        self.connection_city2 = views["connection_city2"]
+        self.connection_colors = views["connection_colors"]
+        self.connection_lengths = views["connection_lengths"]
+        self.__names = memory.buf[offset:offset + names_size]
+        self.__city_names: Optional[List[str]] = None
+
+    @staticmethod
+    def __layout(trains_map: Map) -> bytes:
+        cities = sort_cities(trains_map.get_cities())
+        city_ids: Dict[City, int] = {city: i for i, city in enumerate(cities)}
+        connections = trains_map.get_connection_index().get_connections()
+        city1s, city2s = [], []
+        for connection in connections:
+            city1, city2 = sort_cities(connection.get_cities())
+            city1s.append(city_ids[city1])
+            city2s.append(city_ids[city2])
+        color_ids = {color: i for i, color in enumerate(COLORS)}
+        names = b"\0".join(city.get_name().encode() for city in cities)
+        return b"".join([
+            HEADER.pack(MAGIC, trains_map.get_width(), trains_map.get_height(), len(cities), len(connections),
+                        len(names)),
+            struct.pack(f"<{len(cities)}i", *[city.get_x() for city in cities]),
+            struct.pack(f"<{len(cities)}i", *[city.get_y() for city in cities]),
+            struct.pack(f"<{len(cities)}i", *trains_map.get_adjacency().get_component_ids()),
+            struct.pack(f"<{len(connections)}i", *city1s),
+            struct.pack(f"<{len(connections)}i", *city2s),
+            bytes(color_ids[connection.get_color()] for connection in connections),
+            bytes(connection.get_length() for connection in connections),
+            names,
+        ])
+
+    @classmethod
+    def publish(cls, trains_map: Map, *, name: Optional[str] = None) -> "SharedMapTables":
+        """
+        Lay out the tables of the given map in a new block of shared memory (with the given name, or a generated
+        one), owned by the caller.
+        """
+        data = cls.__layout(trains_map)
+        memory = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        memory.buf[:len(data)] = data
+        return cls(memory, is_owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMapTables":
+        """
+        Attach to tables published by another process. Nothing is copied.
+        """
+        return cls(shared_memory.SharedMemory(name=name), is_owner=False)
+
+    def get_name(self) -> str:
+        """
+        Return the name of the shared memory, to pass to attach() in other processes.
+        """
+        return self.__memory.name
+
+    def get_city_names(self) -> List[str]:
+        """
+        Return the names of the cities, in city id order. Decoded on first use.
+        """
+        if self.__city_names is None:
+            self.__city_names = bytes(self.__names).decode().split("\0") if self.num_cities else []
+        return self.__city_names
+
+    def to_map(self) -> Map:
+        """
+        Build a Map from the tables. Nothing is validated (the tables were laid out from a valid Map), and the
+        destinations are every pair of cities in the same component, so no search is needed.
+        """
+        names = self.get_city_names()
+        cities = [City.trusted(names[i], self.city_x[i], self.city_y[i]) for i in range(self.num_cities)]
+        connections = set()
+        for i in range(self.num_connections):
+            connections.add(Connection.trusted(
+                {cities[self.connection_city1[i]], cities[self.connection_city2[i]]},
+                length=self.connection_lengths[i],
+                color=COLORS[self.connection_colors[i]]
+            ))
+        components: Dict[int, List[City]] = {}
+        for i, city in enumerate(cities):
+            components.setdefault(self.city_components[i], []).append(city)
+        destinations = set(
+            Destination.trusted({city1, city2})
+            for component in components.values()
+            for city1, city2 in combinations(component, 2)
+        )
+        return Map.trusted(set(cities), connections, height=self.height, width=self.width, destinations=destinations)
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory. Every view of the tables becomes unusable.
+        """
+        for view in (self.city_x, self.city_y, self.city_components, self.connection_city1, self.connection_city2,
+                     self.connection_colors, self.connection_lengths, self.__names):
+            view.release()
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory; only the publisher may do this, once no process needs the tables anymore.
+        """
+        if not self.__is_owner:
+            raise ValueError("Only the process that published the tables can unlink them.")
+        self.__memory.unlink()
+
+    def __enter__(self) -> "SharedMapTables":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        if self.__is_owner:
+            self.unlink()
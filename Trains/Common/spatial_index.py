@@ -0,0 +1,217 @@
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from Trains.Common.map import City, Connection, sort_cities
+
+CITIES_PER_CELL = 2
+
+
+def segment_intersects_rect(
+    x1: float, y1: float, x2: float, y2: float,
+    left: float, top: float, right: float, bottom: float
+) -> bool:
+    """
+    Determine whether the segment from (x1, y1) to (x2, y2) touches the rectangle [left, right] x [top, bottom],
+    using Liang-Barsky clipping.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - left), (dx, right - x1), (-dy, y1 - top), (dy, bottom - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                if t > t1:
+                    return False
+                t0 = max(t0, t)
+            else:
+                if t < t0:
+                    return False
+                t1 = min(t1, t)
+    return t0 <= t1
+
+
+class SpatialIndex:
+    """
+    A uniform grid over the cities and connections of a map, for region and nearest-neighbor queries.
+
+    Cells are sized so that each holds CITIES_PER_CELL cities on average. Each connection is stored in every cell its
+    segment passes through, so queries only look at the cells overlapping the query region.
+    The Cities and Connections returned are the ones the index was built with, and are shared between queries.
+    """
+    def __init__(self, cities: Iterable[City], connections: Iterable[Connection], *, width: int, height: int):
+        self.__cities = list(cities)
+        self.__width = width
+        self.__height = height
+        num_cities = max(1, len(self.__cities))
+        self.__cell_size = max(1.0, math.sqrt((width + 1) * (height + 1) * CITIES_PER_CELL / num_cities))
+        self.__num_cols = int(width // self.__cell_size) + 1
+        self.__num_rows = int(height // self.__cell_size) + 1
+
+        self.__city_cells: Dict[Tuple[int, int], List[City]] = defaultdict(list)
+        for city in self.__cities:
+            self.__city_cells[self.__cell_of(city.get_x(), city.get_y())].append(city)
+
+        # connections are referred to by their position in these lists, to avoid hashing Connections in queries
+        self.__connections = list(connections)
+        self.__connection_ends: List[Tuple[int, int, int, int]] = []
+        self.__connection_cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for connection_id, connection in enumerate(self.__connections):
+            city1, city2 = sort_cities(connection.get_cities())
+            ends = (city1.get_x(), city1.get_y(), city2.get_x(), city2.get_y())
+            self.__connection_ends.append(ends)
+            for cell in self.__cells_on_segment(*ends):
+                self.__connection_cells[cell].append(connection_id)
+
+    def __cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """
+        Return the (column, row) of the cell holding the given point, clamped to the grid.
+        """
+        col = min(max(int(x // self.__cell_size), 0), self.__num_cols - 1)
+        row = min(max(int(y // self.__cell_size), 0), self.__num_rows - 1)
+        return col, row
+
+    def __cells_on_segment(self, x1: int, y1: int, x2: int, y2: int) -> List[Tuple[int, int]]:
+        """
+        Return every cell the segment passes through, walking the grid from one end to the other
+        (Amanatides-Woo traversal).
+        """
+        col, row = self.__cell_of(x1, y1)
+        end_col, end_row = self.__cell_of(x2, y2)
+        cells = [(col, row)]
+        dx = x2 - x1
+        dy = y2 - y1
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        size = self.__cell_size
+        # the segment parameter t at which we cross the next vertical/horizontal grid line, and the t per cell
+        if dx != 0:
+            next_x = (col + (1 if dx > 0 else 0)) * size
+            t_max_x = (next_x - x1) / dx
+            t_delta_x = size / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy != 0:
+            next_y = (row + (1 if dy > 0 else 0)) * size
+            t_max_y = (next_y - y1) / dy
+            t_delta_y = size / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        while (col, row) != (end_col, end_row):
+            if t_max_x < t_max_y:
+                col += step_col
+                t_max_x += t_delta_x
+            elif t_max_y < t_max_x:
+                row += step_row
+                t_max_y += t_delta_y
+            else:
+                # passing exactly through a grid corner touches the cells on both sides of it
+                cells.append((col + step_col, row))
+                cells.append((col, row + step_row))
+                col += step_col
+                row += step_row
+                t_max_x += t_delta_x
+                t_max_y += t_delta_y
+            if not (0 <= col < self.__num_cols and 0 <= row < self.__num_rows):
+                break
+            cells.append((col, row))
+        return [(c, r) for c, r in cells if 0 <= c < self.__num_cols and 0 <= r < self.__num_rows]
+
+    def __cells_in_rect(self, left: float, top: float, right: float, bottom: float) -> Iterable[Tuple[int, int]]:
+        first_col, first_row = self.__cell_of(left, top)
+        last_col, last_row = self.__cell_of(right, bottom)
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                yield col, row
+
+    def get_cell_size(self) -> float:
+        return self.__cell_size
+
+    def cities_in_rect(self, left: float, top: float, right: float, bottom: float) -> Set[City]:
+        """
+        Return every city within the rectangle [left, right] x [top, bottom], edges included.
+        """
+        if left > right or top > bottom:
+            return set()
+        output = set()
+        for cell in self.__cells_in_rect(left, top, right, bottom):
+            for city in self.__city_cells.get(cell, []):
+                if left <= city.get_x() <= right and top <= city.get_y() <= bottom:
+                    output.add(city)
+        return output
+
+    def connections_in_rect(self, left: float, top: float, right: float, bottom: float) -> Set[Connection]:
+        """
+        Return every connection whose segment (drawn between its two cities) crosses or lies within the rectangle
+        [left, right] x [top, bottom], e.g. every connection visible in a viewport.
+        """
+        if left > right or top > bottom:
+            return set()
+        candidates = set()
+        for cell in self.__cells_in_rect(left, top, right, bottom):
+            candidates.update(self.__connection_cells.get(cell, []))
+        return {
+            self.__connections[connection_id] for connection_id in candidates
+            if segment_intersects_rect(*self.__connection_ends[connection_id], left, top, right, bottom)
+        }
+
+    def nearest_city(self, x: float, y: float, max_distance: Optional[float] = None) -> Optional[City]:
+        """
+        Return the city closest to (x, y), or None if there are no cities (within max_distance, if given).
+        Ties are broken by city name.
+
+        Searches rings of cells outwards from the cell holding (x, y), and stops as soon as no unvisited cell can
+        hold a closer city.
+        """
+        best: Optional[Tuple[float, str, City]] = None
+        col, row = self.__cell_of(x, y)
+        max_ring = max(self.__num_cols, self.__num_rows)
+        for ring in range(max_ring + 1):
+            # every cell in this ring is at least this far from (x, y)
+            ring_distance = self.__distance_to_ring(x, y, col, row, ring)
+            if best is not None and ring_distance > best[0]:
+                break
+            if max_distance is not None and ring_distance > max_distance:
+                break
+            for cell in self.__ring(col, row, ring):
+                for city in self.__city_cells.get(cell, []):
+                    candidate = (math.hypot(city.get_x() - x, city.get_y() - y), city.get_name(), city)
+                    if best is None or candidate[:2] < best[:2]:
+                        best = candidate
+        if best is None or (max_distance is not None and best[0] > max_distance):
+            return None
+        return best[2]
+
+    def __distance_to_ring(self, x: float, y: float, col: int, row: int, ring: int) -> float:
+        """
+        Return a lower bound on the distance from (x, y), which lies in cell (col, row), to any cell of the given
+        ring around that cell.
+        """
+        if ring == 0:
+            return 0.0
+        size = self.__cell_size
+        in_cell_x = min(max(x - col * size, 0.0), size)
+        in_cell_y = min(max(y - row * size, 0.0), size)
+        to_edge = min(in_cell_x, size - in_cell_x, in_cell_y, size - in_cell_y)
+        return (ring - 1) * size + to_edge
+
+    def __ring(self, col: int, row: int, ring: int) -> Iterable[Tuple[int, int]]:
+        """
+        Yield the cells exactly `ring` cells away (in Chebyshev distance) from (col, row), within the grid.
+        """
+        if ring == 0:
+            yield col, row
+            return
+        for c in range(col - ring, col + ring + 1):
+            for r in (row - ring, row + ring):
+                if 0 <= c < self.__num_cols and 0 <= r < self.__num_rows:
+                    yield c, r
+        for r in range(row - ring + 1, row + ring):
+            for c in (col - ring, col + ring):
+                if 0 <= c < self.__num_cols and 0 <= r < self.__num_rows:
+                    yield c, r
@@ -0,0 +1,7 @@
+from Trains.Utils.lazy import lazy_exports
+
+# the submodules are imported on first use of one of their names
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "MapRenderer": "map_renderer",
+    "Raster": "raster",
+})
@@ -0,0 +1,143 @@
+import math
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from Trains.Common.map import City, Connection, Map, sort_cities, sort_connections
+from Trains.Editor.raster import RGB, Raster, hex_to_rgb
+
+PLAYER_COLORS = ["#ff8c00", "#9400d3", "#00ced1", "#ff1493", "#ffd700", "#8b4513", "#7fff00", "#000080"]
+BACKGROUND_COLOR = "#202020"
+CITY_COLOR = "#ffffff"
+SEGMENT_GAP = 2
+PARALLEL_SPACING = 6
+
+Segment = Tuple[float, float, float, float]
+
+
+class MapRenderer:
+    """
+    Draws a Map, and the connections each player owns, as a Raster.
+
+    The base layer (background, connections split into one segment per unit of length, and cities) never changes
+    for a given Map, so it is drawn once and cached. Ownership is drawn on top of it per turn; since players only
+    ever gain connections during a game, each frame is drawn on top of the previous one, and only the owned connections
+    from the first newly acquired one on (in sort_connections order, so that overlaps match a full redraw) are drawn.
+    """
+    def __init__(
+        self,
+        trains_map: Map,
+        *,
+        margin: int = 10,
+        connection_thickness: int = 3,
+        ownership_thickness: int = 7,
+        city_radius: int = 4
+    ):
+        self.__map = trains_map
+        self.__margin = margin
+        self.__connection_thickness = connection_thickness
+        self.__ownership_thickness = ownership_thickness
+        self.__city_radius = city_radius
+        self.__cities = trains_map.get_cities()
+        self.__segments = self.__layout_connections(trains_map.get_connections())
+        self.__base_layer = None
+        self.__last_frame = None
+        self.__last_owners: Dict[Connection, int] = {}
+
+    def __to_pixel(self, city: City) -> Tuple[int, int]:
+        return city.get_x() + self.__margin, city.get_y() + self.__margin
+
+    def __layout_connections(self, connections: Set[Connection]) -> Dict[Connection, List[Segment]]:
+        """
+        Compute where each connection is drawn: parallel connections between the same two cities are spread out
+        side by side, and each connection is split into as many segments as its length.
+        """
+        by_pair = defaultdict(list)
+        for connection in sort_connections(connections):
+            by_pair[tuple(sort_cities(connection.get_cities()))].append(connection)
+
+        output = {}
+        for (city1, city2), pair_connections in by_pair.items():
+            x1, y1 = self.__to_pixel(city1)
+            x2, y2 = self.__to_pixel(city2)
+            distance = math.hypot(x2 - x1, y2 - y1) or 1.0
+            # unit normal to the line between the cities
+            nx, ny = -(y2 - y1) / distance, (x2 - x1) / distance
+            for i, connection in enumerate(pair_connections):
+                offset = (i - (len(pair_connections) - 1) / 2) * PARALLEL_SPACING
+                ox, oy = nx * offset, ny * offset
+                length = connection.get_length()
+                gap = min(SEGMENT_GAP / distance, 0.5 / length)
+                segments = []
+                for part in range(length):
+                    start = part / length + gap
+                    end = (part + 1) / length - gap
+                    segments.append((
+                        x1 + (x2 - x1) * start + ox, y1 + (y2 - y1) * start + oy,
+                        x1 + (x2 - x1) * end + ox, y1 + (y2 - y1) * end + oy,
+                    ))
+                output[connection] = segments
+        return output
+
+    def __draw_connection(self, raster: Raster, connection: Connection) -> None:
+        color = hex_to_rgb(connection.get_color().get_hex())
+        for segment in self.__segments[connection]:
+            raster.draw_line(*segment, color, self.__connection_thickness)
+
+    def __draw_ownership(self, raster: Raster, connection: Connection, player_color: RGB) -> None:
+        segments = self.__segments[connection]
+        raster.draw_line(segments[0][0], segments[0][1], segments[-1][2], segments[-1][3], player_color,
+                         self.__ownership_thickness)
+        self.__draw_connection(raster, connection)
+        city_color = hex_to_rgb(CITY_COLOR)
+        for city in connection.get_cities():
+            raster.fill_circle(*self.__to_pixel(city), self.__city_radius, city_color)
+
+    def get_base_layer(self) -> Raster:
+        """
+        Return the cached image of the map without any ownership. Do not draw on it; copy it first.
+        """
+        if self.__base_layer is None:
+            raster = Raster(
+                self.__map.get_width() + 2 * self.__margin + 1,
+                self.__map.get_height() + 2 * self.__margin + 1,
+                hex_to_rgb(BACKGROUND_COLOR),
+            )
+            for connection in self.__segments:
+                self.__draw_connection(raster, connection)
+            city_color = hex_to_rgb(CITY_COLOR)
+            for city in self.__cities:
+                raster.fill_circle(*self.__to_pixel(city), self.__city_radius, city_color)
+            self.__base_layer = raster
+        return self.__base_layer
+
+    def render(self, all_player_connections: List[Set[Connection]]) -> Raster:
+        """
+        Return an image of the map where each player's connections are highlighted in that player's color
+        (PLAYER_COLORS, in player order).
+        """
+        if len(all_player_connections) > len(PLAYER_COLORS):
+            raise ValueError(f"Can render at most {len(PLAYER_COLORS)} players.")
+        owners = {}
+        for player_idx, player_connections in enumerate(all_player_connections):
+            for connection in player_connections:
+                if connection not in self.__segments:
+                    raise ValueError("Owned connections must be connections of the rendered map.")
+                owners[connection] = player_idx
+
+        is_continuation = self.__last_frame is not None and all(
+            owners.get(connection) == player_idx for connection, player_idx in self.__last_owners.items()
+        )
+        frame = self.__last_frame if is_continuation else self.get_base_layer().copy()
+        to_draw = sort_connections(set(owners))
+        if is_continuation:
+            # overlapping connections are drawn in sorted order, as in a full redraw, so every owned connection from
+            # the first new one on is drawn again
+            first_new = next((i for i, connection in enumerate(to_draw) if connection not in self.__last_owners),
+                             len(to_draw))
+            to_draw = to_draw[first_new:]
+        for connection in to_draw:
+            self.__draw_ownership(frame, connection, hex_to_rgb(PLAYER_COLORS[owners[connection]]))
+
+        self.__last_frame = frame
+        self.__last_owners = owners
+        return frame.copy()
@@ -0,0 +1,101 @@
+import struct
+import zlib
+from typing import Tuple
+
+RGB = Tuple[int, int, int]
+
+
+def hex_to_rgb(hex_color: str) -> RGB:
+    """
+    Turns a hex color of the form "#rrggbb" into an (r, g, b) tuple.
+    """
+    hex_color = hex_color.lstrip("#")
+    return int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+
+
+class Raster:
+    """
+    A width x height RGB image stored as one flat bytearray, with just enough drawing primitives to draw a map.
+    Everything drawn outside of the image is clipped.
+    """
+    def __init__(self, width: int, height: int, background: RGB = (0, 0, 0), *, pixels: bytearray = None):
+        if not (isinstance(width, int) and isinstance(height, int) and width > 0 and height > 0):
+            raise ValueError("Raster width and height must be positive integers.")
+        self.width = width
+        self.height = height
+        self.pixels = pixels if pixels is not None else bytearray(bytes(background) * (width * height))
+
+    def copy(self) -> "Raster":
+        """
+        Return a copy of this raster; copying is a single buffer copy.
+        """
+        return Raster(self.width, self.height, pixels=bytearray(self.pixels))
+
+    def get_pixel(self, x: int, y: int) -> RGB:
+        offset = (y * self.width + x) * 3
+        return self.pixels[offset], self.pixels[offset + 1], self.pixels[offset + 2]
+
+    def fill_rect(self, left: int, top: int, right: int, bottom: int, color: RGB) -> None:
+        """
+        Fill the rectangle [left, right] x [top, bottom] (inclusive), one row-slice assignment per row.
+        """
+        left, right = max(left, 0), min(right, self.width - 1)
+        top, bottom = max(top, 0), min(bottom, self.height - 1)
+        if left > right or top > bottom:
+            return
+        row = bytes(color) * (right - left + 1)
+        for y in range(top, bottom + 1):
+            offset = (y * self.width + left) * 3
+            self.pixels[offset:offset + len(row)] = row
+
+    def fill_circle(self, cx: int, cy: int, radius: int, color: RGB) -> None:
+        for dy in range(-radius, radius + 1):
+            half_width = int((radius * radius - dy * dy) ** 0.5)
+            self.fill_rect(cx - half_width, cy + dy, cx + half_width, cy + dy, color)
+
+    def draw_line(self, x0: float, y0: float, x1: float, y1: float, color: RGB, thickness: int = 1) -> None:
+        """
+        Draw a line of the given thickness (in pixels) between two points.
+        """
+        x0, y0, x1, y1 = round(x0), round(y0), round(x1), round(y1)
+        half = thickness // 2
+        other_half = thickness - 1 - half
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        step_x = 1 if x0 < x1 else -1
+        step_y = 1 if y0 < y1 else -1
+        error = dx + dy
+        # Bresenham, stamping a thickness x thickness square at every step
+        while True:
+            self.fill_rect(x0 - half, y0 - half, x0 + other_half, y0 + other_half, color)
+            if x0 == x1 and y0 == y1:
+                break
+            double_error = 2 * error
+            if double_error >= dy:
+                error += dy
+                x0 += step_x
+            if double_error <= dx:
+                error += dx
+                y0 += step_y
+
+    def to_png(self) -> bytes:
+        """
+        Encode this raster as an 8-bit RGB PNG.
+        """
+        row_size = self.width * 3
+        # every scanline is prefixed with filter type 0 (none)
+        raw = b"".join(
+            b"\x00" + bytes(self.pixels[y * row_size:(y + 1) * row_size]) for y in range(self.height)
+        )
+
+        def chunk(chunk_type: bytes, data: bytes) -> bytes:
+            return (struct.pack(">I", len(data)) + chunk_type + data
+                    + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xffffffff))
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6))
+                + chunk(b"IEND", b""))
+
+    def save_png(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_png())
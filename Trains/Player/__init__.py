@@ -0,0 +1,13 @@
+from Trains.Utils.lazy import lazy_exports
+
+# the submodules are imported on first use of one of their names
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BuyNowStrategy": "buy_now_strategy",
+    "Hold10Strategy": "hold_10_strategy",
+    "DecisionCache": "memoized_strategy",
+    "MemoizedStrategy": "memoized_strategy",
+    "CardRequest": "strategy",
+    "ConnectionRequest": "strategy",
+    "IStrategy": "strategy",
+    "Move": "strategy",
+})
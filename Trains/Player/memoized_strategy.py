@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Set, Tuple
+
+from Trains.Common.map import COLORS, Color, Destination, Map, sort_cities
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.strategy import IStrategy, Move
+
+DEFAULT_MAX_SIZE = 100_000
+
+
+class DecisionCache:
+    """
+    A thread-safe LRU cache of the moves strategies made, keyed by the states they made them in (see
+    MemoizedStrategy.state_key). One cache may be shared by any number of MemoizedStrategies, since keys include the
+    strategy and the map.
+    """
+    def __init__(self, *, max_size: int = DEFAULT_MAX_SIZE):
+        if not (isinstance(max_size, int) and max_size > 0):
+            raise ValueError("Max size must be a positive integer.")
+        self.__max_size = max_size
+        self.__moves: "OrderedDict[Hashable, Move]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__moves)
+
+    def get(self, key: Hashable) -> Optional[Move]:
+        with self.__lock:
+            move = self.__moves.get(key)
+            if move is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__moves.move_to_end(key)
+            return move
+
+    def put(self, key: Hashable, move: Move) -> None:
+        with self.__lock:
+            self.__moves[key] = move
+            self.__moves.move_to_end(key)
+            if len(self.__moves) > self.__max_size:
+                self.__moves.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__moves.clear()
+
+
+class MemoizedStrategy(IStrategy):
+    """
+    Wraps a deterministic strategy (one whose move depends only on the map and the PlayerGameState, like
+    BuyNowStrategy and Hold10Strategy) so that a state seen before, in this game or in any other game on the same
+    map, is answered from a DecisionCache instead of by the strategy.
+    Every other call is passed on to the wrapped strategy.
+    """
+    def __init__(self, strategy: IStrategy, cache: Optional[DecisionCache] = None):
+        super().__init__()
+        if not isinstance(strategy, IStrategy):
+            raise ValueError("Only an IStrategy can be memoized.")
+        self.__strategy = strategy
+        self.__cache = cache if cache is not None else DecisionCache()
+        self.__name = f"{type(strategy).__module__}.{type(strategy).__qualname__}"
+        self.__fingerprint: Optional[str] = None
+
+    def get_strategy(self) -> IStrategy:
+        return self.__strategy
+
+    def get_cache(self) -> DecisionCache:
+        return self.__cache
+
+    def setup(self, trains_map: Map, num_rails: int, cards: List[Color]) -> None:
+        super().setup(trains_map, num_rails, cards)
+        self.__fingerprint = trains_map.get_fingerprint()
+        self.__strategy.setup(trains_map, num_rails, cards)
+
+    def pick(self, destinations: Set[Destination]) -> Set[Destination]:
+        return self.__strategy.pick(destinations)
+
+    def more(self, cards: List[Color]) -> None:
+        super().more(cards)
+        self.__strategy.more(cards)
+
+    def win(self, win_or_not: bool) -> None:
+        self.__strategy.win(win_or_not)
+
+    @staticmethod
+    def state_key(trains_map: Map, pgs: PlayerGameState) -> Tuple[Any, ...]:
+        """
+        A compact encoding of everything a player observes: which connections every player owns (as the ints of
+        ConnectionBitsets, in turn order), this player's seat, cards (a count per color), rails and destinations.
+        """
+        cards = pgs.get_cards()
+        destinations = tuple(sorted(
+            tuple(city.get_name() for city in sort_cities(destination.get_cities()))
+            for destination in pgs.get_destinations()
+        ))
+        return (
+            tuple(bitset.get_bits() for bitset in pgs.get_ownership_bitsets(trains_map.get_connection_index())),
+            pgs.get_index(),
+            tuple(cards.get(color, 0) for color in COLORS),
+            pgs.get_num_rails(),
+            destinations,
+        )
+
+    def play(self, pgs: PlayerGameState) -> Move:
+        key = (self.__name, self.__fingerprint, self.state_key(self.trains_map, pgs))
+        move = self.__cache.get(key)
+        if move is None:
+            move = self.__strategy.play(pgs)
+            self.__cache.put(key, move)
+        return move
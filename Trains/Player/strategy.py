@@ -71,7 +71,7 @@ class IStrategy(ABC):
         """
         Default functionality to setup(). stores all game information for the strategy to be able to use later.
         """
-        self.__trains_map = trains_map
+        self.trains_map = trains_map
         self.num_rails = num_rails
         self.cards = Counter(cards)
 
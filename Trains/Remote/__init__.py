@@ -0,0 +1,11 @@
+from Trains.Utils.lazy import lazy_exports
+
+# the submodules are imported on first use of one of their names: all of them need asyncio
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "RemoteClient": "client",
+    "DeltaDecoder": "delta",
+    "DeltaEncoder": "delta",
+    "ProtocolError": "protocol",
+    "ProxyPlayer": "proxy_player",
+    "RefereeServer": "server",
+})
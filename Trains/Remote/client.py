@@ -0,0 +1,56 @@
+import asyncio
+from typing import Optional
+
+from Trains.Common.map import Map
+from Trains.Player.strategy import IStrategy
+from Trains.Remote.delta import DeltaDecoder
+from Trains.Remote.protocol import (
+    MAX_MESSAGE_SIZE, decode_call, encode_message, encode_reply, read_message
+)
+
+
+class RemoteClient:
+    """
+    Plays one game on a RefereeServer with a local IStrategy: signs up under the given name, then answers every call
+    from the server by calling the strategy.
+    Strategy calls run in a worker thread, so a slow strategy never blocks the event loop.
+    """
+    def __init__(self, strategy: IStrategy, name: str):
+        self.__strategy = strategy
+        self.__name = name
+
+    async def run_tcp(self, host: str, port: int) -> Optional[bool]:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_MESSAGE_SIZE)
+        return await self.run(reader, writer)
+
+    async def run_unix(self, path: str) -> Optional[bool]:
+        reader, writer = await asyncio.open_unix_connection(path, limit=MAX_MESSAGE_SIZE)
+        return await self.run(reader, writer)
+
+    async def run(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Optional[bool]:
+        """
+        Play until told whether we won (returned), or until the server hangs up (None is returned).
+        """
+        trains_map: Optional[Map] = None
+        delta_decoder: Optional[DeltaDecoder] = None
+        try:
+            writer.write(encode_message(self.__name))
+            await writer.drain()
+            while True:
+                try:
+                    message = await read_message(reader)
+                except ConnectionError:
+                    return None
+                method, args = decode_call(message, trains_map, delta_decoder=delta_decoder)
+                if method == "setup":
+                    trains_map = args[0]
+                    delta_decoder = DeltaDecoder(trains_map)
+                result = await asyncio.to_thread(getattr(self.__strategy, method), *args)
+                writer.write(encode_message(encode_reply(method, result)))
+                await writer.drain()
+                if method == "win":
+                    return args[0]
+        except ConnectionError:
+            return None
+        finally:
+            writer.close()
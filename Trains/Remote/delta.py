@@ -0,0 +1,134 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from Trains.Common.connection_bitset import ConnectionBitset
+from Trains.Common.map import Color, Connection, Destination, Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Remote.protocol import ProtocolError, json_to_player_state, player_state_to_json
+from Trains.Translations.translations import ACQUIRED, CARDS, RAILS
+
+DELTA = "delta"
+DEFAULT_SNAPSHOT_INTERVAL = 10
+
+
+def _relative_order(items: List[Any], index: int) -> List[Any]:
+    """
+    Put this player (at the given index) first, followed by every other player in turn order, as in the JSON of a
+    PlayerGameState.
+    """
+    return items[index:] + items[:index]
+
+
+class DeltaEncoder:
+    """
+    The referee's side of the state updates sent to one player with each play call.
+
+    The first update, every snapshot_interval-th update after it, and any update that cannot be expressed as a delta
+    (e.g. after a player was ejected) are snapshots: the full JSON of the PlayerGameState. Every other update is
+    {"delta": {"acquired": [[connection id, ...] for every player], "cards": {color: change}, "rails": change}},
+    holding only the connections each player acquired since the last update (as ids of the map's ConnectionIndex, in
+    the same player order as a snapshot), and the changes to this player's cards and rails.
+    """
+    def __init__(self, trains_map: Map, *, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL):
+        if not (isinstance(snapshot_interval, int) and snapshot_interval > 0):
+            raise ValueError("Snapshot interval must be a positive integer.")
+        self.__index = trains_map.get_connection_index()
+        self.__snapshot_interval = snapshot_interval
+        self.__last: Optional[Tuple[List[ConnectionBitset], Dict[Color, int], int]] = None
+        self.__num_deltas = 0
+
+    def encode(self, pgs: PlayerGameState) -> Dict[str, Any]:
+        """
+        Return the update that brings the player from the last update it was sent to the given state.
+        """
+        owned = _relative_order(pgs.get_ownership_bitsets(self.__index), pgs.get_index())
+        cards = pgs.get_cards()
+        rails = pgs.get_num_rails()
+        last = self.__last
+        self.__last = (owned, cards, rails)
+        if (
+            last is None
+            or self.__num_deltas + 1 >= self.__snapshot_interval
+            or len(owned) != len(last[0])
+            or not all(old.issubset(new) for old, new in zip(last[0], owned))
+        ):
+            self.__num_deltas = 0
+            return player_state_to_json(pgs)
+
+        self.__num_deltas += 1
+        last_owned, last_cards, last_rails = last
+        card_changes = {
+            color.value: cards.get(color, 0) - last_cards.get(color, 0)
+            for color in sorted(set(cards) | set(last_cards), key=lambda color: color.value)
+            if cards.get(color, 0) != last_cards.get(color, 0)
+        }
+        return {
+            DELTA: {
+                ACQUIRED: [(new - old).ids() for old, new in zip(last_owned, owned)],
+                CARDS: card_changes,
+                RAILS: rails - last_rails,
+            }
+        }
+
+
+class DeltaDecoder:
+    """
+    The player's side of DeltaEncoder: caches the last state it decoded, and applies deltas to it.
+    Decoded states have this player first, like json_to_player_state.
+    """
+    def __init__(self, trains_map: Map):
+        self.__trains_map = trains_map
+        self.__index = trains_map.get_connection_index()
+        self.__last: Optional[Tuple[List[Set[Connection]], Set[Destination], Dict[Color, int], int]] = None
+
+    def decode(self, state_as_json: Any) -> PlayerGameState:
+        """
+        Decode a snapshot or a delta. Raises ProtocolError if it is invalid, or if it is a delta and no snapshot was
+        decoded before it.
+        """
+        if isinstance(state_as_json, dict) and DELTA in state_as_json:
+            return self.__apply_delta(state_as_json[DELTA])
+        pgs = json_to_player_state(state_as_json, self.__trains_map)
+        self.__last = (pgs.get_all_player_connections(), pgs.get_destinations(), pgs.get_cards(), pgs.get_num_rails())
+        return pgs
+
+    def __apply_delta(self, delta: Any) -> PlayerGameState:
+        if self.__last is None:
+            raise ProtocolError("Received a delta before any snapshot.")
+        owned, destinations, cards, rails = self.__last
+        try:
+            acquired_ids = delta[ACQUIRED]
+            card_changes = delta[CARDS]
+            rails = rails + delta[RAILS]
+            if not (isinstance(acquired_ids, list) and len(acquired_ids) == len(owned)):
+                raise ProtocolError("A delta must list the connections acquired by every player.")
+            if not isinstance(rails, int) or rails < 0:
+                raise ProtocolError("Rails must be a non-negative integer.")
+            cards = Counter(cards)
+            for color, change in card_changes.items():
+                if Color.string_to_color(color) is None:
+                    raise ProtocolError(f"{color} is not a color.")
+                cards[Color.string_to_color(color)] += change
+            if any(not isinstance(count, int) or count < 0 for count in cards.values()):
+                raise ProtocolError("Cards must be non-negative integers.")
+            new_owned = [self.__index.from_ids(ids).to_connections() for ids in acquired_ids]
+        except (KeyError, TypeError, AttributeError, ValueError) as e:
+            if isinstance(e, ProtocolError):
+                raise
+            raise ProtocolError(f"Invalid delta: {e}")
+
+        all_owned = set().union(*owned)
+        if any(new & all_owned for new in new_owned) or sum(map(len, new_owned)) != len(set().union(*new_owned)):
+            raise ProtocolError("A delta may only add connections nobody owns yet.")
+        owned = [old | new for old, new in zip(owned, new_owned)]
+        cards = dict(cards)
+        self.__last = (owned, destinations, cards, rails)
+        # the delta was checked against the last state, which was itself valid
+        return PlayerGameState.trusted(
+            acquired_connections=owned[0],
+            destinations=set(destinations),
+            num_rails=rails,
+            cards=cards,
+            total_acquired_connections=owned,
+            index=0
+        )
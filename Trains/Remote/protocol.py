@@ -0,0 +1,166 @@
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from Trains.Common.map import Color, Map, sort_destinations
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Translations.map_cache import MAP_CACHE
+from Trains.Translations.translations import ActionTranslation, DestinationTranslation, PlayerStateTranslation
+
+if TYPE_CHECKING:
+    from Trains.Remote.delta import DeltaDecoder, DeltaEncoder
+
+VOID = "void"
+# messages are read a line at a time, and a whole map is sent in one line
+MAX_MESSAGE_SIZE = 2 ** 26
+
+
+class ProtocolError(ValueError):
+    """
+    Raised when the other side of a connection sends something that does not follow the protocol.
+    """
+
+
+def encode_message(message: Any) -> bytes:
+    """
+    Messages are JSON values, one per line.
+    """
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+async def read_message(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one message. Raises ConnectionError if the other side hung up, and ProtocolError if it sent invalid JSON.
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed.")
+    try:
+        return json.loads(line)
+    except ValueError:
+        raise ProtocolError("Message is not valid JSON.")
+
+
+def cards_to_json(cards: List[Color]) -> List[str]:
+    return [color.value for color in cards]
+
+
+def json_to_cards(cards_as_json: Any) -> List[Color]:
+    if not isinstance(cards_as_json, list):
+        raise ProtocolError("Cards must be a list of colors.")
+    cards = [Color.string_to_color(c) if isinstance(c, str) else None for c in cards_as_json]
+    if None in cards:
+        raise ProtocolError("Cards must be a list of colors.")
+    return cards
+
+
+def player_state_to_json(pgs: PlayerGameState) -> Dict[str, Any]:
+    """
+    Turns a PlayerGameState into JSON (see PlayerStateTranslation.player_state_to_json).
+    """
+    return PlayerStateTranslation.player_state_to_json(pgs)
+
+
+def json_to_player_state(pgs_as_json: Any, trains_map: Map) -> PlayerGameState:
+    """
+    Turns the JSON of a PlayerGameState back into a PlayerGameState, where this player is the first player.
+    """
+    try:
+        return PlayerStateTranslation.json_to_player_state(pgs_as_json, trains_map)
+    except ValueError as e:
+        raise ProtocolError(f"Invalid player state: {e}")
+
+
+def encode_call(method: str, args: Tuple[Any, ...], *, delta_encoder: Optional["DeltaEncoder"] = None) -> List[Any]:
+    """
+    Turns a call of an IStrategy method into a message for a remote player: [method, [args...]].
+    The JSON of a map is computed once per map (see MAP_CACHE).
+    If a delta_encoder is given, the state of a play call is sent as an update from the last state sent with it.
+    """
+    if method == "setup":
+        trains_map, num_rails, cards = args
+        return [method, [MAP_CACHE.get_json(trains_map), num_rails, cards_to_json(cards)]]
+    if method == "pick":
+        destinations, = args
+        return [method, [[DestinationTranslation.destination_to_json(d) for d in sort_destinations(destinations)]]]
+    if method == "play":
+        pgs, = args
+        return [method, [delta_encoder.encode(pgs) if delta_encoder is not None else player_state_to_json(pgs)]]
+    if method == "more":
+        cards, = args
+        return [method, [cards_to_json(cards)]]
+    if method == "win":
+        return [method, [bool(args[0])]]
+    raise ValueError(f"Unknown method {method}.")
+
+
+def decode_call(
+    message: Any,
+    trains_map: Union[Map, None],
+    *,
+    delta_decoder: Optional["DeltaDecoder"] = None
+) -> Tuple[str, Tuple[Any, ...]]:
+    """
+    Turns a message from the referee back into a method name and its arguments.
+    trains_map is the map of the game, received with the setup call (None before that). The state of a play call
+    may be a delta (see Trains.Remote.delta) only if a delta_decoder is given. Maps are parsed through MAP_CACHE,
+    so every game on the same map shares one Map.
+    """
+    if not (isinstance(message, list) and len(message) == 2 and isinstance(message[1], list)):
+        raise ProtocolError("Calls must be of the form [method, [args...]].")
+    method, args = message
+    try:
+        if method == "setup":
+            map_as_json, num_rails, cards = args
+            return method, (MAP_CACHE.get_from_json(map_as_json), num_rails, json_to_cards(cards))
+        if trains_map is None:
+            raise ProtocolError("The first call must be setup.")
+        if method == "pick":
+            return method, (set(DestinationTranslation.json_to_map_destination(d, trains_map) for d in args[0]),)
+        if method == "play":
+            if delta_decoder is not None:
+                return method, (delta_decoder.decode(args[0]),)
+            return method, (json_to_player_state(args[0], trains_map),)
+        if method == "more":
+            return method, (json_to_cards(args[0]),)
+        if method == "win":
+            return method, (bool(args[0]),)
+    except (TypeError, IndexError, ValueError) as e:
+        if isinstance(e, ProtocolError):
+            raise
+        raise ProtocolError(f"Invalid arguments for {method}: {e}")
+    raise ProtocolError(f"Unknown method {method}.")
+
+
+def encode_reply(method: str, result: Any) -> Any:
+    """
+    Turns the value an IStrategy method returned into a reply message.
+    """
+    if method == "pick":
+        return [DestinationTranslation.destination_to_json(d) for d in sort_destinations(result)]
+    if method == "play":
+        return ActionTranslation.move_to_json(result)
+    return VOID
+
+
+def decode_reply(method: str, reply: Any, trains_map: Optional[Map]) -> Any:
+    """
+    Turns a reply from a remote player into the value the IStrategy method would have returned.
+    trains_map is the map of the game (None before setup); decoded connections and destinations must be on it.
+    """
+    if method in ("pick", "play") and trains_map is None:
+        raise ProtocolError("Cannot decode a reply before setup.")
+    try:
+        if method == "pick":
+            if not isinstance(reply, list):
+                raise ProtocolError("pick must return a list of destinations.")
+            return set(DestinationTranslation.json_to_map_destination(d, trains_map) for d in reply)
+        if method == "play":
+            return ActionTranslation.json_to_move(reply, trains_map)
+    except (TypeError, ValueError) as e:
+        if isinstance(e, ProtocolError):
+            raise
+        raise ProtocolError(f"Invalid reply to {method}: {e}")
+    if reply != VOID:
+        raise ProtocolError(f"{method} must reply {VOID}.")
+    return None
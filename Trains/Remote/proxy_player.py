@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Optional, Tuple
+
+from Trains.Common.map import Map
+from Trains.Remote.delta import DEFAULT_SNAPSHOT_INTERVAL, DeltaEncoder
+from Trains.Remote.protocol import decode_reply, encode_call, encode_message, read_message
+
+
+class ProxyPlayer:
+    """
+    The referee's stand-in for a player connected over a socket.
+    call() sends an IStrategy call to the remote player and waits (at most timeout seconds) for its reply.
+    The state sent with each play call is delta encoded, with a full snapshot every snapshot_interval calls; a
+    snapshot_interval of None always sends full states.
+    """
+    def __init__(
+        self,
+        name: str,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        snapshot_interval: Optional[int] = DEFAULT_SNAPSHOT_INTERVAL
+    ):
+        self.name = name
+        self.__reader = reader
+        self.__writer = writer
+        self.__snapshot_interval = snapshot_interval
+        self.__trains_map: Optional[Map] = None
+        self.__delta_encoder: Optional[DeltaEncoder] = None
+
+    async def call(self, method: str, args: Tuple[Any, ...], timeout: Optional[float]) -> Any:
+        """
+        Make the call and return the decoded reply.
+        Raises asyncio.TimeoutError if the player takes too long, ConnectionError if it hung up, and ProtocolError
+        if it replied with nonsense; the connection is closed in all of these cases.
+        """
+        if method == "setup":
+            self.__trains_map = args[0]
+            if self.__snapshot_interval is not None:
+                self.__delta_encoder = DeltaEncoder(args[0], snapshot_interval=self.__snapshot_interval)
+        try:
+            return await asyncio.wait_for(self.__call(method, args), timeout)
+        except Exception:
+            self.close()
+            raise
+
+    async def __call(self, method: str, args: Tuple[Any, ...]) -> Any:
+        self.__writer.write(encode_message(encode_call(method, args, delta_encoder=self.__delta_encoder)))
+        await self.__writer.drain()
+        reply = await read_message(self.__reader)
+        return decode_reply(method, reply, self.__trains_map)
+
+    def close(self) -> None:
+        if not self.__writer.is_closing():
+            self.__writer.close()
@@ -0,0 +1,134 @@
+import asyncio
+from typing import Callable, List, Optional, Set
+
+from Trains.Admin.referee import GameResult, GameSteps, PlayerCall, PlayerFailure, Referee
+from Trains.Common.map import Color, Map
+from Trains.Remote.protocol import MAX_MESSAGE_SIZE, read_message
+from Trains.Remote.proxy_player import ProxyPlayer
+
+DEFAULT_CALL_TIMEOUT = 2.0
+DEFAULT_SIGNUP_TIMEOUT = 5.0
+
+
+async def run_steps_async(steps: GameSteps, call_player: Callable[[PlayerCall], "asyncio.Future"]) -> GameResult:
+    """
+    Drive a game to completion by awaiting call_player for every PlayerCall.
+    Any exception raised while awaiting (including timeouts) is turned into a PlayerFailure.
+    """
+    try:
+        call = next(steps)
+        while True:
+            try:
+                result = await call_player(call)
+            except Exception as e:
+                result = PlayerFailure(f"{call.method} failed: {e!r}")
+            call = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+class RefereeServer:
+    """
+    Hosts games between remote players, all in one asyncio event loop.
+
+    Players connect (over TCP or a Unix socket) and sign up by sending their name as a JSON string. As soon as
+    players_per_game players are waiting, they start a game on the server's map. Every call to a player has a
+    deadline of call_timeout seconds; a player that misses it is ejected from its game without holding up any other
+    game.
+    """
+    def __init__(
+        self,
+        trains_map: Map,
+        *,
+        players_per_game: int = 2,
+        call_timeout: Optional[float] = DEFAULT_CALL_TIMEOUT,
+        signup_timeout: Optional[float] = DEFAULT_SIGNUP_TIMEOUT,
+        make_deck: Optional[Callable[[], List[Color]]] = None,
+        on_game_over: Optional[Callable[[List[str], GameResult], None]] = None
+    ):
+        # fails early if the map can't host games of this size
+        Referee(trains_map, players_per_game)
+        self.__trains_map = trains_map
+        self.__players_per_game = players_per_game
+        self.__call_timeout = call_timeout
+        self.__signup_timeout = signup_timeout
+        self.__make_deck = make_deck
+        self.__on_game_over = on_game_over
+        self.__waiting: List[ProxyPlayer] = []
+        self.__games: Set[asyncio.Task] = set()
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__games_finished = asyncio.Condition()
+        self.results: List[GameResult] = []
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Start accepting players on the given TCP address. Returns the port (useful when port is 0).
+        """
+        self.__server = await asyncio.start_server(self.__handle_signup, host, port, limit=MAX_MESSAGE_SIZE)
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path: str) -> None:
+        """
+        Start accepting players on the given Unix socket path.
+        """
+        self.__server = await asyncio.start_unix_server(self.__handle_signup, path, limit=MAX_MESSAGE_SIZE)
+
+    async def close(self) -> None:
+        """
+        Stop accepting players, cancel running games and hang up on waiting players.
+        """
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+        for game in list(self.__games):
+            game.cancel()
+        await asyncio.gather(*self.__games, return_exceptions=True)
+        for proxy in self.__waiting:
+            proxy.close()
+        self.__waiting = []
+
+    async def wait_for_games(self, num_games: int) -> List[GameResult]:
+        """
+        Wait until at least num_games games have finished, and return all results so far.
+        """
+        async with self.__games_finished:
+            await self.__games_finished.wait_for(lambda: len(self.results) >= num_games)
+        return list(self.results)
+
+    async def __handle_signup(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            name = await asyncio.wait_for(read_message(reader), self.__signup_timeout)
+        except Exception:
+            writer.close()
+            return
+        if not isinstance(name, str):
+            writer.close()
+            return
+        self.__waiting.append(ProxyPlayer(name, reader, writer))
+        while len(self.__waiting) >= self.__players_per_game:
+            players = self.__waiting[:self.__players_per_game]
+            self.__waiting = self.__waiting[self.__players_per_game:]
+            game = asyncio.get_running_loop().create_task(self.run_game(players))
+            self.__games.add(game)
+            game.add_done_callback(self.__games.discard)
+
+    async def run_game(self, players: List[ProxyPlayer]) -> GameResult:
+        """
+        Play one game between the given players, then hang up on them.
+        """
+        deck = self.__make_deck() if self.__make_deck is not None else None
+        referee = Referee(self.__trains_map, len(players), deck=deck)
+        try:
+            result = await run_steps_async(
+                referee.run(),
+                lambda call: players[call.seat].call(call.method, call.args, self.__call_timeout)
+            )
+        finally:
+            for player in players:
+                player.close()
+        if self.__on_game_over is not None:
+            self.__on_game_over([player.name for player in players], result)
+        async with self.__games_finished:
+            self.results.append(result)
+            self.__games_finished.notify_all()
+        return result
@@ -1,6 +1,7 @@
 import pytest
 
 from Trains.Common.map import City, Connection, Color, Map, Destination
+from Trains.Utils.map_generator import generate_map
 
 
 @pytest.fixture(name="boston")
@@ -47,6 +48,11 @@ def make_small_map(
     return Map(cities, conns, width=800, height=700)
 
 
+@pytest.fixture(name="game_map")
+def make_game_map() -> Map:
+    return generate_map(30, edge_density=2, seed=1)
+
+
 @pytest.fixture(name="choose_from_dests")
 def get_5_destinations(boston: City, nyc: City, la: City, dc: City):
     return {
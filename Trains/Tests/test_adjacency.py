@@ -0,0 +1,44 @@
+import pytest
+
+from Trains.Common.map import COLORS, City, Map
+from Trains.Utils.map_generator import generate_map
+
+
+class TestCityAdjacency:
+    @staticmethod
+    def test_rows(la_island_map: Map, nyc: City, dc: City, boston: City):
+        adjacency = la_island_map.get_adjacency()
+        index = la_island_map.get_connection_index()
+        assert [city.get_name() for city in adjacency.get_cities()] == ["boston", "dc", "la", "nyc"]
+        assert (adjacency.num_cities, adjacency.num_connections) == (4, 2)
+        assert list(adjacency.offsets) == [0, 1, 2, 2, 4]
+        nyc_id = adjacency.get_city_id(nyc)
+        row = range(adjacency.offsets[nyc_id], adjacency.offsets[nyc_id + 1])
+        assert {adjacency.get_city(adjacency.neighbors[slot]) for slot in row} == {dc, boston}
+        for slot in row:
+            connection = index.get_connection(adjacency.connection_ids[slot])
+            assert connection.get_cities() == {nyc, adjacency.get_city(adjacency.neighbors[slot])}
+            assert COLORS[adjacency.colors[slot]] == connection.get_color()
+            assert adjacency.lengths[slot] == connection.get_length()
+        with pytest.raises(ValueError):
+            adjacency.get_city_id(City("nyc", 1, 1))
+
+    @staticmethod
+    def test_components():
+        trains_map = generate_map(60, edge_density=2, num_components=3, seed=4)
+        adjacency = trains_map.get_adjacency()
+        components = adjacency.get_component_ids()
+        assert len(set(components)) == 3
+        # the lowest city is always in the first component
+        assert components[0] == 0
+        for city_id in range(adjacency.num_cities):
+            for slot in range(adjacency.offsets[city_id], adjacency.offsets[city_id + 1]):
+                assert components[adjacency.neighbors[slot]] == components[city_id]
+        assert trains_map.copy().get_adjacency() is adjacency
+
+    @staticmethod
+    def test_to_numpy(la_island_map: Map):
+        np = pytest.importorskip("numpy")
+        rows = la_island_map.get_adjacency().to_numpy()
+        assert rows["offsets"].tolist() == [0, 1, 2, 2, 4]
+        assert rows["neighbors"].dtype == np.int32
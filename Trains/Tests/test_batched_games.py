@@ -0,0 +1,107 @@
+import pytest
+
+from Trains.Admin.referee import make_deck, play_game
+from Trains.Common.map import Map
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Utils.map_generator import generate_map
+
+np = pytest.importorskip("numpy")
+from Trains.Admin.batched_games import DRAW_CARDS, BatchedGames  # noqa: E402
+
+
+class TestBatchedGames:
+    @staticmethod
+    def test_invalid():
+        trains_map = generate_map(10, seed=1)
+        with pytest.raises(ValueError):
+            BatchedGames(trains_map, 1, 4)
+        with pytest.raises(ValueError):
+            BatchedGames(trains_map, 2, 0)
+        games = BatchedGames(trains_map, 2, 4)
+        games.reset()
+        with pytest.raises(ValueError):
+            games.step([DRAW_CARDS] * 3)
+
+    @staticmethod
+    def test_reset(game_map: Map):
+        games = BatchedGames(game_map, 3, 5, seed=1)
+        obs = games.reset()
+        assert (obs["owner"] == -1).all()
+        assert (obs["cards"].sum(axis=2) == 4).all()
+        assert (obs["rails"] == 45).all()
+        assert (obs["active"] == 0).all()
+        assert obs["legal"].shape == (5, 1 + len(game_map.get_connections()))
+
+    @staticmethod
+    def test_step(game_map: Map):
+        games = BatchedGames(game_map, 2, 3, seed=1)
+        obs = games.reset()
+        games.cards[:, 0] = 10
+        legal = games.legal_actions()
+        action = int(np.flatnonzero(legal[0, 1:])[0]) + 1
+        cards_before = games.cards.copy()
+        # game 0 acquires a connection, game 1 draws, game 2 asks for a connection that does not exist
+        obs, rewards, dones, info = games.step([action, DRAW_CARDS, 10_000])
+        assert not dones.any()
+        assert obs["owner"][0, action - 1] == 0
+        assert obs["rails"][0, 0] == 45 - games.lengths[action - 1]
+        assert obs["cards"][1, 0].sum() == cards_before[1, 0].sum() + 2
+        assert not obs["alive"][2, 0]
+        assert list(obs["active"]) == [1, 1, 1]
+
+    @staticmethod
+    def test_last_round(game_map: Map):
+        games = BatchedGames(game_map, 3, 1, seed=1)
+        games.reset()
+        games.cards[:] = 10
+        games.rails[0, 0] = int(games.lengths.min())
+        # seat 0 acquires a connection as long as its rails, which starts the last round
+        action = 1 + int(np.flatnonzero((games.lengths == games.rails[0, 0]) & (games.owner[0] == -1))[0])
+        _, _, dones, _ = games.step([action])
+        assert games.rails[0, 0] == 0
+        # seats 1, 2 and then 0 again get one more turn each
+        for _ in range(2):
+            _, _, dones, _ = games.step([DRAW_CARDS])
+            assert not dones[0]
+        _, _, dones, _ = games.step([DRAW_CARDS])
+        assert dones[0]
+
+    @staticmethod
+    def test_matches_referee(game_map: Map):
+        # Hold10Strategy keeps the first destinations it is offered, like every player of BatchedGames
+        decks = [make_deck(seed) for seed in range(4)]
+        expected = [play_game(game_map, [Hold10Strategy() for _ in range(3)], deck=deck) for deck in decks]
+
+        games = BatchedGames(game_map, 3, len(decks))
+        games.reset(decks=np.stack([BatchedGames.deck_to_ids(deck) for deck in decks]))
+        strategy = Hold10Strategy()
+        strategy.setup(game_map, 45, [])
+        scores = [None] * len(decks)
+        while any(score is None for score in scores):
+            actions = [
+                games.move_to_action(strategy.play(games.get_player_game_state(game))) if scores[game] is None
+                else DRAW_CARDS
+                for game in range(len(decks))
+            ]
+            _, rewards, dones, info = games.step(actions)
+            for game in np.flatnonzero(dones):
+                if scores[game] is None:
+                    scores[game] = (rewards[game].tolist(), np.flatnonzero(info["winners"][game]).tolist())
+        for (rewards, winners), result in zip(scores, expected):
+            assert rewards == [result.scores[seat] for seat in range(3)]
+            assert winners == result.winners
+
+    @staticmethod
+    def test_many_random_steps(game_map: Map):
+        games = BatchedGames(game_map, 4, 64, seed=3)
+        obs = games.reset()
+        rng = np.random.default_rng(0)
+        num_done = 0
+        for _ in range(500):
+            # a random legal action in every game
+            choices = rng.random(obs["legal"].shape) * obs["legal"]
+            obs, rewards, dones, info = games.step(choices.argmax(axis=1))
+            num_done += int(dones.sum())
+            assert (obs["cards"] >= 0).all() and (obs["rails"] >= 0).all()
+            assert not info["ejected"].any()
+        assert num_done > 0
@@ -0,0 +1,28 @@
+import json
+
+from Trains.Benchmarks.benchmarks import BENCHMARKS, IMPORT_BENCHMARKS, compare_results, main, run_benchmarks
+
+
+class TestBenchmarks:
+    @staticmethod
+    def test_run_all_benchmarks():
+        results = run_benchmarks([10], repeats=1, min_repeat_time=0)
+        assert [r["name"] for r in results["results"]] == [b.name for b in BENCHMARKS] + list(IMPORT_BENCHMARKS)
+        for result in results["results"]:
+            assert result["size"] == (0 if result["name"] in IMPORT_BENCHMARKS else 10)
+            assert 0 < result["min"] <= result["median"]
+        json.dumps(results)
+
+    @staticmethod
+    def test_compare_results():
+        baseline = {"results": [{"name": "a", "size": 10, "min": 1.0}, {"name": "b", "size": 10, "min": 1.0}]}
+        current = {"results": [{"name": "a", "size": 10, "min": 1.1}, {"name": "b", "size": 10, "min": 2.0},
+                               {"name": "c", "size": 10, "min": 2.0}]}
+        comparison = compare_results(baseline, current, threshold=1.2)
+        assert [(c["name"], c["regression"]) for c in comparison] == [("a", False), ("b", True)]
+
+    @staticmethod
+    def test_main_writes_json(tmp_path):
+        output = tmp_path / "results.json"
+        assert main(["--sizes", "10", "--only", "map_copy", "--repeats", "1", "--output", str(output)]) == 0
+        assert [r["name"] for r in json.loads(output.read_text())["results"]] == ["map_copy"]
@@ -0,0 +1,68 @@
+import pytest
+
+from Trains.Common.connection_bitset import ConnectionIndex
+from Trains.Common.map import City, Color, Connection, Map
+from Trains.Utils.map_generator import generate_map
+
+
+class TestConnectionIndex:
+    @staticmethod
+    def test_stable_ids(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection):
+        index = la_island_map.get_connection_index()
+        assert index is la_island_map.get_connection_index()
+        assert index.get_id(nyc_to_boston) == 0
+        assert index.get_id(nyc_to_dc) == 1
+        assert la_island_map.copy().get_connection_index().get_id(nyc_to_dc) == 1
+        assert index.get_connection(1) == nyc_to_dc
+        assert len(index) == 2
+
+    @staticmethod
+    def test_unknown_connection(la_island_map: Map, la: City, nyc: City):
+        index = la_island_map.get_connection_index()
+        la_to_nyc = Connection({la, nyc}, length=3, color=Color.RED)
+        assert not la_island_map.has_connection(la_to_nyc)
+        with pytest.raises(ValueError):
+            index.get_id(la_to_nyc)
+        with pytest.raises(ValueError):
+            index.from_ids([2])
+
+
+class TestConnectionBitset:
+    @staticmethod
+    def test_round_trip(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection):
+        index = la_island_map.get_connection_index()
+        bitset = index.to_bitset({nyc_to_dc})
+        assert bitset.to_connections() == {nyc_to_dc}
+        assert nyc_to_dc in bitset
+        assert nyc_to_boston not in bitset
+        assert bitset.ids() == [1]
+        assert bitset.get_bits() == 0b10
+
+    @staticmethod
+    def test_set_operations():
+        trains_map = generate_map(40, edge_density=3, seed=5)
+        connections = sorted(trains_map.get_connections(), key=repr)
+        index = trains_map.get_connection_index()
+        a_set, b_set = set(connections[:70]), set(connections[50:])
+        a, b = index.to_bitset(a_set), index.to_bitset(b_set)
+        assert set(a | b) == a_set | b_set
+        assert set(a & b) == a_set & b_set
+        assert set(a - b) == a_set - b_set
+        assert set(a ^ b) == a_set ^ b_set
+        assert set(~a) == set(connections) - a_set
+        assert len(a & b) == 20
+        assert (a - b).isdisjoint(b)
+        assert (a & b).issubset(a)
+        assert a == index.to_bitset(a_set)
+        assert hash(a) == hash(index.to_bitset(a_set))
+        assert not index.empty()
+        assert index.all() == a | b
+
+    @staticmethod
+    def test_different_indexes(la_island_map: Map):
+        other_map = Map(la_island_map.get_cities(), la_island_map.get_connections())
+        with pytest.raises(ValueError):
+            la_island_map.get_connection_index().all() | other_map.get_connection_index().all()
+        assert la_island_map.get_connection_index().empty() != other_map.get_connection_index().empty()
+        # copies share the index of the map they were copied from
+        assert la_island_map.get_connection_index().all() == la_island_map.copy().get_connection_index().all()
@@ -0,0 +1,69 @@
+import random
+
+from Trains.Common.critical_connections import CriticalConnectionIndex
+from Trains.Common.map import City, Color, Connection, Destination, Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Utils.graph import bridges_and_articulation_points
+from Trains.Utils.map_generator import generate_map
+
+
+def expected_critical(trains_map: Map, usable):
+    edges = [tuple(sorted(c.get_name() for c in conn.get_cities())) for conn in usable]
+    bridges, points = bridges_and_articulation_points(edges)
+    return {usable[i] for i in bridges}, points
+
+
+class TestCriticalConnectionIndex:
+    @staticmethod
+    def test_small_map(la_island_map: Map, nyc: City, dc: City, boston: City, nyc_to_dc: Connection,
+                       nyc_to_boston: Connection):
+        critical_index = CriticalConnectionIndex(la_island_map)
+        assert critical_index.get_bridges().to_connections() == {nyc_to_dc, nyc_to_boston}
+        assert critical_index.get_articulation_points() == {nyc}
+        assert critical_index.get_critical_connections(Destination({boston, dc})).to_connections() == {
+            nyc_to_dc, nyc_to_boston
+        }
+
+        critical_index.remove(nyc_to_dc)
+        assert not critical_index.is_bridge(nyc_to_dc)
+        assert critical_index.get_bridges().to_connections() == {nyc_to_boston}
+        assert critical_index.get_articulation_points() == set()
+        assert critical_index.get_critical_connections(Destination({boston, dc})) is None
+
+    @staticmethod
+    def test_parallel_connections_are_not_bridges(nyc: City, dc: City, la: City):
+        blue = Connection({nyc, dc}, length=3, color=Color.BLUE)
+        red = Connection({nyc, dc}, length=3, color=Color.RED)
+        trains_map = Map({nyc, dc, la}, {blue, red})
+        critical_index = CriticalConnectionIndex(trains_map)
+        assert not critical_index.get_bridges()
+        critical_index.remove(red)
+        assert critical_index.get_bridges().to_connections() == {blue}
+
+    @staticmethod
+    def test_for_player(la_island_map: Map, nyc_to_dc: Connection, nyc_to_boston: Connection, choose_from_dests):
+        destinations = set(list(choose_from_dests)[:2])
+
+        def player_state(index: int) -> PlayerGameState:
+            total = [{nyc_to_dc}, {nyc_to_boston}]
+            return PlayerGameState(acquired_connections=total[index], destinations=destinations, num_rails=10, cards={},
+                                   total_acquired_connections=total)
+
+        # each player can still use its own connection, but not the other's
+        first = CriticalConnectionIndex.for_player(la_island_map, player_state(0))
+        assert first.get_usable().to_connections() == {nyc_to_dc}
+        second = CriticalConnectionIndex.for_player(la_island_map, player_state(1))
+        assert second.get_bridges().to_connections() == {nyc_to_boston}
+
+    @staticmethod
+    def test_incremental_matches_full_search():
+        rng = random.Random(5)
+        trains_map = generate_map(40, edge_density=1.3, num_components=2, seed=5)
+        critical_index = CriticalConnectionIndex(trains_map)
+        usable = trains_map.get_connection_index().get_connections()
+        rng.shuffle(usable)
+        while usable:
+            critical_index.remove(usable.pop())
+            bridges, points = expected_critical(trains_map, usable)
+            assert critical_index.get_bridges().to_connections() == bridges
+            assert {city.get_name() for city in critical_index.get_articulation_points()} == points
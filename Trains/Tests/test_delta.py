@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from Trains.Admin.referee import Referee, make_deck, run_steps
+from Trains.Common.map import Color, Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Remote.delta import DELTA, DeltaDecoder, DeltaEncoder
+from Trains.Remote.protocol import ProtocolError, json_to_player_state, player_state_to_json
+
+
+def play_with_deltas(trains_map: Map, snapshot_interval: int):
+    """
+    Play a game where every state sent to a player also goes through a DeltaEncoder and DeltaDecoder.
+    Returns the updates sent and whether each decoded state matched the full state.
+    """
+    players = [BuyNowStrategy(), Hold10Strategy(), BuyNowStrategy()]
+    player_map = Map.trusted(trains_map.get_cities(), trains_map.get_connections(),
+                             height=trains_map.get_height(), width=trains_map.get_width())
+    encoders = [DeltaEncoder(trains_map, snapshot_interval=snapshot_interval) for _ in players]
+    decoders = [DeltaDecoder(player_map) for _ in players]
+    updates = []
+    matches = []
+
+    def call_player(call):
+        if call.method == "play":
+            pgs, = call.args
+            update = json.loads(json.dumps(encoders[call.seat].encode(pgs)))
+            decoded = decoders[call.seat].decode(update)
+            expected = json_to_player_state(player_state_to_json(pgs), player_map)
+            matches.append(
+                decoded.get_all_player_connections() == expected.get_all_player_connections()
+                and decoded.get_cards() == expected.get_cards()
+                and decoded.get_num_rails() == expected.get_num_rails()
+                and decoded.get_destinations() == expected.get_destinations()
+            )
+            updates.append(update)
+        return getattr(players[call.seat], call.method)(*call.args)
+
+    run_steps(Referee(trains_map, len(players), deck=make_deck(2)).run(), call_player)
+    return updates, matches
+
+
+class TestDelta:
+    @staticmethod
+    def test_decoded_states_match(game_map: Map):
+        updates, matches = play_with_deltas(game_map, 5)
+        assert len(updates) > 10
+        assert all(matches)
+        assert any(DELTA in update for update in updates)
+
+    @staticmethod
+    def test_periodic_snapshots(game_map: Map):
+        updates, _ = play_with_deltas(game_map, 3)
+        first_player_updates = updates[::3][:6]
+        assert [DELTA in update for update in first_player_updates] == [False, True, True, False, True, True]
+
+    @staticmethod
+    def test_deltas_are_smaller(game_map: Map):
+        with_deltas, _ = play_with_deltas(game_map, 10)
+        without_deltas, _ = play_with_deltas(game_map, 1)
+        assert not any(DELTA in update for update in without_deltas)
+        assert len(json.dumps(with_deltas)) < len(json.dumps(without_deltas)) / 2
+
+    @staticmethod
+    def test_invalid_snapshot_interval(game_map: Map):
+        with pytest.raises(ValueError):
+            DeltaEncoder(game_map, snapshot_interval=0)
+
+
+class TestDeltaDecoder:
+    @staticmethod
+    def make_snapshot(trains_map: Map):
+        pgs = PlayerGameState.trusted(
+            acquired_connections=set(),
+            destinations=set(sorted(trains_map.get_destinations(), key=repr)[:2]),
+            num_rails=10,
+            cards={Color.RED: 2},
+            total_acquired_connections=[set(), set()],
+            index=0
+        )
+        return player_state_to_json(pgs)
+
+    @staticmethod
+    def test_delta_before_snapshot(game_map: Map):
+        with pytest.raises(ProtocolError):
+            DeltaDecoder(game_map).decode({DELTA: {"acquired": [[], []], "cards": {}, "rails": 0}})
+
+    @staticmethod
+    def test_applies_delta(game_map: Map):
+        decoder = DeltaDecoder(game_map)
+        decoder.decode(TestDeltaDecoder.make_snapshot(game_map))
+        pgs = decoder.decode({DELTA: {"acquired": [[0], [3]], "cards": {"red": -1, "blue": 1}, "rails": -3}})
+        index = game_map.get_connection_index()
+        assert pgs.get_all_player_connections() == [{index.get_connection(0)}, {index.get_connection(3)}]
+        assert pgs.get_cards()[Color.RED] == 1 and pgs.get_cards()[Color.BLUE] == 1
+        assert pgs.get_num_rails() == 7
+
+    @staticmethod
+    @pytest.mark.parametrize("delta", [
+        {"acquired": [[0]], "cards": {}, "rails": 0},
+        {"acquired": [[0], [0]], "cards": {}, "rails": 0},
+        {"acquired": [[10 ** 6], []], "cards": {}, "rails": 0},
+        {"acquired": [[], []], "cards": {"red": -3}, "rails": 0},
+        {"acquired": [[], []], "cards": {"teal": 1}, "rails": 0},
+        {"acquired": [[], []], "cards": {}, "rails": -11},
+        {"acquired": [[], []], "cards": {}},
+        "nonsense",
+    ])
+    def test_invalid_deltas(game_map: Map, delta):
+        decoder = DeltaDecoder(game_map)
+        decoder.decode(TestDeltaDecoder.make_snapshot(game_map))
+        with pytest.raises(ProtocolError):
+            decoder.decode({DELTA: delta})
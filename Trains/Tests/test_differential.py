@@ -0,0 +1,54 @@
+import json
+
+from Trains.Translations.translations import ConnectionsTranslation, MapTranslation
+from Trains.Utils.differential import CHECKS, Check, generate_case, main, run_checks
+
+
+class TestDifferential:
+    @staticmethod
+    def test_corpus():
+        assert run_checks(range(200)) == []
+
+    @staticmethod
+    def test_cases_are_reproducible():
+        assert generate_case(7).to_json() == generate_case(7).to_json()
+        assert generate_case(7).to_json() != generate_case(8).to_json()
+
+    @staticmethod
+    def test_failures_are_shrunk():
+        # an "optimized" scoring that ignores every player but the first
+        [scoring] = [check for check in CHECKS if check.name == "scoring"]
+        broken = Check(
+            "broken_scoring", scoring.reference, lambda case: scoring.optimized(case)[:1] * len(case.players)
+        )
+        seeds = [seed for seed in range(20) if len(generate_case(seed).players) > 1]
+        failures = run_checks(seeds, [broken])
+        assert failures
+        for failure in failures:
+            assert failure["check"] == "broken_scoring"
+            # two players, and as few connections as still tell them apart
+            assert len(failure["case"]["players"]) == 2
+            assert sum(len(player["acquired"]) for player in failure["case"]["players"]) <= 1
+            assert failure["reference"] != failure["optimized"]
+
+    @staticmethod
+    def test_main(capsys):
+        assert main(["--cases", "5", "--seed", "100", "--only", "destinations", "scoring"]) == 0
+        out, err = capsys.readouterr()
+        assert out == ""
+        assert err.strip() == "5 cases, 2 checks, 0 failures"
+
+    @staticmethod
+    def test_case_json():
+        case = generate_case(100)
+        case_json = case.to_json()
+        assert json.loads(json.dumps(case_json)) == case_json
+        trains_map = MapTranslation.json_to_map(case_json["map"])
+        assert trains_map.get_cities() == case.trains_map.get_cities()
+        assert trains_map.get_connections() == case.trains_map.get_connections()
+        assert len(case_json["players"]) == len(case.players)
+        for player_json, player in zip(case_json["players"], case.players):
+            acquired = {ConnectionsTranslation.json_to_map_connection(c, trains_map) for c in player_json["acquired"]}
+            assert acquired == player["acquired_connections"]
+            assert player_json["rails"] == player["num_rails"]
+            assert player_json["cards"] == {color.value: count for color, count in player["cards"].items() if count}
@@ -0,0 +1,91 @@
+import random
+
+from Trains.Common.map import Map
+from Trains.Utils.graph import (
+    bfs_iter, bridges_and_articulation_points, connected_components, csr_bfs_iter, csr_is_reachable, dfs_iter,
+    is_reachable, reachable, to_csr
+)
+
+
+def undirected(edges):
+    graph = {}
+    for node1, node2 in edges:
+        graph.setdefault(node1, set()).add(node2)
+        graph.setdefault(node2, set()).add(node1)
+    return graph
+
+
+def count_components(nodes, edges):
+    return len(set(connected_components(undirected(edges), nodes).values()))
+
+
+class TestTraversals:
+    @staticmethod
+    def test_orders():
+        graph = {1: [2, 3], 2: [4], 3: [4], 4: [1]}
+        assert list(bfs_iter(1, graph)) == [1, 2, 3, 4]
+        assert list(dfs_iter(1, graph)) == [1, 2, 4, 3]
+        assert list(bfs_iter(5, graph)) == [5]
+
+    @staticmethod
+    def test_reachability_is_directed():
+        graph = {1: {2}, 2: {1, 6}, 3: {1, 4}}
+        assert reachable(1, graph) == {1, 2, 6}
+        assert is_reachable(3, 6, graph)
+        assert not is_reachable(1, 3, graph)
+
+    @staticmethod
+    def test_long_path():
+        # deep enough to overflow a recursive traversal
+        graph = {i: [i + 1] for i in range(100_000)}
+        assert sum(1 for _ in dfs_iter(0, graph)) == 100_001
+
+    @staticmethod
+    def test_components():
+        graph = undirected([("a", "b"), ("b", "c"), ("d", "e")])
+        assert connected_components(graph, ["a", "b", "c", "d", "e", "f"]) == {
+            "a": 0, "b": 0, "c": 0, "d": 1, "e": 1, "f": 2
+        }
+
+    @staticmethod
+    def test_csr_allowed_edges():
+        nodes, offsets, neighbors, edge_ids = to_csr([("a", "b"), ("b", "c"), ("a", "c")])
+        assert nodes == ["a", "b", "c"]
+        assert sorted(csr_bfs_iter(0, offsets, neighbors)) == [0, 1, 2]
+        assert csr_is_reachable(0, 2, offsets, neighbors, edge_ids, allowed_edges=0b011)
+        assert not csr_is_reachable(0, 2, offsets, neighbors, edge_ids, allowed_edges=0b001)
+
+    @staticmethod
+    def test_map_adjacency(la_island_map: Map):
+        adjacency = la_island_map.get_adjacency()
+        assert sorted(csr_bfs_iter(3, adjacency.offsets, adjacency.neighbors)) == [0, 1, 3]
+
+
+class TestBridges:
+    @staticmethod
+    def test_simple():
+        # a triangle with a tail, and a parallel pair of edges
+        edges = [(1, 2), (2, 3), (3, 1), (3, 4), (4, 5), (4, 5)]
+        bridges, articulation_points = bridges_and_articulation_points(edges)
+        assert bridges == {3}
+        assert articulation_points == {3, 4}
+
+    @staticmethod
+    def test_against_brute_force():
+        rng = random.Random(11)
+        for _ in range(30):
+            nodes = list(range(12))
+            edges = [tuple(rng.sample(nodes, 2)) for _ in range(rng.randrange(5, 20))]
+            used = sorted({node for edge in edges for node in edge})
+            bridges, articulation_points = bridges_and_articulation_points(edges)
+            components = count_components(used, edges)
+            expected_bridges = {
+                i for i in range(len(edges)) if count_components(used, edges[:i] + edges[i + 1:]) > components
+            }
+            expected_points = {
+                node for node in used
+                if count_components([n for n in used if n != node], [edge for edge in edges if node not in edge])
+                > components
+            }
+            assert bridges == expected_bridges
+            assert articulation_points == expected_points
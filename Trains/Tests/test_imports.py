@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+import Trains.Admin
+import Trains.Translations
+
+
+def modules_loaded_by(code: str) -> List[str]:
+    """
+    Run code in a fresh interpreter, on this interpreter's import path, and return the modules it has imported by
+    the end.
+    """
+    return subprocess.run(
+        [sys.executable, "-c", f"import sys\n{code}\nprint('\\n'.join(sys.modules))"],
+        capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    ).stdout.split()
+
+
+class TestImports:
+    @staticmethod
+    def test_packages_import_nothing():
+        loaded = modules_loaded_by("import Trains.Admin, Trains.Common, Trains.Editor, Trains.Player, "
+                                   "Trains.Remote, Trains.Translations")
+        assert [m for m in loaded if m.startswith("Trains.")] == [
+            "Trains.Utils", "Trains.Utils.lazy", "Trains.Admin", "Trains.Common", "Trains.Editor", "Trains.Player",
+            "Trains.Remote", "Trains.Translations"
+        ]
+
+    @staticmethod
+    def test_map_translation_imports_no_game():
+        loaded = set(modules_loaded_by("from Trains.Translations import MAP_CACHE, MapTranslation"))
+        assert "Trains.Common.map" in loaded
+        heavy = {"numpy", "sqlite3", "asyncio", "multiprocessing", "Trains.Admin.referee_game_state",
+                 "Trains.Common.player_game_state", "Trains.Player.strategy"}
+        assert not heavy & loaded
+
+    @staticmethod
+    def test_lazy_attributes():
+        from Trains.Admin.referee import make_deck
+        from Trains.Translations.translations import MapTranslation
+        assert Trains.Admin.make_deck is make_deck
+        assert Trains.Translations.MapTranslation is MapTranslation
+        assert "WarmPool" in dir(Trains.Admin)
+        with pytest.raises(AttributeError):
+            Trains.Admin.NotAName
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from Trains.Common.map import Map
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.strategy import IStrategy
+from Trains.Translations.translations import MapTranslation
+from Trains.Utils.instrumentation import Hook, Instrumentation, add_default_hooks, instrumented
+
+
+class TestInstrumentation:
+    @staticmethod
+    def test_disabled_leaves_originals(la_island_map: Map):
+        original_init = Map.__init__
+        original_json_to_map = MapTranslation.__dict__["json_to_map"]
+        with instrumented():
+            assert Map.__init__ is not original_init
+        assert Map.__init__ is original_init
+        assert MapTranslation.__dict__["json_to_map"] is original_json_to_map
+
+    @staticmethod
+    def test_records_default_hooks(la_island_map: Map):
+        with instrumented(track_allocations=True) as instrumentation:
+            instrumentation.reset()
+            MapTranslation.json_to_map(MapTranslation.map_to_json(la_island_map))
+            strategy = BuyNowStrategy()
+            strategy.setup(la_island_map, 45, [])
+            strategy.pick(la_island_map.get_destinations())
+        stats = instrumentation.get_stats()
+        assert stats["Map.__init__"].calls == 1
+        assert stats["Map.calculate_all_destinations"].calls == 1
+        assert stats["MapTranslation.json_to_map"].calls == 1
+        assert stats["MapTranslation.map_to_json"].calls == 1
+        assert stats["IStrategy.setup"].calls == 1
+        assert stats["IStrategy.pick"].calls == 1
+        assert stats["Map.__init__"].total_time >= stats["Map.calculate_all_destinations"].total_time
+        assert "Map.__init__" in instrumentation.report()
+        assert json.loads(json.dumps(instrumentation.to_json()))["Map.__init__"]["calls"] == 1
+
+    @staticmethod
+    def test_default_hooks_resolve():
+        instrumentation = Instrumentation()
+        add_default_hooks(instrumentation)
+        for hook in instrumentation.get_hooks():
+            assert hook.get_owners(), hook.name
+
+    @staticmethod
+    def test_missing_hook_target():
+        with pytest.raises(AttributeError):
+            Hook("Map.calculate_all_destinations", Map, "__calculate_all_destinations")
+
+    @staticmethod
+    def test_subclass_hooks():
+        class Base:
+            def f(self):
+                return 1
+
+        class Child(Base):
+            def f(self):
+                return 2
+
+        class GrandChild(Child):
+            pass
+
+        instrumentation = Instrumentation()
+        instrumentation.add_hook(Hook("f", Base, "f", include_subclasses=True))
+        instrumentation.enable()
+        assert Base().f() == 1
+        assert GrandChild().f() == 2
+        instrumentation.disable()
+        assert Child().f() == 2
+        assert instrumentation.get_stats()["f"].calls == 2
+        assert "f" in vars(Child) and "f" not in vars(GrandChild)
+
+    @staticmethod
+    def test_timed_block():
+        instrumentation = Instrumentation()
+        with instrumentation.timed("block"):
+            pass
+        assert instrumentation.get_stats() == {}
+        instrumentation.enable()
+        with instrumentation.timed("block"):
+            pass
+        instrumentation.disable()
+        assert instrumentation.get_stats()["block"].calls == 1
@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import pytest
+
+from Trains.Admin.manager import Manager, allocate_game_sizes, partition_players
+from Trains.Admin.time_budget import TimeBudget
+from Trains.Common.map import Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Player.strategy import Move
+
+
+class SlowStrategy(BuyNowStrategy):
+    def play(self, pgs: PlayerGameState) -> Move:
+        time.sleep(1)
+        return super().play(pgs)
+
+
+class RemoteStandIn:
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+    async def call(self, method, args, timeout):
+        return getattr(self.strategy, method)(*args)
+
+
+class TestSeatAllocation:
+    @staticmethod
+    @pytest.mark.parametrize("num_players,sizes", [
+        (2, [2]), (8, [8]), (9, [5, 4]), (17, [6, 6, 5]), (10000, [8] * 1250),
+    ])
+    def test_game_sizes(num_players, sizes):
+        assert allocate_game_sizes(num_players) == sizes
+
+    @staticmethod
+    def test_too_few_players():
+        with pytest.raises(ValueError):
+            allocate_game_sizes(1)
+
+    @staticmethod
+    def test_balanced_sizes():
+        for num_players in range(2, 200):
+            sizes = allocate_game_sizes(num_players)
+            assert sum(sizes) == num_players
+            assert max(sizes) - min(sizes) <= 1
+            assert 2 <= min(sizes) and max(sizes) <= 8
+
+    @staticmethod
+    def test_partition_keeps_every_player():
+        games = partition_players(list(range(30)))
+        assert games[0] == [0, 1, 2, 3, 4, 5, 6, 7]
+        assert sorted(player for game in games for player in game) == list(range(30))
+
+
+class TestManager:
+    @staticmethod
+    def test_invalid_backend(game_map: Map):
+        with pytest.raises(ValueError):
+            Manager(game_map, [BuyNowStrategy(), BuyNowStrategy()], backend="gpu")
+
+    @staticmethod
+    def test_remote_players_need_asyncio(game_map: Map):
+        with pytest.raises(ValueError):
+            Manager(game_map, [RemoteStandIn(BuyNowStrategy()), BuyNowStrategy()])
+
+    @staticmethod
+    @pytest.mark.parametrize("backend", ["thread", "process", "asyncio"])
+    def test_champion_emerges(game_map: Map, backend: str):
+        players = [Hold10Strategy() if i % 3 else BuyNowStrategy() for i in range(20)]
+        result = Manager(game_map, players, backend=backend, max_workers=2, seed=3).run()
+        assert len(result.rounds) >= 2
+        assert [len(player_ids) for player_ids, _ in result.rounds[0]] == [7, 7, 6]
+        assert 1 <= len(result.winners) <= 8
+        last_round_players = {player for player_ids, _ in result.rounds[-1] for player in player_ids}
+        assert set(result.winners) <= last_round_players
+
+    @staticmethod
+    def test_backends_agree(game_map: Map):
+        results = [
+            Manager(game_map, [BuyNowStrategy() for _ in range(12)], backend=backend, seed=5).run()
+            for backend in ("thread", "process", "asyncio")
+        ]
+        assert results[0].winners == results[1].winners == results[2].winners
+        assert [r for _, r in results[0].rounds[0]] == [r for _, r in results[2].rounds[0]]
+
+    @staticmethod
+    def test_remote_stand_ins(game_map: Map):
+        players = [RemoteStandIn(BuyNowStrategy()) for _ in range(4)] + [Hold10Strategy() for _ in range(4)]
+        result = asyncio.run(Manager(game_map, players, backend="asyncio", seed=1).run_async())
+        assert result.winners
+
+    @staticmethod
+    def test_budget_ejects_slow_players(game_map: Map):
+        players = [SlowStrategy(), BuyNowStrategy(), BuyNowStrategy()]
+        budget = TimeBudget(0.5, play=0.1)
+        result = Manager(game_map, players, budget=budget, seed=1).run()
+        assert 0 in result.ejected
+        assert 0 not in result.winners
+
+    @staticmethod
+    def test_too_few_players(game_map: Map):
+        result = Manager(game_map, [BuyNowStrategy()]).run()
+        assert result.winners == [0]
+        assert result.rounds == []
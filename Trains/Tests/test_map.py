@@ -165,3 +165,17 @@ class TestMap:
         assert la_island_map.get_cities() == {nyc, boston, la, dc}
         assert la_island_map.get_destinations() == dests
         assert la_island_map.get_city_names() == city_names
+
+    @staticmethod
+    def test_copy(la_island_map: Map):
+        copy = la_island_map.copy()
+        assert copy.get_cities() == la_island_map.get_cities()
+        assert copy.get_connections() == la_island_map.get_connections()
+        assert copy.get_destinations() == la_island_map.get_destinations()
+        assert (copy.get_width(), copy.get_height()) == (800, 700)
+
+    @staticmethod
+    def test_trusted(la_island_map: Map):
+        trusted = Map.trusted(la_island_map.get_cities(), la_island_map.get_connections(), width=800, height=700)
+        assert trusted.get_destinations() == la_island_map.get_destinations()
+        assert trusted.get_width() == 800
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from Trains.Common.map import City, Color, Connection, Map
+from Trains.Common.map_builder import MapBuilder
+from Trains.Utils.map_generator import generate_map
+
+
+def assert_same_map(built: Map, expected: Map):
+    assert built.get_cities() == expected.get_cities()
+    assert built.get_connections() == expected.get_connections()
+    assert built.get_destinations() == expected.get_destinations()
+    assert built.get_fingerprint() == expected.get_fingerprint()
+
+
+class TestMapBuilder:
+    @staticmethod
+    def test_build(la_island_map: Map, nyc: City, boston: City, la: City, dc: City, nyc_to_dc: Connection,
+                   nyc_to_boston: Connection):
+        builder = MapBuilder(width=800, height=700)
+        for city in (nyc, boston, la, dc):
+            builder.add_city(city)
+        builder.add_connection(nyc_to_dc)
+        builder.add_connection(nyc_to_boston)
+        assert builder.get_num_components() == 2
+        assert builder.are_connected("boston", "dc")
+        assert not builder.are_connected("boston", "la")
+        assert_same_map(builder.build(), la_island_map)
+        assert_same_map(MapBuilder.from_map(la_island_map).build(), la_island_map)
+
+    @staticmethod
+    def test_invalid_edits(la_island_map: Map, nyc: City, la: City, nyc_to_dc: Connection):
+        with pytest.raises(ValueError):
+            MapBuilder(width=801)
+        builder = MapBuilder.from_map(la_island_map)
+        with pytest.raises(ValueError):
+            builder.add_city(City("nyc", 5, 5))
+        with pytest.raises(ValueError):
+            builder.add_city(City("sf", 0, 100))
+        with pytest.raises(ValueError):
+            builder.add_city(City("sf", 0, 701))
+        with pytest.raises(ValueError):
+            builder.add_connection(nyc_to_dc)
+        with pytest.raises(ValueError):
+            builder.add_connection(Connection({nyc, City("sf", 5, 5)}, length=3, color=Color.RED))
+        with pytest.raises(ValueError):
+            builder.remove_connection(Connection({nyc, la}, length=3, color=Color.RED))
+        with pytest.raises(ValueError):
+            builder.remove_city("sf")
+        # failed edits leave the builder as it was
+        assert_same_map(builder.build(), la_island_map)
+
+    @staticmethod
+    def test_removals(la_island_map: Map, nyc: City, dc: City, nyc_to_dc: Connection):
+        builder = MapBuilder.from_map(la_island_map)
+        parallel = Connection({nyc, dc}, length=4, color=Color.RED)
+        builder.add_connection(parallel)
+        builder.remove_connection(nyc_to_dc)
+        # still connected by the parallel connection
+        assert builder.are_connected("nyc", "dc")
+        builder.remove_connection(parallel)
+        assert not builder.are_connected("nyc", "dc")
+        assert builder.get_num_components() == 3
+        assert_same_map(builder.build(), Map(builder.get_cities(), builder.get_connections(), width=800, height=700))
+
+        builder.remove_city("nyc")
+        assert builder.get_connections() == set()
+        assert builder.get_num_components() == 3
+        assert builder.build().get_destinations() == set()
+
+    @staticmethod
+    def test_random_edits_match_map():
+        rng = random.Random(7)
+        trains_map = generate_map(40, edge_density=1.2, num_components=3, seed=7)
+        builder = MapBuilder.from_map(trains_map)
+        connections = list(trains_map.get_connections())
+        cities = list(trains_map.get_cities())
+        for _ in range(60):
+            if connections and rng.random() < 0.5:
+                builder.remove_connection(connections.pop(rng.randrange(len(connections))))
+            else:
+                city1, city2 = rng.sample(cities, 2)
+                connection = Connection({city1, city2}, length=rng.choice([3, 4, 5]), color=rng.choice(list(Color)))
+                if connection not in builder.get_connections():
+                    builder.add_connection(connection)
+                    connections.append(connection)
+            built = builder.build()
+            expected = Map(builder.get_cities(), builder.get_connections(),
+                           width=trains_map.get_width(), height=trains_map.get_height())
+            assert built.get_destinations() == expected.get_destinations()
+
+    @staticmethod
+    def test_edits_on_a_big_map():
+        # built city by city, since constructing a Map this size enumerates its half a million destinations
+        rng = random.Random(3)
+        builder = MapBuilder()
+        cities = [City(f"city {i}", i % 40 * 20, i // 40 * 20) for i in range(1000)]
+        for city in cities:
+            builder.add_city(city)
+        connections = []
+        for i in range(1, 1000):
+            connections.append(Connection({cities[i], cities[rng.randrange(i)]}, length=3, color=Color.RED))
+            connections.append(Connection({cities[i], cities[rng.randrange(i)]}, length=4, color=Color.BLUE))
+        for connection in connections:
+            builder.add_connection(connection)
+        # how long edits take is measured by the map_builder_edit benchmark
+        for connection in connections[:200]:
+            builder.remove_connection(connection)
+            assert builder.get_num_components() == 1
+            builder.add_connection(connection)
+        for connection in connections[::2]:
+            builder.remove_connection(connection)
+        assert builder.get_num_components() == 1
+        assert builder.are_connected("city 0", "city 999")
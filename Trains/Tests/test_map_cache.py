@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from Trains.Common.map import City, Connection, Map
+from Trains.Translations.map_cache import MapCache, map_weight
+from Trains.Translations.translations import MapTranslation
+from Trains.Utils.map_generator import generate_map
+
+
+class TestFingerprint:
+    @staticmethod
+    def test_order_independent(la_island_map: Map):
+        cities = la_island_map.get_cities()
+        connections = la_island_map.get_connections()
+        reordered = Map(set(reversed(sorted(cities, key=repr))), set(reversed(sorted(connections, key=repr))),
+                        width=800, height=700)
+        assert reordered.get_fingerprint() == la_island_map.get_fingerprint()
+        assert la_island_map.copy().get_fingerprint() == la_island_map.get_fingerprint()
+
+    @staticmethod
+    def test_content_changes_fingerprint(la_island_map: Map, nyc_to_dc: Connection):
+        smaller = Map(la_island_map.get_cities(), {nyc_to_dc}, width=800, height=700)
+        resized = Map(la_island_map.get_cities(), la_island_map.get_connections(), width=799, height=700)
+        moved = Map(la_island_map.get_cities() | {City("paris", 1, 1)}, la_island_map.get_connections(),
+                    width=800, height=700)
+        fingerprints = {m.get_fingerprint() for m in (la_island_map, smaller, resized, moved)}
+        assert len(fingerprints) == 4
+
+
+class TestMapCache:
+    @staticmethod
+    def test_parses_once(la_island_map: Map):
+        cache = MapCache()
+        map_as_json = MapTranslation.map_to_json(la_island_map)
+        first = cache.get_from_json(map_as_json)
+        second = cache.get_from_json(json.loads(json.dumps(map_as_json)))
+        assert first is second
+        assert first.get_fingerprint() == la_island_map.get_fingerprint()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @staticmethod
+    def test_equal_maps_are_shared(la_island_map: Map):
+        cache = MapCache()
+        text = json.dumps(MapTranslation.map_to_json(la_island_map))
+        parsed = cache.get_from_json_text(text)
+        reformatted = cache.get_from_json_text(text.replace(" ", ""))
+        assert parsed is reformatted
+        assert cache.intern(la_island_map.copy()) is parsed
+        assert len(cache) == 1
+
+    @staticmethod
+    def test_invalid_json():
+        with pytest.raises(ValueError):
+            MapCache().get_from_json({"width": 10})
+
+    @staticmethod
+    def test_evicts_least_recently_used():
+        maps = [generate_map(10, edge_density=2, seed=seed) for seed in range(3)]
+        cache = MapCache(max_weight=2 * max(map_weight(m) for m in maps))
+        first = cache.intern(maps[0])
+        cache.intern(maps[1])
+        assert cache.intern(maps[0].copy()) is first
+        cache.intern(maps[2])
+        assert len(cache) == 2
+        assert cache.intern(maps[0].copy()) is first
+        assert cache.intern(maps[1].copy()) is not maps[1]
+        assert cache.get_weight() <= 2 * max(map_weight(m) for m in maps)
+
+    @staticmethod
+    def test_map_heavier_than_cache_is_kept(la_island_map: Map):
+        cache = MapCache(max_weight=1)
+        assert cache.intern(la_island_map) is la_island_map
+        assert len(cache) == 1
+
+    @staticmethod
+    def test_json_computed_once(la_island_map: Map):
+        cache = MapCache()
+        assert cache.get_json(la_island_map) == MapTranslation.map_to_json(la_island_map)
+        assert cache.get_json(la_island_map.copy()) is cache.get_json(la_island_map)
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from Trains.Common.constants import CONNECTION
+from Trains.Common.map import Color, Map
+from Trains.Translations.translations import MapTranslation
+from Trains.Utils.map_generator import generate_cities, generate_connections, generate_map
+
+
+class TestGenerateCities:
+    @staticmethod
+    def test_unique_names_and_coords():
+        cities = generate_cities(5000, width=100, height=100, rng=random.Random(0))
+        assert len(cities) == 5000
+        assert len({c.get_name() for c in cities}) == 5000
+        assert len({(c.get_x(), c.get_y()) for c in cities}) == 5000
+        for c in cities:
+            assert 0 <= c.get_x() <= 100
+            assert 0 <= c.get_y() <= 100
+
+    @staticmethod
+    def test_fill_whole_map():
+        cities = generate_cities(121, width=10, height=10, rng=random.Random(0))
+        assert len({(c.get_x(), c.get_y()) for c in cities}) == 121
+
+    @staticmethod
+    def test_too_many_cities():
+        with pytest.raises(ValueError):
+            generate_cities(122, width=10, height=10)
+        with pytest.raises(ValueError):
+            generate_cities(-1)
+
+
+class TestGenerateConnections:
+    @staticmethod
+    def test_dense_component():
+        cities = generate_cities(4, rng=random.Random(0))
+        connections = generate_connections(cities, edge_density=6, rng=random.Random(0))
+        assert len(connections) == 24
+
+    @staticmethod
+    def test_impossible_density():
+        cities = generate_cities(4, rng=random.Random(0))
+        with pytest.raises(ValueError):
+            generate_connections(cities, edge_density=7)
+        with pytest.raises(ValueError):
+            generate_connections(cities, num_components=5)
+
+
+class TestGenerateMap:
+    @staticmethod
+    def test_constraints():
+        trains_map = generate_map(200, edge_density=2, num_components=4, seed=3, width=300, height=200)
+        assert isinstance(trains_map, Map)
+        assert trains_map.get_width() == 300
+        assert trains_map.get_height() == 200
+        assert len(trains_map.get_cities()) == 200
+        assert len(trains_map.get_connections()) == 400
+        assert {c.get_color() for c in trains_map.get_connections()} == Color.get_all_color_enums()
+        assert {c.get_length() for c in trains_map.get_connections()} == set(CONNECTION.LENGTHS)
+        # 4 components of 50 cities each
+        assert len(trains_map.get_destinations()) == 4 * (50 * 49 // 2)
+
+    @staticmethod
+    def test_seeded():
+        assert MapTranslation.map_to_json(generate_map(50, seed=7)) == MapTranslation.map_to_json(
+            generate_map(50, seed=7)
+        )
+        assert MapTranslation.map_to_json(generate_map(50, seed=7)) != MapTranslation.map_to_json(
+            generate_map(50, seed=8)
+        )
+
+    @staticmethod
+    def test_json_round_trip():
+        trains_map = generate_map(100, edge_density=3, seed=1)
+        as_json = MapTranslation.map_to_json(trains_map)
+        assert MapTranslation.map_to_json(MapTranslation.json_to_map(as_json)) == as_json
@@ -0,0 +1,81 @@
+import random
+import zlib
+
+import pytest
+
+from Trains.Common.map import City, Color, Connection, Map
+from Trains.Editor.map_renderer import MapRenderer, PLAYER_COLORS
+from Trains.Editor.raster import Raster, hex_to_rgb
+from Trains.Utils.map_generator import generate_map
+
+
+class TestRaster:
+    @staticmethod
+    def test_draw_and_clip():
+        raster = Raster(10, 10)
+        raster.draw_line(-5, 5, 20, 5, (1, 2, 3))
+        assert raster.get_pixel(0, 5) == (1, 2, 3)
+        assert raster.get_pixel(9, 5) == (1, 2, 3)
+        assert raster.get_pixel(5, 4) == (0, 0, 0)
+        copy = raster.copy()
+        copy.fill_rect(0, 0, 9, 9, (9, 9, 9))
+        assert raster.get_pixel(0, 0) == (0, 0, 0)
+
+    @staticmethod
+    def test_png():
+        raster = Raster(3, 2, (255, 0, 0))
+        png = raster.to_png()
+        assert png.startswith(b"\x89PNG\r\n\x1a\n")
+        idat_start = png.index(b"IDAT") + 4
+        idat_length = int.from_bytes(png[idat_start - 8:idat_start - 4], "big")
+        raw = zlib.decompress(png[idat_start:idat_start + idat_length])
+        assert raw == (b"\x00" + b"\xff\x00\x00" * 3) * 2
+
+
+class TestMapRenderer:
+    @staticmethod
+    def test_base_layer(la_island_map: Map, nyc: City, nyc_to_boston: Connection):
+        renderer = MapRenderer(la_island_map, margin=10)
+        base = renderer.get_base_layer()
+        assert renderer.get_base_layer() is base
+        assert (base.width, base.height) == (821, 721)
+        assert base.get_pixel(nyc.get_x() + 10, nyc.get_y() + 10) == (255, 255, 255)
+        # halfway between nyc (100, 100) and boston (100, 300) lies the middle segment of the green connection
+        assert base.get_pixel(110, 210) == hex_to_rgb(nyc_to_boston.get_color().get_hex())
+
+    @staticmethod
+    def test_ownership_overlay(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection):
+        renderer = MapRenderer(la_island_map, margin=10)
+        base_pixels = bytes(renderer.get_base_layer().pixels)
+        owned_pixel = (113, 210)
+        first = renderer.render([{nyc_to_boston}, set()])
+        assert first.get_pixel(*owned_pixel) == hex_to_rgb(PLAYER_COLORS[0])
+        second = renderer.render([{nyc_to_boston}, {nyc_to_dc}])
+        assert second.get_pixel(*owned_pixel) == hex_to_rgb(PLAYER_COLORS[0])
+        assert second.pixels != first.pixels
+        # an ownership change that is not a continuation is drawn from the base layer
+        third = renderer.render([set(), {nyc_to_dc}])
+        assert third.get_pixel(*owned_pixel) == renderer.get_base_layer().get_pixel(*owned_pixel)
+        assert bytes(renderer.get_base_layer().pixels) == base_pixels
+        assert renderer.render([set(), set()]).pixels == renderer.get_base_layer().pixels
+
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_incremental_matches_full_redraw(seed: int):
+        trains_map = generate_map(30, seed=seed)
+        # acquired in an order unrelated to the order connections are drawn in, by two players
+        connections = sorted(trains_map.get_connections(), key=repr)
+        random.Random(seed).shuffle(connections)
+        incremental = MapRenderer(trains_map)
+        for i in range(1, min(len(connections), 10) + 1):
+            all_player_connections = [set(connections[:i:2]), set(connections[1:i:2])]
+            frame = incremental.render(all_player_connections)
+            assert frame.pixels == MapRenderer(trains_map).render(all_player_connections).pixels
+
+    @staticmethod
+    def test_bad_ownership(la_island_map: Map, nyc: City, la: City):
+        renderer = MapRenderer(la_island_map)
+        with pytest.raises(ValueError):
+            renderer.render([{Connection({nyc, la}, length=3, color=Color.RED)}])
+        with pytest.raises(ValueError):
+            renderer.render([set()] * 9)
@@ -0,0 +1,71 @@
+import pytest
+
+from Trains.Admin.referee import make_deck, play_game
+from Trains.Common.map import Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Player.memoized_strategy import DecisionCache, MemoizedStrategy
+from Trains.Player.strategy import CardRequest, Move
+
+
+class CountingStrategy(Hold10Strategy):
+    def __init__(self):
+        super().__init__()
+        self.num_plays = 0
+
+    def play(self, pgs: PlayerGameState) -> Move:
+        self.num_plays += 1
+        return super().play(pgs)
+
+
+class TestDecisionCache:
+    @staticmethod
+    def test_lru():
+        cache = DecisionCache(max_size=2)
+        cache.put("a", CardRequest())
+        cache.put("b", CardRequest())
+        assert cache.get("a") == CardRequest()
+        cache.put("c", CardRequest())
+        assert cache.get("b") is None
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (1, 1)
+        with pytest.raises(ValueError):
+            DecisionCache(max_size=0)
+
+
+class TestMemoizedStrategy:
+    @staticmethod
+    def test_same_games(game_map: Map):
+        deck = make_deck(5)
+        plain = play_game(game_map, [BuyNowStrategy(), Hold10Strategy(), BuyNowStrategy()], deck=deck)
+        memoized = play_game(
+            game_map, [MemoizedStrategy(BuyNowStrategy()), MemoizedStrategy(Hold10Strategy()),
+                       MemoizedStrategy(BuyNowStrategy())], deck=deck
+        )
+        assert memoized == plain
+
+    @staticmethod
+    def test_repeated_games_hit_the_cache(game_map: Map):
+        cache = DecisionCache()
+        deck = make_deck(5)
+        first = [CountingStrategy(), CountingStrategy()]
+        result = play_game(game_map, [MemoizedStrategy(strategy, cache) for strategy in first], deck=deck)
+        assert cache.hits == 0
+        assert sum(strategy.num_plays for strategy in first) == cache.misses > 0
+
+        # the same game again, with new players sharing the cache, is answered from the cache alone
+        second = [CountingStrategy(), CountingStrategy()]
+        assert play_game(game_map, [MemoizedStrategy(strategy, cache) for strategy in second], deck=deck) == result
+        assert sum(strategy.num_plays for strategy in second) == 0
+        assert cache.hits == cache.misses
+
+    @staticmethod
+    def test_keys_tell_strategies_apart(game_map: Map):
+        cache = DecisionCache()
+        deck = make_deck(5)
+        play_game(game_map, [MemoizedStrategy(BuyNowStrategy(), cache), MemoizedStrategy(BuyNowStrategy(), cache)],
+                  deck=deck)
+        counting = [CountingStrategy(), CountingStrategy()]
+        play_game(game_map, [MemoizedStrategy(strategy, cache) for strategy in counting], deck=deck)
+        assert sum(strategy.num_plays for strategy in counting) > 0
@@ -1 +1,60 @@
-# TODO this
+from Trains.Common.map import Color, Connection, Map
+from Trains.Common.player_game_state import PlayerGameState
+
+
+def make_pgs(la_island_map: Map, **kwargs) -> PlayerGameState:
+    args = dict(
+        acquired_connections=set(),
+        destinations=set(list(la_island_map.get_destinations())[:2]),
+        num_rails=45,
+        cards={Color.GREEN: 3, Color.BLUE: 4},
+        total_acquired_connections=[set(), set()]
+    )
+    args.update(kwargs)
+    return PlayerGameState(**args)
+
+
+class TestTrustedConstruction:
+    @staticmethod
+    def test_trusted_matches_constructor(la_island_map: Map, nyc_to_boston: Connection):
+        kwargs = dict(
+            acquired_connections={nyc_to_boston},
+            destinations=set(list(la_island_map.get_destinations())[:2]),
+            num_rails=40,
+            cards={Color.GREEN: 3},
+            total_acquired_connections=[set(), {nyc_to_boston}]
+        )
+        checked = PlayerGameState(**kwargs)
+        trusted = PlayerGameState.trusted(**kwargs)
+        assert trusted.get_index() == checked.get_index() == 1
+        assert trusted.get_cards() == checked.get_cards()
+        assert trusted.get_all_player_connections() == checked.get_all_player_connections()
+
+    @staticmethod
+    def test_obtain_connection_keeps_index(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection):
+        # both players own nothing yet, so the index can't be told from the connections alone
+        second_player = PlayerGameState.trusted(
+            acquired_connections=set(),
+            destinations=set(list(la_island_map.get_destinations())[:2]),
+            num_rails=45,
+            cards={Color.GREEN: 3, Color.BLUE: 4},
+            total_acquired_connections=[set(), set()],
+            index=1
+        )
+        assert second_player.copy().get_index() == 1
+        after = second_player.obtain_connection(nyc_to_boston)
+        assert after.get_index() == 1
+        assert after.get_all_player_connections() == [set(), {nyc_to_boston}]
+        assert after.get_cards()[Color.GREEN] == 0
+        assert after.get_num_rails() == 42
+        assert second_player.get_all_player_connections() == [set(), set()]
+
+    @staticmethod
+    def test_obtain_connection(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection):
+        pgs = make_pgs(la_island_map, acquired_connections={nyc_to_dc},
+                       total_acquired_connections=[{nyc_to_dc}, set()])
+        assert pgs.can_acquire_connection(nyc_to_boston, la_island_map)
+        after = pgs.obtain_connection(nyc_to_boston)
+        assert after.get_acquired_connections() == {nyc_to_dc, nyc_to_boston}
+        assert not after.can_acquire_connection(nyc_to_boston, la_island_map)
+        assert pgs.get_acquired_connections() == {nyc_to_dc}
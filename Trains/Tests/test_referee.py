@@ -0,0 +1,128 @@
+from typing import Set
+
+import pytest
+
+from Trains.Admin.referee import GameResult, PlayerFailure, Referee, make_deck, play_game, run_steps
+from Trains.Admin.scoring import is_destination_connected, longest_path_length, score_players
+from Trains.Common.constants import CONNECTION
+from Trains.Common.map import Color, Connection, Destination, Map, City
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Player.strategy import ConnectionRequest, Move
+
+
+class CheatingStrategy(BuyNowStrategy):
+    def play(self, pgs: PlayerGameState) -> Move:
+        connections = self.trains_map.get_connections() - pgs.get_all_obtainable_connections_for_player(
+            self.trains_map)
+        return ConnectionRequest(sorted(connections, key=repr)[0])
+
+
+class BadPickStrategy(BuyNowStrategy):
+    def pick(self, destinations: Set[Destination]) -> Set[Destination]:
+        return destinations
+
+
+class CrashingStrategy(BuyNowStrategy):
+    def win(self, win_or_not: bool) -> None:
+        raise RuntimeError("crash")
+
+
+class TestScoring:
+    @staticmethod
+    def test_destination_connected(nyc_to_boston: Connection, nyc_to_dc: Connection, boston: City, dc: City,
+                                   la: City):
+        assert is_destination_connected(Destination({boston, dc}), {nyc_to_boston, nyc_to_dc})
+        assert not is_destination_connected(Destination({boston, dc}), {nyc_to_boston})
+        assert not is_destination_connected(Destination({boston, la}), {nyc_to_boston, nyc_to_dc})
+
+    @staticmethod
+    def test_longest_path(nyc_to_boston: Connection, nyc_to_dc: Connection, nyc: City, la: City):
+        assert longest_path_length(set()) == 0
+        assert longest_path_length({nyc_to_boston}) == 3
+        assert longest_path_length({nyc_to_boston, nyc_to_dc}) == 6
+        nyc_to_la = Connection({nyc, la}, length=5, color=Color.RED)
+        assert longest_path_length({nyc_to_boston, nyc_to_dc, nyc_to_la}) == 8
+
+    @staticmethod
+    def test_score_players(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection, boston: City,
+                           dc: City, nyc: City):
+        total = [{nyc_to_boston, nyc_to_dc}, set()]
+        destinations = {Destination({boston, dc}), Destination({boston, nyc})}
+        pgs = [
+            PlayerGameState.trusted(acquired_connections=total[i], destinations=destinations, num_rails=0, cards={},
+                                    total_acquired_connections=total, index=i)
+            for i in range(2)
+        ]
+        assert score_players(pgs) == [6 + 20 + 20, -20]
+
+
+class TestReferee:
+    @staticmethod
+    def test_game(game_map: Map):
+        result = play_game(game_map, [BuyNowStrategy(), Hold10Strategy(), BuyNowStrategy()], deck=make_deck(1))
+        assert result.ejected == []
+        assert set(result.scores) == {0, 1, 2}
+        assert result.winners == [max(result.scores, key=result.scores.get)]
+        assert result == play_game(game_map, [BuyNowStrategy(), Hold10Strategy(), BuyNowStrategy()],
+                                   deck=make_deck(1))
+
+    @staticmethod
+    def test_ejections(game_map: Map):
+        result = play_game(game_map, [BadPickStrategy(), CheatingStrategy(), CrashingStrategy(), BuyNowStrategy()],
+                           deck=make_deck(2))
+        assert result.ejected == [0, 1, 2]
+        assert result == GameResult(scores={3: result.scores[3]}, winners=[3], ejected=[0, 1, 2])
+
+    @staticmethod
+    def test_player_failure_from_driver(game_map: Map):
+        def call_player(call):
+            if call.seat == 0 and call.method == "play":
+                return PlayerFailure("timed out")
+            return getattr(players[call.seat], call.method)(*call.args)
+
+        players = [BuyNowStrategy(), BuyNowStrategy()]
+        result = run_steps(Referee(game_map, 2, deck=make_deck(3)).run(), call_player)
+        assert result.ejected == [0]
+        assert result.winners == [1]
+
+    @staticmethod
+    def test_last_round(game_map: Map):
+        def call_player(call):
+            if call.method == "play":
+                plays.append((call.seat, call.args[0].get_num_rails()))
+            return getattr(players[call.seat], call.method)(*call.args)
+
+        plays = []
+        players = [BuyNowStrategy(), BuyNowStrategy(), BuyNowStrategy()]
+        run_steps(Referee(game_map, 3, deck=make_deck(1)).run(), call_player)
+        # each player's rails at the end of each turn are the rails it starts its next turn with
+        rails_after = [
+            next((rails for other, rails in plays[turn + 1:] if other == seat), None)
+            for turn, (seat, _) in enumerate(plays)
+        ]
+        # the last round starts with the first turn a player ends with too few rails
+        start = next(
+            (turn for turn, rails in enumerate(rails_after) if rails is not None and rails < min(CONNECTION.LENGTHS)),
+            None
+        )
+        assert start is not None
+        # every player gets one more turn, the one who started the last round last
+        assert [seat for seat, _ in plays[start + 1:]] == [(plays[start][0] + i) % 3 for i in range(1, 4)]
+
+    @staticmethod
+    def test_empty_deck_ends_game(game_map: Map):
+        result = play_game(game_map, [Hold10Strategy(), Hold10Strategy()], deck=[Color.RED] * 8)
+        assert result.ejected == []
+        assert result.scores == {0: -20, 1: -20}
+        assert result.winners == [0, 1]
+
+    @staticmethod
+    def test_bad_setup(la_island_map: Map, game_map: Map):
+        with pytest.raises(ValueError):
+            Referee(la_island_map, 2)
+        with pytest.raises(ValueError):
+            Referee(game_map, 1)
+        with pytest.raises(ValueError):
+            Referee(game_map, 9)
@@ -1 +1,58 @@
-# TODO this
+import pytest
+
+from Trains.Admin.referee_game_state import RefereeGameState
+from Trains.Common.map import Color, Connection, Map, City
+from Trains.Common.player_game_state import PlayerGameState
+
+
+def make_pgs(la_island_map: Map, acquired, total):
+    return PlayerGameState(
+        acquired_connections=acquired,
+        destinations=la_island_map.get_destinations() - {next(iter(la_island_map.get_destinations()))},
+        num_rails=45,
+        cards={Color.GREEN: 3},
+        total_acquired_connections=total
+    )
+
+
+class TestRefereeGameState:
+    @staticmethod
+    def test_valid(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection):
+        total = [{nyc_to_boston}, {nyc_to_dc}]
+        state = RefereeGameState(
+            trains_map=la_island_map,
+            player_game_states=[make_pgs(la_island_map, {nyc_to_boston}, total),
+                                make_pgs(la_island_map, {nyc_to_dc}, total)],
+            deck=[Color.RED],
+        )
+        assert state.get_active_player_idx() == 0
+
+    @staticmethod
+    def test_inconsistent_players(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection):
+        with pytest.raises(ValueError):
+            RefereeGameState(
+                trains_map=la_island_map,
+                player_game_states=[make_pgs(la_island_map, {nyc_to_boston}, [{nyc_to_boston}, {nyc_to_dc}]),
+                                    make_pgs(la_island_map, {nyc_to_dc}, [{nyc_to_boston, nyc_to_dc}, {nyc_to_dc}])],
+                deck=[Color.RED],
+            )
+
+    @staticmethod
+    def test_connection_not_in_map(la_island_map: Map, nyc_to_boston: Connection, la: City, nyc: City):
+        la_to_nyc = Connection({la, nyc}, length=3, color=Color.RED)
+        total = [{nyc_to_boston}, {la_to_nyc}]
+        with pytest.raises(ValueError):
+            RefereeGameState(
+                trains_map=la_island_map,
+                player_game_states=[make_pgs(la_island_map, {nyc_to_boston}, total),
+                                    make_pgs(la_island_map, {la_to_nyc}, total)],
+                deck=[Color.RED],
+            )
+
+    @staticmethod
+    def test_trusted(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection):
+        total = [{nyc_to_boston}, {nyc_to_dc}]
+        pgs = [make_pgs(la_island_map, {nyc_to_boston}, total), make_pgs(la_island_map, {nyc_to_dc}, total)]
+        state = RefereeGameState.trusted(trains_map=la_island_map, player_game_states=pgs, deck=[], active_player_idx=1)
+        assert state.get_active_player_idx() == 1
+        assert state.get_active_player_game_state() is pgs[1]
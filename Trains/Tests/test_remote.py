@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from Trains.Admin.referee import make_deck, play_game
+from Trains.Common.map import Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Player.strategy import Move
+from Trains.Remote.client import RemoteClient
+from Trains.Remote.protocol import json_to_player_state, player_state_to_json
+from Trains.Remote.server import RefereeServer
+
+
+class SlowStrategy(BuyNowStrategy):
+    def play(self, pgs: PlayerGameState) -> Move:
+        time.sleep(0.5)
+        return super().play(pgs)
+
+
+class TestProtocol:
+    @staticmethod
+    def test_player_state_round_trip(game_map: Map):
+        trains_map = game_map
+        connections = sorted(trains_map.get_connections(), key=repr)
+        total = [{connections[0]}, {connections[1], connections[2]}, set()]
+        pgs = PlayerGameState.trusted(
+            acquired_connections=total[1],
+            destinations=set(sorted(trains_map.get_destinations(), key=repr)[:2]),
+            num_rails=30,
+            cards={},
+            total_acquired_connections=total,
+            index=1
+        )
+        decoded = json_to_player_state(player_state_to_json(pgs), trains_map)
+        assert decoded.get_index() == 0
+        assert decoded.get_all_player_connections() == [total[1], total[2], total[0]]
+        assert decoded.get_destinations() == pgs.get_destinations()
+        assert decoded.get_cards() == pgs.get_cards()
+
+
+class TestRefereeServer:
+    @staticmethod
+    def test_concurrent_games(game_map: Map, tmp_path):
+        trains_map = game_map
+        path = str(tmp_path / "server.sock")
+
+        async def main():
+            server = RefereeServer(trains_map, players_per_game=2, make_deck=lambda: make_deck(5))
+            await server.start_unix(path)
+            clients = []
+            for i in range(6):
+                clients.append(RemoteClient(Hold10Strategy(), f"player{i}").run_unix(path))
+            wins = await asyncio.gather(*clients)
+            results = await server.wait_for_games(3)
+            await server.close()
+            return wins, results
+
+        wins, results = asyncio.run(main())
+        assert len(results) == 3
+        assert sum(1 for w in wins if w) == sum(len(r.winners) for r in results)
+        in_process = play_game(trains_map, [Hold10Strategy(), Hold10Strategy()], deck=make_deck(5))
+        for result in results:
+            assert result == in_process
+
+    @staticmethod
+    def test_timeout_ejects_only_slow_player(game_map: Map):
+        trains_map = game_map
+
+        games = []
+
+        async def main():
+            # which client the server seats first is up to the order it accepts them in
+            server = RefereeServer(trains_map, players_per_game=2, call_timeout=0.2,
+                                   on_game_over=lambda names, result: games.append((names, result)))
+            port = await server.start_tcp()
+            slow = RemoteClient(SlowStrategy(), "slow").run_tcp("127.0.0.1", port)
+            fast = RemoteClient(BuyNowStrategy(), "fast").run_tcp("127.0.0.1", port)
+            wins = await asyncio.gather(slow, fast)
+            await server.wait_for_games(1)
+            await server.close()
+            return wins
+
+        wins = asyncio.run(main())
+        assert wins == [None, True]
+        [(names, result)] = games
+        assert [names[seat] for seat in result.ejected] == ["slow"]
+        assert [names[seat] for seat in result.winners] == ["fast"]
@@ -0,0 +1,112 @@
+import sqlite3
+import time
+
+import pytest
+
+from Trains.Admin.manager import Manager
+from Trains.Admin.referee import GameResult
+from Trains.Admin.results_store import ResultsStore
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Utils.map_generator import generate_map
+
+
+@pytest.fixture(name="store_path")
+def make_store_path(tmp_path) -> str:
+    return str(tmp_path / "results.db")
+
+
+def game(scores, winners, ejected=()):
+    return GameResult(scores=scores, winners=list(winners), ejected=list(ejected))
+
+
+class TestResultsStore:
+    @staticmethod
+    def test_win_rates(store_path: str):
+        with ResultsStore(store_path) as store:
+            assert store.record("map a", ["Hold10", "BuyNow"], game({0: 10, 1: 5}, [0])) == 0
+            assert store.record("map a", ["BuyNow", "Hold10"], game({0: 7, 1: 7}, [0, 1])) == 1
+            assert store.record("map b", ["BuyNow", "Hold10", "Cheater"], game({0: 3, 1: 4}, [1], [2])) == 2
+            store.flush()
+            assert store.get_num_games() == 3
+            assert store.get_num_games(map_fingerprint="map a") == 2
+            assert store.get_win_rates() == {"Hold10": (3, 3), "BuyNow": (1, 3), "Cheater": (0, 1)}
+            assert store.get_win_rates(map_fingerprint="map a", seat=0) == {"Hold10": (1, 1), "BuyNow": (1, 1)}
+            assert store.get_seat_win_rates(strategy="BuyNow") == {0: (1, 2), 1: (0, 1)}
+
+        rows = sqlite3.connect(store_path).execute("SELECT score, ejected FROM seats WHERE game = 2").fetchall()
+        assert rows == [(3, 0), (4, 0), (None, 1)]
+
+    @staticmethod
+    def test_batches(store_path: str):
+        store = ResultsStore(store_path, batch_size=4, flush_interval=60)
+        assert sqlite3.connect(store_path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        for _ in range(3):
+            store.record("map", ["A", "B"], game({0: 1, 1: 0}, [0]))
+        # the first four rows fill a batch; the last two wait for the flush interval (or a flush)
+        deadline = time.monotonic() + 5
+        while store.get_num_games() < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.get_num_games() == 2
+        store.close()
+        assert store.get_num_games() == 3
+        with pytest.raises(ValueError):
+            store.record("map", ["A", "B"], game({0: 1, 1: 0}, [0]))
+
+    @staticmethod
+    def test_flush_interval(store_path: str):
+        with ResultsStore(store_path, flush_interval=0.05) as store:
+            store.record("map", ["A", "B"], game({0: 1, 1: 0}, [0]))
+            deadline = time.monotonic() + 5
+            while store.get_num_games() == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert store.get_num_games() == 1
+
+    @staticmethod
+    def test_reopen_continues_game_ids(store_path: str):
+        with ResultsStore(store_path) as store:
+            first = store.record("map", ["A", "B"], game({0: 1, 1: 0}, [0]))
+        with ResultsStore(store_path) as store:
+            assert store.record("map", ["A", "B"], game({0: 1, 1: 0}, [0])) > first
+            store.flush()
+            assert store.get_num_games() == 2
+
+    @staticmethod
+    def test_stores_sharing_a_database(store_path: str):
+        stores = [ResultsStore(store_path, batch_size=2), ResultsStore(store_path, batch_size=2)]
+        ids = [stores[i % 2].record("map", ["A", "B"], game({0: 1, 1: 0}, [0])) for i in range(2 * 150)]
+        assert len(set(ids)) == len(ids)
+        for store in stores:
+            store.close()
+        assert stores[0].get_num_games() == len(ids)
+
+    @staticmethod
+    def test_failed_batch_does_not_stop_the_writer(store_path: str):
+        with ResultsStore(store_path, batch_size=2) as store:
+            first = store.record("map", ["A", "B"], game({0: 1, 1: 0}, [0]))
+            store.flush()
+            # a row taking the next game's place makes its batch fail
+            with sqlite3.connect(store_path) as connection:
+                connection.execute("INSERT INTO seats VALUES (?, 'map', 2, 0, 'A', 1, 1, 0)", (first + 1,))
+            store.record("map", ["A", "B"], game({0: 1, 1: 0}, [0]))
+            last = store.record("map", ["A", "B"], game({0: 1, 1: 0}, [0]))
+            with pytest.raises(sqlite3.IntegrityError):
+                store.flush()
+            rows = sqlite3.connect(store_path).execute("SELECT DISTINCT game FROM seats ORDER BY game").fetchall()
+            assert rows == [(first,), (first + 1,), (last,)]
+
+    @staticmethod
+    def test_manager_records_games(store_path: str):
+        trains_map = generate_map(40, edge_density=2, seed=1)
+        players = [BuyNowStrategy() if i % 2 else Hold10Strategy() for i in range(12)]
+        with ResultsStore(store_path) as store:
+            result = Manager(trains_map, players, seed=3, results=store).run()
+            store.flush()
+            assert store.get_num_games(map_fingerprint=trains_map.get_fingerprint()) == sum(
+                len(games) for games in result.rounds
+            )
+            win_rates = store.get_win_rates()
+            assert set(win_rates) == {"BuyNowStrategy", "Hold10Strategy"}
+            assert sum(games for _, games in win_rates.values()) == sum(
+                len(player_ids) for games in result.rounds for player_ids, _ in games
+            )
@@ -0,0 +1,59 @@
+import multiprocessing
+
+import pytest
+
+from Trains.Common.map import COLORS, Map
+from Trains.Common.shared_map import SharedMapTables
+from Trains.Utils.map_generator import generate_map
+
+
+def fingerprint_in_worker(tables_name: str) -> str:
+    tables = SharedMapTables.attach(tables_name)
+    try:
+        return tables.to_map().get_fingerprint()
+    finally:
+        tables.close()
+
+
+class TestSharedMapTables:
+    @staticmethod
+    def test_tables(la_island_map: Map):
+        with SharedMapTables.publish(la_island_map) as tables:
+            assert tables.get_city_names() == ["boston", "dc", "la", "nyc"]
+            assert list(tables.city_x) == [100, 10, 0, 100]
+            assert list(tables.city_y) == [300, 100, 100, 100]
+            assert (tables.width, tables.height) == (800, 700)
+            # boston-nyc and dc-nyc are connected; la is on its own
+            assert tables.city_components[0] == tables.city_components[1] == tables.city_components[3]
+            assert tables.city_components[2] != tables.city_components[0]
+            index = la_island_map.get_connection_index()
+            for i, connection in enumerate(index.get_connections()):
+                names = {tables.get_city_names()[tables.connection_city1[i]],
+                         tables.get_city_names()[tables.connection_city2[i]]}
+                assert names == {city.get_name() for city in connection.get_cities()}
+                assert COLORS[tables.connection_colors[i]] == connection.get_color()
+                assert tables.connection_lengths[i] == connection.get_length()
+
+    @staticmethod
+    def test_to_map():
+        trains_map = generate_map(60, edge_density=2, num_components=3, seed=4)
+        with SharedMapTables.publish(trains_map) as tables:
+            attached = SharedMapTables.attach(tables.get_name())
+            rebuilt = attached.to_map()
+            attached.close()
+        assert rebuilt.get_fingerprint() == trains_map.get_fingerprint()
+        assert rebuilt.get_destinations() == trains_map.get_destinations()
+
+    @staticmethod
+    def test_attach_from_other_process(la_island_map: Map):
+        with SharedMapTables.publish(la_island_map) as tables:
+            with multiprocessing.get_context().Pool(1) as pool:
+                assert pool.apply(fingerprint_in_worker, (tables.get_name(),)) == la_island_map.get_fingerprint()
+
+    @staticmethod
+    def test_only_owner_unlinks(la_island_map: Map):
+        with SharedMapTables.publish(la_island_map) as tables:
+            attached = SharedMapTables.attach(tables.get_name())
+            with pytest.raises(ValueError):
+                attached.unlink()
+            attached.close()
@@ -0,0 +1,64 @@
+import math
+import random
+
+from Trains.Common.map import City, Connection, Map
+from Trains.Common.spatial_index import SpatialIndex, segment_intersects_rect
+from Trains.Utils.map_generator import generate_map
+
+
+def brute_force_nearest(cities, x, y):
+    return min(cities, key=lambda c: (math.hypot(c.get_x() - x, c.get_y() - y), c.get_name()))
+
+
+class TestSegmentIntersectsRect:
+    @staticmethod
+    def test_segments():
+        assert segment_intersects_rect(0, 0, 10, 10, 4, 4, 6, 6)
+        assert segment_intersects_rect(5, 5, 5, 5, 4, 4, 6, 6)
+        assert segment_intersects_rect(0, 5, 10, 5, 4, 4, 6, 6)
+        assert segment_intersects_rect(0, 4, 10, 4, 4, 4, 6, 6)
+        assert not segment_intersects_rect(0, 10, 10, 0, 0, 0, 4, 4)
+        assert not segment_intersects_rect(0, 0, 3, 3, 4, 4, 6, 6)
+
+
+class TestSpatialIndex:
+    @staticmethod
+    def test_small_map(la_island_map: Map, nyc: City, dc: City, la: City, nyc_to_dc: Connection):
+        index = la_island_map.get_spatial_index()
+        assert index is la_island_map.get_spatial_index()
+        assert index.nearest_city(0, 0) == la
+        assert index.nearest_city(99, 101) == nyc
+        assert index.nearest_city(50, 300, max_distance=10) is None
+        assert index.cities_in_rect(0, 100, 10, 100) == {la, dc}
+        assert index.connections_in_rect(50, 90, 60, 110) == {nyc_to_dc}
+        assert index.connections_in_rect(200, 200, 300, 300) == set()
+        assert index.cities_in_rect(10, 0, 0, 10) == set()
+
+    @staticmethod
+    def test_empty():
+        index = SpatialIndex([], [], width=100, height=100)
+        assert index.nearest_city(10, 10) is None
+        assert index.cities_in_rect(0, 0, 100, 100) == set()
+
+    @staticmethod
+    def test_against_brute_force():
+        trains_map = generate_map(500, num_components=10, seed=4)
+        cities = trains_map.get_cities()
+        connections = trains_map.get_connections()
+        index = trains_map.get_spatial_index()
+        rng = random.Random(0)
+        for _ in range(200):
+            x, y = rng.randint(-50, 850), rng.randint(-50, 850)
+            assert index.nearest_city(x, y) == brute_force_nearest(cities, x, y)
+
+            left, right = sorted(rng.randint(0, 800) for _ in range(2))
+            top, bottom = sorted(rng.randint(0, 800) for _ in range(2))
+            assert index.cities_in_rect(left, top, right, bottom) == {
+                c for c in cities if left <= c.get_x() <= right and top <= c.get_y() <= bottom
+            }
+            expected_connections = set()
+            for c in connections:
+                c1, c2 = c.get_cities()
+                if segment_intersects_rect(c1.get_x(), c1.get_y(), c2.get_x(), c2.get_y(), left, top, right, bottom):
+                    expected_connections.add(c)
+            assert index.connections_in_rect(left, top, right, bottom) == expected_connections
@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from Trains.Admin.referee import PlayerCall
+from Trains.Admin.time_budget import (
+    DeadlineCaller, LatencyHistogram, ProcessStrategyRunner, ThreadStrategyRunner, TimeBudget,
+    play_game_with_deadlines,
+)
+from Trains.Common.map import Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Player.strategy import CardRequest, Move
+
+
+class LoopingStrategy(BuyNowStrategy):
+    # set once a test is over, so that the threads of abandoned calls stop looping instead of running alongside the
+    # later tests
+    stop = threading.Event()
+
+    def play(self, pgs: PlayerGameState) -> Move:
+        while not self.stop.wait(0.01):
+            pass
+        return CardRequest()
+
+
+@pytest.fixture(autouse=True)
+def stop_looping_strategies():
+    LoopingStrategy.stop.clear()
+    yield
+    LoopingStrategy.stop.set()
+
+
+class TestTimeBudget:
+    @staticmethod
+    def test_deadlines():
+        budget = TimeBudget(0.5, play=0.1)
+        assert budget.get_deadline("play") == 0.1
+        assert budget.get_deadline("pick") == 0.5
+        assert budget.get_deadline("setup") == 5.0
+
+
+class TestLatencyHistogram:
+    @staticmethod
+    def test_empty():
+        histogram = LatencyHistogram()
+        assert histogram.get_count() == 0
+        assert histogram.percentile(50) == 0.0
+
+    @staticmethod
+    def test_percentiles():
+        histogram = LatencyHistogram()
+        for _ in range(99):
+            histogram.record(0.00001)
+        histogram.record(0.5)
+        assert histogram.get_count() == 100
+        assert histogram.get_max() == 0.5
+        assert histogram.percentile(50) == LatencyHistogram.BUCKET_BOUNDS[0]
+        assert 0.5 <= histogram.percentile(100) < 1.0
+        assert histogram.to_json()["count"] == 100
+
+    @staticmethod
+    def test_slower_than_every_bucket():
+        histogram = LatencyHistogram()
+        histogram.record(100.0)
+        assert histogram.percentile(99) == 100.0
+
+
+class TestRunners:
+    @staticmethod
+    def test_thread_runner_abandons_overrunning_call():
+        runner = ThreadStrategyRunner(LoopingStrategy())
+        with pytest.raises(TimeoutError):
+            runner.call("play", (None,), 0.05)
+        with pytest.raises(TimeoutError):
+            runner.call("win", (True,), 1.0)
+
+    @staticmethod
+    def test_thread_runner_passes_exceptions():
+        runner = ThreadStrategyRunner(BuyNowStrategy())
+        with pytest.raises(AttributeError):
+            runner.call("play", (None,), 1.0)
+        runner.stop()
+
+    @staticmethod
+    def test_process_runner_kills_overrunning_player():
+        runner = ProcessStrategyRunner(LoopingStrategy())
+        assert runner.call("win", (True,), 5.0) is None
+        with pytest.raises(TimeoutError):
+            runner.call("play", (None,), 0.1)
+        assert not runner.is_alive()
+        runner.stop()
+
+
+class TestPlayGameWithDeadlines:
+    @staticmethod
+    def test_same_result_as_without_deadlines(game_map: Map):
+        result, histograms = play_game_with_deadlines(game_map, [BuyNowStrategy(), Hold10Strategy()])
+        assert result.ejected == []
+        assert set(histograms) == {0, 1}
+        assert all(histogram.get_count() >= 3 for histogram in histograms.values())
+
+    @staticmethod
+    @pytest.mark.parametrize("use_processes", [False, True])
+    def test_overrunning_player_is_ejected(game_map: Map, use_processes: bool):
+        budget = TimeBudget(1.0, play=0.1)
+        start = time.perf_counter()
+        result, histograms = play_game_with_deadlines(
+            game_map, [LoopingStrategy(), Hold10Strategy()], budget=budget, use_processes=use_processes
+        )
+        assert time.perf_counter() - start < 5
+        assert result.ejected == [0]
+        assert result.winners == [1]
+        assert histograms[0].get_max() >= 0.1
+
+    @staticmethod
+    def test_caller_records_failed_calls():
+        caller = DeadlineCaller([BuyNowStrategy()])
+        with pytest.raises(AttributeError):
+            caller(PlayerCall(0, "play", (None,)))
+        caller.close()
+        assert caller.get_histograms()[0].get_count() == 1
@@ -1,6 +1,12 @@
-from Trains.Common.map import City, Connection, Color
+import pytest
+
+from Trains.Admin.referee_game_state import RefereeGameState
+from Trains.Common.map import City, Connection, Color, Destination, Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.strategy import CardRequest, ConnectionRequest
 from Trains.Translations.translations import (
-    CityTranslation, ConnectionsTranslation, DestinationTranslation, MapTranslation
+    ActionTranslation, CityTranslation, ConnectionsTranslation, DestinationTranslation, MapTranslation,
+    PlayerStateTranslation, RefereeStateTranslation
 )
 
 
@@ -113,3 +119,135 @@ class TestConnectionTranslation:
         ) == {nyc_to_dc, nyc_to_boston}
 
     # TODO test map JSON
+
+
+class TestMapBoundTranslation:
+    @staticmethod
+    def test_json_to_map_connection(la_island_map: Map, nyc_to_boston: Connection):
+        connection = ConnectionsTranslation.json_to_map_connection(["boston", "nyc", "green", 3], la_island_map)
+        assert connection == nyc_to_boston
+        with pytest.raises(ValueError):
+            ConnectionsTranslation.json_to_map_connection(["boston", "nyc", "red", 3], la_island_map)
+        with pytest.raises(ValueError):
+            ConnectionsTranslation.json_to_map_connection("boston", la_island_map)
+
+    @staticmethod
+    def test_json_to_map_destination(la_island_map: Map, boston: City, la: City):
+        assert DestinationTranslation.json_to_map_destination(["boston", "la"], la_island_map) == \
+            Destination({boston, la})
+        with pytest.raises(ValueError):
+            DestinationTranslation.json_to_map_destination(["boston", "paris"], la_island_map)
+
+
+def make_player_state(nyc_to_boston: Connection, nyc_to_dc: Connection, boston: City, nyc: City, la: City,
+                      dc: City) -> PlayerGameState:
+    total = [{nyc_to_dc}, {nyc_to_boston}, set()]
+    return PlayerGameState.trusted(
+        acquired_connections=total[1],
+        destinations={Destination({boston, la}), Destination({nyc, dc})},
+        num_rails=20,
+        cards={Color.RED: 2, Color.GREEN: 1},
+        total_acquired_connections=total,
+        index=1
+    )
+
+
+class TestPlayerStateTranslation:
+    @staticmethod
+    def test_player_state_to_json(nyc_to_boston: Connection, nyc_to_dc: Connection, boston: City, nyc: City,
+                                  la: City, dc: City):
+        pgs = make_player_state(nyc_to_boston, nyc_to_dc, boston, nyc, la, dc)
+        assert PlayerStateTranslation.player_state_to_json(pgs) == {
+            "this": {
+                "destination1": ["boston", "la"],
+                "destination2": ["dc", "nyc"],
+                "rails": 20,
+                "cards": {"red": 2, "green": 1},
+                "acquired": [["boston", "nyc", "green", 3]],
+            },
+            "acquired": [[], [["dc", "nyc", "blue", 3]]],
+        }
+
+    @staticmethod
+    def test_round_trip(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection, boston: City,
+                        nyc: City, la: City, dc: City):
+        pgs = make_player_state(nyc_to_boston, nyc_to_dc, boston, nyc, la, dc)
+        decoded = PlayerStateTranslation.json_to_player_state(
+            PlayerStateTranslation.player_state_to_json(pgs), la_island_map
+        )
+        assert decoded.get_index() == 0
+        assert decoded.get_all_player_connections() == [{nyc_to_boston}, set(), {nyc_to_dc}]
+        assert decoded.get_destinations() == pgs.get_destinations()
+        assert decoded.get_cards() == pgs.get_cards()
+        assert decoded.get_num_rails() == 20
+
+    @staticmethod
+    @pytest.mark.parametrize("pgs_as_json", [
+        "nothing",
+        {"this": {}, "acquired": []},
+        {"this": {"destination1": ["boston", "la"], "destination2": ["dc", "nyc"], "rails": 2, "cards": {},
+                  "acquired": [["boston", "nyc", "red", 3]]}, "acquired": []},
+        {"this": {"destination1": ["boston", "la"], "destination2": ["dc", "nyc"], "rails": 2, "cards": {},
+                  "acquired": [["boston", "nyc", "green", 3]]}, "acquired": [[["boston", "nyc", "green", 3]]]},
+        {"this": {"destination1": ["boston", "la"], "destination2": ["dc", "nyc"], "rails": -1, "cards": {},
+                  "acquired": []}, "acquired": []},
+        {"this": {"destination1": ["boston", "la"], "destination2": ["dc", "nyc"], "rails": 2, "cards": {"red": -1},
+                  "acquired": []}, "acquired": []},
+    ])
+    def test_invalid_json(la_island_map: Map, pgs_as_json):
+        with pytest.raises(ValueError):
+            PlayerStateTranslation.json_to_player_state(pgs_as_json, la_island_map)
+
+
+class TestActionTranslation:
+    @staticmethod
+    def test_action_to_json(nyc_to_boston: Connection):
+        assert ActionTranslation.action_to_json(CardRequest()) == {"action": "more cards"}
+        assert ActionTranslation.action_to_json(ConnectionRequest(nyc_to_boston)) == \
+            {"action": ["boston", "nyc", "green", 3]}
+
+    @staticmethod
+    def test_json_to_action(la_island_map: Map, nyc_to_boston: Connection):
+        assert ActionTranslation.json_to_action({"action": "more cards"}, la_island_map) == CardRequest()
+        assert ActionTranslation.json_to_action({"action": ["boston", "nyc", "green", 3]}, la_island_map) == \
+            ConnectionRequest(nyc_to_boston)
+
+    @staticmethod
+    def test_invalid_actions(la_island_map: Map):
+        assert not ActionTranslation.is_action_valid({"action": "fewer cards"})
+        assert not ActionTranslation.is_action_valid(["boston", "nyc", "green", 3])
+        with pytest.raises(ValueError):
+            ActionTranslation.json_to_action({"action": ["boston", "la", "green", 3]}, la_island_map)
+
+
+class TestRefereeStateTranslation:
+    @staticmethod
+    def test_round_trip(la_island_map: Map, nyc_to_boston: Connection, nyc_to_dc: Connection, boston: City,
+                        nyc: City, la: City, dc: City):
+        destinations = {Destination({boston, la}), Destination({nyc, dc})}
+        total = [set(), {nyc_to_dc}, set()]
+        state = RefereeGameState.trusted(
+            trains_map=la_island_map,
+            player_game_states=[
+                PlayerGameState.trusted(acquired_connections=total[i], destinations=destinations, num_rails=10 + i,
+                                        cards={Color.BLUE: i}, total_acquired_connections=total, index=i)
+                for i in range(3)
+            ],
+            deck=[Color.RED, Color.WHITE],
+            active_player_idx=2
+        )
+        state_as_json = RefereeStateTranslation.referee_state_to_json(state)
+        decoded = RefereeStateTranslation.json_to_referee_state(state_as_json, la_island_map)
+        assert decoded.get_active_player_idx() == 2
+        assert decoded.get_deck() == [Color.RED, Color.WHITE]
+        assert [pgs.get_index() for pgs in decoded.get_player_game_states()] == [0, 1, 2]
+        assert [pgs.get_num_rails() for pgs in decoded.get_player_game_states()] == [10, 11, 12]
+        assert decoded.get_active_player_game_state().get_all_player_connections() == total
+        assert RefereeStateTranslation.referee_state_to_json(decoded) == state_as_json
+
+    @staticmethod
+    def test_invalid_json(la_island_map: Map):
+        with pytest.raises(ValueError):
+            RefereeStateTranslation.json_to_referee_state({"players": [], "active": 0, "deck": []}, la_island_map)
+        with pytest.raises(ValueError):
+            RefereeStateTranslation.json_to_referee_state({"players": "x", "active": 0, "deck": []}, la_island_map)
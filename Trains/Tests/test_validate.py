@@ -0,0 +1,100 @@
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from Trains.Common.map import Map
+from Trains.Translations.translations import MapTranslation
+from Trains.Translations.validate import describe_error, find_files, main, validate_files
+from Trains.Utils.map_generator import generate_map
+
+PLAYER_STATE = {
+    "this": {
+        "destination1": ["boston", "nyc"],
+        "destination2": ["dc", "nyc"],
+        "rails": 20,
+        "cards": {"red": 2, "green": 1},
+        "acquired": [["boston", "nyc", "green", 3]],
+    },
+    "acquired": [[["dc", "nyc", "blue", 3]]],
+}
+
+
+def read_results(output: str) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in output.splitlines()]
+
+
+@pytest.fixture(name="map_dir")
+def make_map_dir(tmp_path: Path) -> Path:
+    for seed in range(6):
+        (tmp_path / f"map_{seed}.json").write_text(json.dumps(MapTranslation.map_to_json(generate_map(20, seed=seed))))
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "syntax.json").write_text('{"width": 10,')
+    (tmp_path / "nested" / "bounds.json").write_text(json.dumps(
+        {"width": 10, "height": 10, "cities": [["a", [50, 5]]], "connections": {}}
+    ))
+    (tmp_path / "nested" / "deep.json").write_text("[" * 100_000)
+    (tmp_path / "notes.txt").write_text("not a map")
+    return tmp_path
+
+
+class TestValidate:
+    @staticmethod
+    def test_find_files(map_dir: Path):
+        files = find_files([str(map_dir), "-"])
+        assert [Path(f).name for f in files] == [f"map_{seed}.json" for seed in range(6)] + [
+            "bounds.json", "deep.json", "syntax.json", "-"
+        ]
+
+    @staticmethod
+    def test_errors():
+        syntax_error = json.JSONDecodeError("Expecting value", '{"a": ', 6)
+        assert describe_error(syntax_error) == {"type": "json", "message": "Expecting value", "line": 1, "column": 7}
+        assert describe_error(FileNotFoundError("missing"))["type"] == "io"
+        assert describe_error(ValueError("bad map")) == {"type": "invalid", "message": "bad map"}
+
+    @staticmethod
+    def test_batch_matches_serial(map_dir: Path):
+        files = find_files([str(map_dir)]) + [str(map_dir / "missing.json")]
+        serial = list(validate_files(files, jobs=1))
+        parallel = list(validate_files(files, jobs=2))
+        for results in (serial, parallel):
+            assert [(r["path"], r["valid"], r["error"] and r["error"]["type"]) for r in results] == (
+                [(f, True, None) for f in files[:6]]
+                + [(files[6], False, "invalid"), (files[7], False, "invalid"), (files[8], False, "json"),
+                   (files[9], False, "io")]
+            )
+            assert all(r["seconds"] >= 0 for r in results)
+
+    @staticmethod
+    def test_main(map_dir: Path, capsys):
+        assert main([str(map_dir / "map_0.json"), "--jobs", "1"]) == 0
+        assert main([str(map_dir), "--jobs", "2"]) == 1
+        out, err = capsys.readouterr()
+        assert [r["valid"] for r in read_results(out)] == [True] * 7 + [False] * 3
+        assert [(s["files"], s["valid"], s["invalid"]) for s in read_results(err)] == [(1, 1, 0), (9, 6, 3)]
+
+    @staticmethod
+    def test_stdin(monkeypatch, capsys):
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"[1, 2]")))
+        assert main([]) == 1
+        [result] = read_results(capsys.readouterr()[0])
+        assert result["path"] == "-" and result["error"]["type"] == "invalid"
+
+    @staticmethod
+    def test_player_states(la_island_map: Map, tmp_path: Path, capsys):
+        map_path = tmp_path / "map.json"
+        map_path.write_text(json.dumps(MapTranslation.map_to_json(la_island_map)))
+        (tmp_path / "valid.json").write_text(json.dumps(PLAYER_STATE))
+        # a connection owned by two players
+        shared = {**PLAYER_STATE, "acquired": [[["boston", "nyc", "green", 3]]]}
+        (tmp_path / "shared.json").write_text(json.dumps(shared))
+        args = [str(tmp_path / "valid.json"), str(tmp_path / "shared.json"), "--jobs", "1"]
+        with pytest.raises(SystemExit):
+            main(args + ["--kind", "player-state"])
+        with pytest.raises(SystemExit):
+            main(args + ["--kind", "player-state", "--map", str(tmp_path / "missing.json")])
+        assert main(args + ["--kind", "player-state", "--map", str(map_path)]) == 1
+        assert [r["valid"] for r in read_results(capsys.readouterr()[0])] == [True, False]
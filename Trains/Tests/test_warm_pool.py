@@ -0,0 +1,49 @@
+import pytest
+
+from Trains.Admin.manager import Manager
+from Trains.Admin.referee import make_deck, play_game
+from Trains.Admin.warm_pool import WarmPool
+from Trains.Player.buy_now_strategy import BuyNowStrategy
+from Trains.Player.hold_10_strategy import Hold10Strategy
+from Trains.Utils.map_generator import generate_map
+
+
+@pytest.fixture(name="game_maps")
+def make_game_maps():
+    return [generate_map(30, edge_density=2, seed=seed) for seed in range(2)]
+
+
+class TestWarmPool:
+    @staticmethod
+    def test_games_on_every_map(game_maps):
+        deck = make_deck(4)
+        with WarmPool(game_maps + [game_maps[0].copy()], max_workers=2) as pool:
+            assert pool.warm_up() >= 1
+            futures = [pool.submit(trains_map, [BuyNowStrategy(), Hold10Strategy()], deck) for trains_map in game_maps]
+            futures.append(pool.submit(game_maps[1].get_fingerprint(), [Hold10Strategy(), Hold10Strategy()], deck))
+            results = [future.result() for future in futures]
+        assert results == [
+            play_game(game_maps[0], [BuyNowStrategy(), Hold10Strategy()], deck=deck),
+            play_game(game_maps[1], [BuyNowStrategy(), Hold10Strategy()], deck=deck),
+            play_game(game_maps[1], [Hold10Strategy(), Hold10Strategy()], deck=deck),
+        ]
+
+    @staticmethod
+    def test_unknown_map(game_maps):
+        with WarmPool(game_maps[:1], max_workers=1) as pool:
+            with pytest.raises(ValueError):
+                pool.submit(game_maps[1], [BuyNowStrategy(), BuyNowStrategy()], make_deck(1))
+            with pytest.raises(ValueError):
+                Manager(game_maps[1], [BuyNowStrategy(), BuyNowStrategy()], backend="process", pool=pool)
+            with pytest.raises(ValueError):
+                Manager(game_maps[0], [BuyNowStrategy(), BuyNowStrategy()], backend="thread", pool=pool)
+
+    @staticmethod
+    def test_manager_reuses_pool(game_maps):
+        players = [BuyNowStrategy() for _ in range(10)]
+        expected = Manager(game_maps[0], players, seed=2).run()
+        with WarmPool(game_maps, max_workers=2) as pool:
+            pool.warm_up()
+            for _ in range(2):
+                result = Manager(game_maps[0], players, backend="process", seed=2, pool=pool).run()
+                assert result.winners == expected.winners
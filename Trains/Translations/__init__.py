@@ -0,0 +1,14 @@
+from Trains.Utils.lazy import lazy_exports
+
+# the submodules are imported on first use of one of their names
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "MAP_CACHE": "map_cache",
+    "MapCache": "map_cache",
+    "ActionTranslation": "translations",
+    "CityTranslation": "translations",
+    "ConnectionsTranslation": "translations",
+    "DestinationTranslation": "translations",
+    "MapTranslation": "translations",
+    "PlayerStateTranslation": "translations",
+    "RefereeStateTranslation": "translations",
+})
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+from Trains.Common.map import Map
+from Trains.Translations.translations import MapTranslation
+
+DEFAULT_MAX_WEIGHT = 1_000_000
+
+
+def map_weight(trains_map: Map) -> int:
+    """
+    A rough measure of the memory a parsed map takes: its number of cities, connections and destinations.
+    """
+    return len(trains_map.get_city_names()) + len(trains_map.get_connections()) + len(trains_map.get_destinations())
+
+
+class _Entry:
+    def __init__(self, trains_map: Map, weight: int):
+        self.trains_map = trains_map
+        self.weight = weight
+        self.map_as_json: Optional[Dict[str, Any]] = None
+
+
+class MapCache:
+    """
+    A thread-safe LRU cache of parsed maps, so that games on the same map share one Map, whose destinations and
+    indexes are computed once instead of once per game.
+
+    Maps are keyed by their fingerprint (see Map.get_fingerprint), and JSON is additionally keyed by a hash of its
+    text, so that parsing JSON seen before skips parsing altogether. Least recently used maps are evicted once the
+    total weight (see map_weight) of the cached maps goes over max_weight.
+    Cached maps are shared: this is safe since a Map never changes, and every getter of a Map returns copies.
+    """
+    def __init__(self, *, max_weight: int = DEFAULT_MAX_WEIGHT):
+        if not (isinstance(max_weight, int) and max_weight > 0):
+            raise ValueError("Max weight must be a positive integer.")
+        self.__max_weight = max_weight
+        self.__entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.__fingerprints_by_text: Dict[str, str] = {}
+        self.__weight = 0
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get_weight(self) -> int:
+        return self.__weight
+
+    @staticmethod
+    def __warm(trains_map: Map) -> None:
+        """
+        Build everything about the map that is built lazily, so games never have to.
+        """
+        trains_map.get_fingerprint()
+        trains_map.get_connection_index()
+        trains_map.get_name_index()
+
+    def __lookup(self, fingerprint: str) -> Optional[Map]:
+        entry = self.__entries.get(fingerprint)
+        if entry is None:
+            return None
+        self.__entries.move_to_end(fingerprint)
+        return entry.trains_map
+
+    def __insert(self, trains_map: Map) -> Map:
+        """
+        Cache the (warmed) map unless an equal map is already cached, and return the cached one.
+        """
+        fingerprint = trains_map.get_fingerprint()
+        cached = self.__lookup(fingerprint)
+        if cached is not None:
+            return cached
+        entry = _Entry(trains_map, map_weight(trains_map))
+        self.__entries[fingerprint] = entry
+        self.__weight += entry.weight
+        # the newest map is never evicted, even if it is heavier than max_weight on its own
+        while self.__weight > self.__max_weight and len(self.__entries) > 1:
+            evicted_fingerprint, evicted = self.__entries.popitem(last=False)
+            self.__weight -= evicted.weight
+            self.__fingerprints_by_text = {
+                text: fingerprint for text, fingerprint in self.__fingerprints_by_text.items()
+                if fingerprint != evicted_fingerprint
+            }
+        return trains_map
+
+    def intern(self, trains_map: Map) -> Map:
+        """
+        Return the cached map equal to the given one, caching the given map if there is none.
+        """
+        self.__warm(trains_map)
+        with self.__lock:
+            return self.__insert(trains_map)
+
+    def get_from_json_text(self, map_as_text: Union[str, bytes]) -> Map:
+        """
+        Return the map represented by the given JSON text, parsing it only if neither this text nor an equal map
+        is cached.
+        Errors (ValueError) like MapTranslation.json_to_map if the JSON is invalid.
+        """
+        if isinstance(map_as_text, str):
+            map_as_text = map_as_text.encode()
+        text_hash = hashlib.sha256(map_as_text).hexdigest()
+        with self.__lock:
+            fingerprint = self.__fingerprints_by_text.get(text_hash)
+            cached = self.__lookup(fingerprint) if fingerprint is not None else None
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+        # parsed outside of the lock, so parsing one map does not hold up lookups of others
+        trains_map = MapTranslation.json_to_map(json.loads(map_as_text))
+        self.__warm(trains_map)
+        with self.__lock:
+            cached = self.__insert(trains_map)
+            self.__fingerprints_by_text[text_hash] = cached.get_fingerprint()
+            return cached
+
+    def get_from_json(self, map_as_json: Any) -> Map:
+        """
+        Return the map represented by the given (already decoded) JSON, parsing it only if it is not cached.
+        """
+        return self.get_from_json_text(json.dumps(map_as_json, sort_keys=True, separators=(",", ":")))
+
+    def get_json(self, trains_map: Map) -> Dict[str, Any]:
+        """
+        Return the JSON of the given map (see MapTranslation.map_to_json), computed once per cached map.
+        The returned JSON is shared: do not modify it.
+        """
+        self.__warm(trains_map)
+        with self.__lock:
+            self.__insert(trains_map)
+            entry = self.__entries[trains_map.get_fingerprint()]
+            if entry.map_as_json is None:
+                entry.map_as_json = MapTranslation.map_to_json(trains_map)
+            return entry.map_as_json
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__fingerprints_by_text.clear()
+            self.__weight = 0
+
+
+MAP_CACHE = MapCache()
@@ -1,13 +1,14 @@
-from typing import Dict, Union, List, Any, Set, Optional
+from typing import TYPE_CHECKING, Dict, Union, List, Any, Set, Optional
 
-# from Trains.Admin.board_state import BoardState
-# from Trains.Admin.private_player_info import PrivatePlayerInfo
-# from Trains.Admin.private_player_info import card_counter_from_dict
 from Trains.Common.constants import CONNECTION
-from Trains.Common.map import City, Connection, Destination, Map, Color, sort_cities
+from Trains.Common.map import City, Connection, Destination, Map, Color, sort_cities, sort_destinations
 
-# from Trains.Common.player_game_state import PlayerGameState
-# from Trains.Player.turn_type import TakeTurn, ActionType
+# Game states and moves are imported where they are used, so that translating maps (e.g. to validate them) does not
+# import the rest of the game.
+if TYPE_CHECKING:
+    from Trains.Admin.referee_game_state import RefereeGameState
+    from Trains.Common.player_game_state import PlayerGameState
+    from Trains.Player.strategy import Move
 
 WIDTH = "width"
 HEIGHT = "height"
@@ -21,6 +22,9 @@ DEST2 = "destination2"
 RAILS = "rails"
 CARDS = "cards"
 THIS = "this"
+PLAYERS = "players"
+ACTIVE = "active"
+DECK = "deck"
 
 
 class CityTranslation:
@@ -174,6 +178,23 @@ class ConnectionsTranslation:
 
         return Connection({c1, c2}, length=length, color=Color.string_to_color(color_name))
 
+    @staticmethod
+    def json_to_map_connection(connection_as_json: List[Union[str, int]], trains_map: Map) -> Connection:
+        """
+        Turns the JSON representation of an acquired Connection into that Connection of the given map, using the
+        map's name index.
+        Errors if the JSON is invalid or the map has no such connection.
+        """
+        if not (isinstance(connection_as_json, list) and ConnectionsTranslation.is_acquired_valid(connection_as_json)):
+            raise ValueError("Invalid JSON representation for an acquired Connection supplied")
+        c1_name, c2_name, color_name, length = connection_as_json
+        connection = trains_map.get_name_index().get_connection(
+            c1_name, c2_name, Color.string_to_color(color_name), length
+        )
+        if connection is None:
+            raise ValueError(f"{connection_as_json} is not a connection of the map.")
+        return connection
+
     @staticmethod
     def connections_to_json(connections: Set[Connection]) -> Dict[str, Dict[str, Dict[str, int]]]:
         """
@@ -212,19 +233,17 @@ class ConnectionsTranslation:
         Optionally, the user can specify a set of City for the function to use if the user wishes to have accurate
         City coordinates. If not specified, then each city will be at (0, 0).
         """
-        cities = cities if cities else set()
+        cities_by_name = {city.get_name(): city for city in cities} if cities else {}
         output = set()
 
         if not ConnectionsTranslation.are_connections_valid(connections_as_json):
             raise ValueError("Invalid JSON representation for connections supplied.")
 
         for city1_name, city2_map in connections_as_json.items():
-            city1_from_cities = CityTranslation.find_city_from_str(city1_name, cities)
-            city1 = city1_from_cities if city1_from_cities else City(city1_name, 0, 0)
+            city1 = cities_by_name.get(city1_name) or City(city1_name, 0, 0)
 
             for city2_name, color_length_map in city2_map.items():
-                city2_from_cities = CityTranslation.find_city_from_str(city2_name, cities)
-                city2 = city2_from_cities if city2_from_cities else City(city2_name, 0, 0)
+                city2 = cities_by_name.get(city2_name) or City(city2_name, 0, 0)
 
                 for color_name, length in color_length_map.items():
                     color = Color.string_to_color(color_name)
@@ -244,14 +263,14 @@ class MapTranslation:
             height -> integer representing height
             width -> integer representing width
         """
-        is_map_dict = isinstance(map_as_json, dict)
+        if not isinstance(map_as_json, dict):
+            return False
         is_width_valid = WIDTH in map_as_json and isinstance(map_as_json.get(WIDTH), int)
         is_height_valid = HEIGHT in map_as_json and isinstance(map_as_json.get(HEIGHT), int)
         are_cities_valid = CITIES in map_as_json and isinstance(map_as_json.get(CITIES), list)
         are_connections_valid = CONNECTIONS in map_as_json and isinstance(map_as_json.get(CONNECTIONS), dict)
         return (
-            is_map_dict
-            and is_width_valid
+            is_width_valid
             and is_height_valid
             and are_cities_valid
             and are_connections_valid
@@ -342,245 +361,321 @@ class DestinationTranslation:
 
         return Destination({city1, city2})
 
+    @staticmethod
+    def json_to_map_destination(destination_as_json: List[str], trains_map: Map) -> Destination:
+        """
+        Turns a JSON representation of a Destination into a Destination between cities of the given map, using the
+        map's name index.
+        Errors if the JSON is invalid or the map has no such cities.
+        """
+        if not DestinationTranslation.is_destination_json_valid(destination_as_json):
+            raise ValueError("Invalid JSON representation for a destination supplied.")
+        name_index = trains_map.get_name_index()
+        city1 = name_index.get_city(destination_as_json[0])
+        city2 = name_index.get_city(destination_as_json[1])
+        if city1 is None or city2 is None:
+            raise ValueError(f"{destination_as_json} is not between cities of the map.")
+        return Destination.trusted({city1, city2})
+
+
+class PlayerStateTranslation:
+    @staticmethod
+    def are_cards_json_valid(cards_json: Any) -> bool:
+        """
+        Checks whether the JSON representation for cards are a mapping between Color and natural number.
+        Also checks whether the only colors used are the ones in the enumeration.
+        """
+        if not isinstance(cards_json, dict):
+            return False
+        for color, count in cards_json.items():
+            if Color.string_to_color(color) is None:
+                return False
+            if not (isinstance(count, int) and count >= 0):
+                return False
+        return True
+
+    @staticmethod
+    def are_this_player_acquired_json_valid(this_player_acquired: Any) -> bool:
+        """
+        Check whether the JSON representation for a list of acquired connections is valid.
+        Must be of form:
+        [
+            [str, str, str, int]
+        ]
+        """
+        if not isinstance(this_player_acquired, list):
+            return False
+        for connection_as_json in this_player_acquired:
+            if not (
+                isinstance(connection_as_json, list)
+                and ConnectionsTranslation.is_acquired_valid(connection_as_json)
+            ):
+                return False
+        return True
+
+    @staticmethod
+    def is_this_player_json_valid(this_player_json: Any) -> bool:
+        """
+        Checks whether "this" in the JSON representation of PlayerState is valid.
+        Checks for all keys for destinations, num_rails, cards, and acquired connections and checks each value
+            accordingly.
+        """
+        return (
+            isinstance(this_player_json, dict)
+            and DEST1 in this_player_json
+            and DestinationTranslation.is_destination_json_valid(this_player_json[DEST1])
+            and DEST2 in this_player_json
+            and DestinationTranslation.is_destination_json_valid(this_player_json[DEST2])
+            and RAILS in this_player_json
+            and isinstance(this_player_json[RAILS], int)
+            and CARDS in this_player_json
+            and PlayerStateTranslation.are_cards_json_valid(this_player_json[CARDS])
+            and ACQUIRED in this_player_json
+            and PlayerStateTranslation.are_this_player_acquired_json_valid(this_player_json[ACQUIRED])
+        )
+
+    @staticmethod
+    def is_all_acquired_json_valid(all_acquired_connections_json: Any) -> bool:
+        """
+        Checks whether the JSON representation of ALL of the acquired connections (for all player, in order of their
+        turn) is valid.
+        """
+        if not isinstance(all_acquired_connections_json, list):
+            return False
+        for player_acquired_connections_json in all_acquired_connections_json:
+            if not PlayerStateTranslation.are_this_player_acquired_json_valid(player_acquired_connections_json):
+                return False
+        return True
+
+    @staticmethod
+    def is_player_state_json_valid(pgs_as_json: Any) -> bool:
+        """
+        Checks whether the JSON representation for the PlayerState is valid. Checks both "this" player and all
+        "acquired" connections.
+        """
+        return (
+            isinstance(pgs_as_json, dict)
+            and THIS in pgs_as_json
+            and ACQUIRED in pgs_as_json
+            and PlayerStateTranslation.is_this_player_json_valid(pgs_as_json[THIS])
+            and PlayerStateTranslation.is_all_acquired_json_valid(pgs_as_json[ACQUIRED])
+        )
+
+    @staticmethod
+    def player_to_this_player_json(pgs: "PlayerGameState") -> Dict[str, Any]:
+        """
+        Turns the private part of a PlayerGameState (destinations, rails, cards and connections) into the JSON
+        representation for "this" player.
+        """
+        dest1, dest2 = sort_destinations(pgs.get_destinations())
+        return {
+            DEST1: DestinationTranslation.destination_to_json(dest1),
+            DEST2: DestinationTranslation.destination_to_json(dest2),
+            RAILS: pgs.get_num_rails(),
+            CARDS: {color.value: count for color, count in pgs.get_cards().items() if count > 0},
+            ACQUIRED: [ConnectionsTranslation.acquired_to_json(c) for c in pgs.get_acquired_connections()],
+        }
 
-# class PlayerStateTranslation:
-#     @staticmethod
-#     def are_cards_json_valid(cards_json: Any) -> bool:
-#         """
-#         Checks whether the JSON representation for cards are a mapping between Color and natural number.
-#         Also checks whether the only colors used are the ones in the enumeration.
-#         """
-#         if not isinstance(cards_json, dict):
-#             return False
-#         for color, count in cards_json.items():
-#             if Color.string_to_color(color) is None:
-#                 return False
-#             if not (isinstance(count, int) and count >= 0):
-#                 return False
-#         return True
-#
-#     @staticmethod
-#     def are_this_player_acquired_json_valid(this_player_acquired: Any) -> bool:
-#         """
-#         Check whether the JSON representation for a list of acquired connections is valid.
-#         Must be of form:
-#         [
-#             [str, str, str, int]
-#         ]
-#         """
-#         if not isinstance(this_player_acquired, list):
-#             return False
-#         for connection_as_json in this_player_acquired:
-#             if not ConnectionsTranslation.is_acquired_valid(connection_as_json):
-#                 return False
-#         return True
-#
-#     @staticmethod
-#     def is_this_player_json_valid(this_player_json: Any) -> bool:
-#         """
-#         Checks whether "this" in the JSON representation of PlayerState is valid.
-#         Checks for all keys for destinations, num_rails, cards, and acquired connections and checks each value
-#             accordingly.
-#         """
-#         return (
-#             isinstance(this_player_json, dict)
-#             and DEST1 in this_player_json
-#             and DestinationTranslation.is_destination_json_valid(this_player_json[DEST1])
-#             and DEST2 in this_player_json
-#             and DestinationTranslation.is_destination_json_valid(this_player_json[DEST2])
-#             and RAILS in this_player_json
-#             and isinstance(this_player_json[RAILS], int)
-#             and CARDS in this_player_json
-#             and PlayerStateTranslation.are_cards_json_valid(this_player_json[CARDS])
-#             and ACQUIRED in this_player_json
-#             and PlayerStateTranslation.are_this_player_acquired_json_valid(this_player_json[ACQUIRED])
-#         )
-#
-#     @staticmethod
-#     def is_all_acquired_json_valid(all_acquired_connections_json: Any) -> bool:
-#         """
-#         Checks whether the JSON representation of ALL of the acquired connections (for all player, in order of their
-#         turn) is valid.
-#         """
-#         for player_acquired_connections_json in all_acquired_connections_json:
-#             if not PlayerStateTranslation.are_this_player_acquired_json_valid(player_acquired_connections_json):
-#                 return False
-#         return True
-#
-#     @staticmethod
-#     def is_player_state_json_valid(pgs_as_json: Any) -> bool:
-#         """
-#         Checks whether the JSON representation for the PlayerState is valid. Checks both "this" player and all
-#         "acquired" connections.
-#         """
-#
-#         return (
-#             isinstance(pgs_as_json, dict)
-#             and THIS in pgs_as_json
-#             and ACQUIRED in pgs_as_json
-#             and PlayerStateTranslation.is_this_player_json_valid(pgs_as_json[THIS])
-#             and PlayerStateTranslation.is_all_acquired_json_valid(pgs_as_json[ACQUIRED])
-#         )
-#
-#     @staticmethod
-#     def player_state_to_this_player_json(pgs: PlayerGameState, player_idx: int) -> Dict[str, Any]:
-#         """
-#         Turns a PlayerGameState into the JSON representation for "this" player.
-#         FLAW: Since the code does not support getting this player's connections without an index, we needed to include
-#         the player index to get the player's connections.
-#         """
-#         if not (isinstance(pgs, PlayerGameState) and isinstance(player_idx, int)):
-#             raise ValueError("Inputs are not of types PlayerGameState and int.")
-#
-#         num_rails = pgs.get_num_rails()
-#         cards = {k.value: v for k, v in pgs.get_cards_as_dict().items()}
-#         acquired_conns = [
-#             ConnectionsTranslation.acquired_to_json(c)
-#             # ConnectionsTranslation.connections_to_json(c)
-#             for c in pgs.get_acquired_connections_for_player(player_idx)
-#         ]
-#         destinations = [
-#             DestinationTranslation.destination_to_json(destination)
-#             for destination in sorted(pgs.get_destinations(), key=lambda d: (d.city_1.name, d.city_2.name))
-#         ]
-#         return {
-#             DEST1: destinations[0],
-#             DEST2: destinations[1],
-#             RAILS: num_rails,
-#             CARDS: cards,
-#             ACQUIRED: acquired_conns
-#         }
-#
-#     @staticmethod
-#     def player_state_to_all_acquired_connections_json(pgs: PlayerGameState, num_players: int) -> List[List[List[Union[str, int]]]]:
-#         """
-#         Turns a PlayerGameState into a JSON representation of all the acquired connections for each player.
-#         """
-#         if not isinstance(pgs, PlayerGameState):
-#             raise ValueError("Input is not of type PlayerGameState.")
-#
-#         output = []
-#         all_acquired_connections = pgs.get_all_acquired_connections_in_order(num_players)
-#         for connection_set in all_acquired_connections:
-#             output.append([ConnectionsTranslation.acquired_to_json(acquired) for acquired in connection_set])
-#         return output
-#
-#     @staticmethod
-#     def player_state_to_json(
-#         player_state: PlayerGameState,
-#         player_idx: int,
-#         num_players: int
-#     ) -> Dict[str, Union[List[Dict[str, Any]], Dict[str, Any]]]:
-#         """
-#         Turns a PlayerGameState into its JSON representation.
-#         """
-#         if not isinstance(player_state, PlayerGameState):
-#             raise ValueError("Input is not of PlayerGameState type.")
-#         return {
-#             THIS: PlayerStateTranslation.player_state_to_this_player_json(player_state, player_idx),
-#             ACQUIRED: PlayerStateTranslation.player_state_to_all_acquired_connections_json(player_state, num_players)
-#         }
-#
-#     @staticmethod
-#     def make_connection_id_map_from_list_of_connections(
-#         all_player_connections: List[List[Connection]]
-#     ) -> Dict[Connection, int]:
-#         """
-#         Given a list of connections (in the order at which each player plays), make a mapping between each Connection
-#         and the player_id that owns that Connection.
-#         """
-#         output = {}
-#         for i, connections_for_player in enumerate(all_player_connections):
-#             for connection in connections_for_player:
-#                 output.update({connection: i})
-#         return output
-#
-#     @staticmethod
-#     def json_to_player_state(
-#         player_state_as_json: Dict[str, Union[List[List[List[Union[str, int]]]], Dict[str, Any]]],
-#         trains_map: TrainsMap,
-#     ) -> PlayerGameState:
-#         """
-#         Takes the JSON representation of a PlayerGameState and turns it into PlayerState.
-#         DESIGN DECISION: We decided to include the trains map in this function in order to provide it to the constructor
-#         of the player game state.
-#         """
-#         if not PlayerStateTranslation.is_player_state_json_valid(player_state_as_json):
-#             raise ValueError("Invalid JSON representation for a PlayerGameState supplied.")
-#         cities = trains_map.get_cities()
-#
-#         all_connections_json = player_state_as_json[ACQUIRED]
-#         all_connections = []
-#         for player_connections in all_connections_json:
-#             all_connections.append([ConnectionsTranslation.json_to_acquired(c, cities) for c in player_connections])
-#         connection_to_id = PlayerStateTranslation.make_connection_id_map_from_list_of_connections(all_connections)
-#
-#         d1 = DestinationTranslation.json_to_destination(player_state_as_json[THIS][DEST1], cities)
-#         d2 = DestinationTranslation.json_to_destination(player_state_as_json[THIS][DEST2], cities)
-#         destinations = {d1, d2}
-#
-#         num_rails = player_state_as_json[THIS][RAILS]
-#         cards = {Color.string_to_color(color): num for color, num in player_state_as_json[THIS][CARDS].items()}
-#
-#         board_game_state = BoardState(trains_map, connection_to_id)
-#         private_player_info = PrivatePlayerInfo(
-#             cards_counter=card_counter_from_dict(cards),
-#             destinations=destinations,
-#             num_rails=num_rails
-#         )
-#         return PlayerGameState(board_game_state=board_game_state, player_info=private_player_info)
-#
-#
-# class ActionTranslation:
-#     @staticmethod
-#     def is_action_valid(action_as_json: Any) -> bool:
-#         """
-#         Determines whether the JSON representation for a TakeTurn is valid.
-#         Must be of form:
-#         {"action": str}
-#         OR
-#         {"action": <acquired_as_JSON>}
-#         """
-#         if isinstance(action_as_json, dict) and ACTION in action_as_json:
-#             if isinstance(action_as_json[ACTION], str):
-#                 return action_as_json[ACTION] == MORE_CARDS
-#             if isinstance(action_as_json[ACTION], list):
-#                 return ConnectionsTranslation.is_acquired_valid(action_as_json[ACTION])
-#         return False
-#
-#     @staticmethod
-#     def action_to_json(action: TakeTurn) -> Dict[str, Union[str, List[Union[str, int]]]]:
-#         """
-#         Takes a TakeTurn action and turns it into a JSON representation
-#         """
-#         if not isinstance(action, TakeTurn):
-#             raise ValueError("Input is not of TakeTurn type.")
-#
-#         if action.get_action_type() == ActionType.REQUEST_CARDS:
-#             action_json = MORE_CARDS
-#         else:
-#             connection = action.get_connection()
-#             c1_name = connection.city_1.name
-#             c2_name = connection.city_2.name
-#             color_name = connection.color.value
-#             length = connection.num_rails.value
-#
-#             action_json = [c1_name, c2_name, color_name, length]
-#         return {ACTION: action_json}
-#
-#     @staticmethod
-#     def json_to_action(
-#         action_as_json: Dict[str, Union[str, List[Union[str, int]]]],
-#         cities: Optional[Set[City]] = None
-#     ) -> TakeTurn:
-#         """
-#         Takes the JSON representation of an Action and turns it into a TakeTurn object.
-#         """
-#         if not ActionTranslation.is_action_valid(action_as_json):
-#             raise ValueError("Invalid JSON representation for an action supplied.")
-#         action = action_as_json[ACTION]
-#         if isinstance(action, str):
-#             return TakeTurn(ActionType.REQUEST_CARDS)
-#         else:
-#             connection = ConnectionsTranslation.json_to_acquired(action, cities)
-#             return TakeTurn(ActionType.ACQUIRE_CONNECTION, connection=connection)
+    @staticmethod
+    def player_state_to_json(pgs: "PlayerGameState") -> Dict[str, Any]:
+        """
+        Turns a PlayerGameState into its JSON representation:
+        {
+            "this": {
+                "destination1": dest, "destination2": dest, "rails": int, "cards": {color: int}, "acquired": [...]
+            },
+            "acquired": [[acquired, ...] for every other player, in turn order after this player]
+        }
+        """
+        from Trains.Common.player_game_state import PlayerGameState
+        if not isinstance(pgs, PlayerGameState):
+            raise ValueError("Input is not of PlayerGameState type.")
+        all_connections = pgs.get_all_player_connections()
+        index = pgs.get_index()
+        others = all_connections[index + 1:] + all_connections[:index]
+        return {
+            THIS: PlayerStateTranslation.player_to_this_player_json(pgs),
+            ACQUIRED: [[ConnectionsTranslation.acquired_to_json(c) for c in conns] for conns in others],
+        }
+
+    @staticmethod
+    def json_to_this_player_parts(this_player_json: Any, trains_map: Map) -> Dict[str, Any]:
+        """
+        Turns the JSON representation for "this" player into the keyword arguments of a PlayerGameState, minus
+        total_acquired_connections.
+        Errors if the JSON is invalid or refers to cities or connections that are not in the map.
+        """
+        if not PlayerStateTranslation.is_this_player_json_valid(this_player_json):
+            raise ValueError("Invalid JSON representation for a player supplied.")
+        return {
+            "acquired_connections": set(
+                ConnectionsTranslation.json_to_map_connection(c, trains_map) for c in this_player_json[ACQUIRED]
+            ),
+            "destinations": {
+                DestinationTranslation.json_to_map_destination(this_player_json[DEST1], trains_map),
+                DestinationTranslation.json_to_map_destination(this_player_json[DEST2], trains_map),
+            },
+            "num_rails": this_player_json[RAILS],
+            "cards": {Color.string_to_color(color): count for color, count in this_player_json[CARDS].items()},
+        }
+
+    @staticmethod
+    def are_connections_disjoint(all_player_connections: List[Set[Connection]]) -> bool:
+        """
+        Checks that no connection is owned by two players.
+        """
+        return sum(len(conns) for conns in all_player_connections) == len(set().union(*all_player_connections))
+
+    @staticmethod
+    def json_to_player_state(pgs_as_json: Any, trains_map: Map) -> "PlayerGameState":
+        """
+        Takes the JSON representation of a PlayerGameState and turns it into a PlayerGameState of a game on the
+        given map, where this player is the first player. Cities and connections are looked up in the map's name
+        index, and are the map's own.
+        Errors if the JSON is invalid or refers to cities or connections that are not in the map.
+        """
+        from Trains.Common.player_game_state import PlayerGameState
+        if not (isinstance(pgs_as_json, dict) and THIS in pgs_as_json and ACQUIRED in pgs_as_json):
+            raise ValueError("Invalid JSON representation for a PlayerGameState supplied.")
+        if not PlayerStateTranslation.is_all_acquired_json_valid(pgs_as_json[ACQUIRED]):
+            raise ValueError("Invalid JSON representation for a PlayerGameState supplied.")
+        this_player = PlayerStateTranslation.json_to_this_player_parts(pgs_as_json[THIS], trains_map)
+        others = [
+            set(ConnectionsTranslation.json_to_map_connection(c, trains_map) for c in conns)
+            for conns in pgs_as_json[ACQUIRED]
+        ]
+        total_acquired_connections = [this_player["acquired_connections"]] + others
+        if not PlayerStateTranslation.are_connections_disjoint(total_acquired_connections):
+            raise ValueError("A connection cannot be owned by more than one player.")
+        return PlayerGameState(total_acquired_connections=total_acquired_connections, **this_player)
+
+
+class ActionTranslation:
+    @staticmethod
+    def is_move_valid(move_as_json: Any) -> bool:
+        """
+        Determines whether the JSON representation for a Move is valid: either "more cards" or an acquired
+        connection.
+        """
+        if isinstance(move_as_json, str):
+            return move_as_json == MORE_CARDS
+        return isinstance(move_as_json, list) and ConnectionsTranslation.is_acquired_valid(move_as_json)
+
+    @staticmethod
+    def is_action_valid(action_as_json: Any) -> bool:
+        """
+        Determines whether the JSON representation for an action is valid.
+        Must be of form:
+        {"action": str}
+        OR
+        {"action": <acquired_as_JSON>}
+        """
+        return (
+            isinstance(action_as_json, dict)
+            and ACTION in action_as_json
+            and ActionTranslation.is_move_valid(action_as_json[ACTION])
+        )
+
+    @staticmethod
+    def move_to_json(move: "Move") -> Union[str, List[Union[str, int]]]:
+        """
+        Turns a Move into "more cards" (for a CardRequest) or the acquired connection (for a ConnectionRequest).
+        """
+        from Trains.Player.strategy import Move
+        if not isinstance(move, Move):
+            raise ValueError("Input is not of Move type.")
+        if move.is_connection_request():
+            return ConnectionsTranslation.acquired_to_json(move.get_connection())
+        return MORE_CARDS
+
+    @staticmethod
+    def json_to_move(move_as_json: Any, trains_map: Map) -> "Move":
+        """
+        Turns the JSON representation of a Move back into a Move on the given map.
+        Errors if the JSON is invalid, or requests a connection that is not in the map.
+        """
+        from Trains.Player.strategy import CardRequest, ConnectionRequest
+        if not ActionTranslation.is_move_valid(move_as_json):
+            raise ValueError("Invalid JSON representation for a move supplied.")
+        if move_as_json == MORE_CARDS:
+            return CardRequest()
+        return ConnectionRequest(ConnectionsTranslation.json_to_map_connection(move_as_json, trains_map))
+
+    @staticmethod
+    def action_to_json(action: "Move") -> Dict[str, Union[str, List[Union[str, int]]]]:
+        """
+        Takes a Move and turns it into a JSON representation of an action.
+        """
+        return {ACTION: ActionTranslation.move_to_json(action)}
+
+    @staticmethod
+    def json_to_action(action_as_json: Any, trains_map: Map) -> "Move":
+        """
+        Takes the JSON representation of an action and turns it into a Move.
+        """
+        if not ActionTranslation.is_action_valid(action_as_json):
+            raise ValueError("Invalid JSON representation for an action supplied.")
+        return ActionTranslation.json_to_move(action_as_json[ACTION], trains_map)
+
+
+class RefereeStateTranslation:
+    @staticmethod
+    def referee_state_to_json(state: "RefereeGameState") -> Dict[str, Any]:
+        """
+        Turns a RefereeGameState into its JSON representation (the map is not included):
+        {
+            "players": [<"this" player JSON of every player, in turn order>],
+            "active": int,
+            "deck": [color, ...]
+        }
+        """
+        from Trains.Admin.referee_game_state import RefereeGameState
+        if not isinstance(state, RefereeGameState):
+            raise ValueError("Input is not of RefereeGameState type.")
+        return {
+            PLAYERS: [PlayerStateTranslation.player_to_this_player_json(pgs) for pgs in state.get_player_game_states()],
+            ACTIVE: state.get_active_player_idx(),
+            DECK: [color.value for color in state.get_deck()],
+        }
+
+    @staticmethod
+    def is_referee_state_json_valid(state_as_json: Any) -> bool:
+        return (
+            isinstance(state_as_json, dict)
+            and isinstance(state_as_json.get(PLAYERS), list)
+            and len(state_as_json[PLAYERS]) > 0
+            and isinstance(state_as_json.get(ACTIVE), int)
+            and isinstance(state_as_json.get(DECK), list)
+            and all(isinstance(c, str) and Color.string_to_color(c) is not None for c in state_as_json[DECK])
+        )
+
+    @staticmethod
+    def json_to_referee_state(state_as_json: Any, trains_map: Map) -> "RefereeGameState":
+        """
+        Takes the JSON representation of a RefereeGameState and turns it into a RefereeGameState of a game on the
+        given map.
+        Errors if the JSON is invalid or refers to cities or connections that are not in the map.
+        """
+        from Trains.Admin.referee_game_state import RefereeGameState
+        from Trains.Common.player_game_state import PlayerGameState
+        if not RefereeStateTranslation.is_referee_state_json_valid(state_as_json):
+            raise ValueError("Invalid JSON representation for a RefereeGameState supplied.")
+        players = [
+            PlayerStateTranslation.json_to_this_player_parts(player, trains_map) for player in state_as_json[PLAYERS]
+        ]
+        total_acquired_connections = [player["acquired_connections"] for player in players]
+        if not PlayerStateTranslation.are_connections_disjoint(total_acquired_connections):
+            raise ValueError("A connection cannot be owned by more than one player.")
+        # several players may own the same (e.g. no) connections, so each player's index is set explicitly after the
+        # constructor has validated the rest of the state
+        player_game_states = [
+            PlayerGameState(total_acquired_connections=total_acquired_connections, **player)
+            .update_all_player_connections(total_acquired_connections, i)
+            for i, player in enumerate(players)
+        ]
+        return RefereeGameState(
+            trains_map=trains_map,
+            player_game_states=player_game_states,
+            deck=[Color.string_to_color(c) for c in state_as_json[DECK]],
+            active_player_idx=state_as_json[ACTIVE]
+        )
@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from Trains.Common.map import Map
+from Trains.Translations.map_cache import MAP_CACHE
+from Trains.Translations.translations import PlayerStateTranslation, RefereeStateTranslation
+
+MAP = "map"
+PLAYER_STATE = "player-state"
+REFEREE_STATE = "referee-state"
+KINDS = (MAP, PLAYER_STATE, REFEREE_STATE)
+STDIN = "-"
+DEFAULT_SUFFIX = ".json"
+# files per task sent to a worker at most, so that results keep streaming out of large batches
+MAX_CHUNK_SIZE = 64
+
+# What the validating process validates: set once per process (see _configure), so that the map game states are
+# validated against is parsed once per worker rather than once per file.
+_kind = MAP
+_state_map: Optional[Map] = None
+
+
+def _configure(kind: str, map_text: Optional[bytes]) -> None:
+    global _kind, _state_map
+    _kind = kind
+    _state_map = MAP_CACHE.get_from_json_text(map_text) if map_text is not None else None
+
+
+def validate_text(text: bytes, kind: str, trains_map: Optional[Map] = None) -> None:
+    """
+    Validate the JSON text of something of the given kind, where game states are states of a game on trains_map.
+    Maps are parsed through MAP_CACHE, so a map already seen is not parsed again.
+    Errors (usually ValueError) if the text is not JSON, or not valid for the kind.
+    """
+    if kind == MAP:
+        MAP_CACHE.get_from_json_text(text)
+        return
+    if trains_map is None:
+        raise ValueError("Game states can only be validated against a map.")
+    if kind == PLAYER_STATE:
+        PlayerStateTranslation.json_to_player_state(json.loads(text), trains_map)
+    elif kind == REFEREE_STATE:
+        RefereeStateTranslation.json_to_referee_state(json.loads(text), trains_map)
+    else:
+        raise ValueError(f"Kind must be one of {', '.join(KINDS)}.")
+
+
+def describe_error(error: Exception) -> Dict[str, Any]:
+    """
+    Turn an error raised while reading or validating a file into its structured (JSON) form:
+    {"type": "io" | "json" | "invalid", "message": str}, with the "line" and "column" of JSON syntax errors.
+    """
+    if isinstance(error, OSError):
+        return {"type": "io", "message": str(error)}
+    if isinstance(error, json.JSONDecodeError):
+        return {"type": "json", "message": error.msg, "line": error.lineno, "column": error.colno}
+    if isinstance(error, UnicodeDecodeError):
+        return {"type": "json", "message": str(error)}
+    return {"type": "invalid", "message": str(error)}
+
+
+def validate_file(path: str) -> Dict[str, Any]:
+    """
+    Validate one file (or stdin, for STDIN) with what the process was configured to validate.
+    Returns its result line: {"path": str, "valid": bool, "error": <see describe_error> or null, "seconds": float}.
+    """
+    start = time.perf_counter()
+    try:
+        if path == STDIN:
+            text = sys.stdin.buffer.read()
+        else:
+            with open(path, "rb") as f:
+                text = f.read()
+        validate_text(text, _kind, _state_map)
+        error = None
+    except Exception as e:
+        # anything a file can make validation raise (e.g. RecursionError for deeply nested JSON) is reported for that
+        # file alone, so one bad file never stops a batch
+        error = describe_error(e)
+    return {"path": path, "valid": error is None, "error": error, "seconds": time.perf_counter() - start}
+
+
+def find_files(paths: List[str], suffix: str = DEFAULT_SUFFIX) -> List[str]:
+    """
+    Expand the given paths into the files to validate: directories are searched recursively for files with the given
+    suffix, in sorted order, and any other path (including STDIN) is kept as is.
+    """
+    files = []
+    for path in paths:
+        if path != STDIN and os.path.isdir(path):
+            for directory, subdirectories, names in os.walk(path):
+                subdirectories.sort()
+                files.extend(os.path.join(directory, name) for name in sorted(names) if name.endswith(suffix))
+        else:
+            files.append(path)
+    return files
+
+
+def validate_files(
+    files: List[str],
+    kind: str = MAP,
+    *,
+    map_text: Optional[bytes] = None,
+    jobs: int = 1
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validate the given files, in up to jobs worker processes, and yield their results (see validate_file) in the
+    order of the files, as soon as they are known.
+    Game states are validated against the map of the given JSON text.
+    """
+    if jobs <= 1 or len(files) <= 1 or STDIN in files:
+        _configure(kind, map_text)
+        for path in files:
+            yield validate_file(path)
+        return
+    # imported here since only batches need it, and the CLI is started anew for every validation
+    from concurrent.futures import ProcessPoolExecutor
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(files) // (jobs * 4)))
+    with ProcessPoolExecutor(jobs, initializer=_configure, initargs=(kind, map_text)) as executor:
+        yield from executor.map(validate_file, files, chunksize=chunk_size)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Validate Trains JSON files, writing one JSON result line per file and a summary to stderr."
+    )
+    parser.add_argument("paths", nargs="*", default=[STDIN],
+                        help=f"files, directories (searched for --suffix files) or {STDIN} for stdin")
+    parser.add_argument("--kind", choices=KINDS, default=MAP)
+    parser.add_argument("--map", help="the map JSON file game states are validated against")
+    parser.add_argument("--suffix", default=DEFAULT_SUFFIX, help="suffix of the files to validate in directories")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    map_text = None
+    if args.kind != MAP:
+        if args.map is None:
+            parser.error(f"--map is required to validate {args.kind} files")
+        try:
+            with open(args.map, "rb") as f:
+                map_text = f.read()
+        except OSError as e:
+            parser.error(f"cannot read map {args.map}: {e}")
+        try:
+            MAP_CACHE.get_from_json_text(map_text)
+        except Exception as e:
+            parser.error(f"invalid map {args.map}: {e}")
+
+    start = time.perf_counter()
+    num_files = num_valid = 0
+    for result in validate_files(find_files(args.paths, args.suffix), args.kind, map_text=map_text, jobs=args.jobs):
+        print(json.dumps(result), flush=True)
+        num_files += 1
+        num_valid += result["valid"]
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "files": num_files,
+        "valid": num_valid,
+        "invalid": num_files - num_valid,
+        "seconds": elapsed,
+        "files_per_second": num_files / elapsed if elapsed else None,
+    }), file=sys.stderr)
+    return 0 if num_valid == num_files else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
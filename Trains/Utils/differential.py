@@ -0,0 +1,429 @@
+import argparse
+import json
+import random
+import sys
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from Trains.Admin.scoring import score_players
+from Trains.Common.constants import GAME
+from Trains.Common.map import (
+    COLORS, City, Color, Connection, Destination, Map, sort_connections, sort_destinations
+)
+from Trains.Common.map_builder import MapBuilder
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Translations.map_cache import MapCache
+from Trains.Translations.translations import (
+    ConnectionsTranslation, DestinationTranslation, MapTranslation, PlayerStateTranslation
+)
+from Trains.Utils.map_generator import generate_map
+
+DEFAULT_NUM_CASES = 1000
+MAX_CITIES = 10
+MAX_CARDS_PER_COLOR = 8
+
+
+class Case:
+    """
+    What every check runs on: a map, and the private state of each player of a game on it, in turn order.
+    A player's state is a dict of the keyword arguments of PlayerGameState (acquired_connections, destinations,
+    num_rails and cards). Players may have fewer than GAME.NUM_DESTINATIONS_PER_PLAYER destinations on maps with
+    too few of them.
+    """
+    def __init__(self, trains_map: Map, players: List[Dict[str, Any]]):
+        self.trains_map = trains_map
+        self.players = players
+
+    def get_player_game_states(self) -> List[PlayerGameState]:
+        total_conns = [player["acquired_connections"] for player in self.players]
+        return [
+            PlayerGameState.trusted(total_acquired_connections=total_conns, index=i, **player)
+            for i, player in enumerate(self.players)
+        ]
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Turns the case into JSON, so that a failing case can be reported and looked at.
+        """
+        return {
+            "map": MapTranslation.map_to_json(self.trains_map),
+            "players": [
+                {
+                    "acquired": [ConnectionsTranslation.acquired_to_json(c)
+                                 for c in sort_connections(player["acquired_connections"])],
+                    "destinations": [DestinationTranslation.destination_to_json(d)
+                                     for d in sort_destinations(player["destinations"])],
+                    "rails": player["num_rails"],
+                    "cards": {color.value: count for color, count in player["cards"].items() if count > 0},
+                }
+                for player in self.players
+            ],
+        }
+
+
+def generate_case(seed: int) -> Case:
+    """
+    Generate a random case: a small map of up to MAX_CITIES cities, in one or more components, and 1 to
+    GAME.MAX_PLAYERS_PER_GAME players owning random connections of it. The same seed always generates the same case.
+    """
+    rng = random.Random(seed)
+    num_cities = rng.randint(2, MAX_CITIES)
+    trains_map = generate_map(
+        num_cities,
+        edge_density=rng.uniform(1, 2),
+        num_components=rng.randint(1, max(1, num_cities // 3)),
+        seed=rng.randrange(2 ** 32)
+    )
+    num_players = rng.randint(1, GAME.MAX_PLAYERS_PER_GAME)
+    owned = [set() for _ in range(num_players)]
+    for connection in sort_connections(trains_map.get_connections()):
+        if rng.random() < 0.5:
+            owned[rng.randrange(num_players)].add(connection)
+    destinations = sort_destinations(trains_map.get_destinations())
+    players = [
+        {
+            "acquired_connections": owned[i],
+            "destinations": set(rng.sample(destinations, min(len(destinations), GAME.NUM_DESTINATIONS_PER_PLAYER))),
+            "num_rails": rng.randint(0, GAME.INITIAL_NUM_RAILS),
+            "cards": {color: rng.randint(0, MAX_CARDS_PER_COLOR) for color in Color.get_all_color_enums()},
+        }
+        for i in range(num_players)
+    ]
+    return Case(trains_map, players)
+
+
+def _city_map(connections: Iterable[Connection]) -> Dict[City, Set[City]]:
+    city_map = defaultdict(set)
+    for connection in connections:
+        city1, city2 = connection.get_cities()
+        city_map[city1].add(city2)
+        city_map[city2].add(city1)
+    return city_map
+
+
+def _reference_reachable(root: City, city_map: Dict[City, Set[City]]) -> Set[City]:
+    visited = {root}
+    queue = deque([root])
+    while queue:
+        for neighbor in city_map[queue.popleft()]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return visited
+
+
+def reference_destinations(cities: Iterable[City], connections: Iterable[Connection]) -> Set[Destination]:
+    """
+    Every pair of connected cities, found by a BFS from every city, as Map originally computed its destinations.
+    """
+    city_map = _city_map(connections)
+    destinations = set()
+    for city in cities:
+        for other in _reference_reachable(city, city_map):
+            if other != city:
+                destinations.add(Destination({city, other}))
+    return destinations
+
+
+def reference_can_acquire(player: Dict[str, Any], players: List[Dict[str, Any]], c: Connection,
+                          trains_map: Map) -> bool:
+    """
+    Whether the player can acquire the connection, by the rules checked one at a time against plain sets.
+    """
+    return (
+        player["num_rails"] >= c.get_length()
+        and player["cards"].get(c.get_color(), 0) >= c.get_length()
+        and c in trains_map.get_connections()
+        and all(c not in other["acquired_connections"] for other in players)
+    )
+
+
+def reference_longest_path(connections: Set[Connection]) -> int:
+    """
+    The total length of the longest trail (no connection used twice) over the connections, by walking every trail
+    from every city.
+    """
+    edges = [(tuple(c.get_cities()), c.get_length()) for c in connections]
+    stack = [(city, frozenset(), 0) for city in _city_map(connections)]
+    longest = 0
+    while stack:
+        city, used, length = stack.pop()
+        longest = max(longest, length)
+        for i, ((city1, city2), edge_length) in enumerate(edges):
+            if i not in used and city in (city1, city2):
+                stack.append((city2 if city == city1 else city1, used | {i}, length + edge_length))
+    return longest
+
+
+def reference_scores(players: List[Dict[str, Any]]) -> List[int]:
+    """
+    Every player's score at the end of a game, following the rules of score_players one player at a time.
+    """
+    scores = []
+    longest_paths = []
+    for player in players:
+        connections = player["acquired_connections"]
+        city_map = _city_map(connections)
+        score = sum(c.get_length() for c in connections)
+        for destination in player["destinations"]:
+            city1, city2 = destination.get_cities()
+            connected = city2 in _reference_reachable(city1, city_map)
+            score += GAME.DESTINATION_POINTS if connected else -GAME.DESTINATION_POINTS
+        scores.append(score)
+        longest_paths.append(reference_longest_path(connections))
+    return [
+        score + (GAME.LONGEST_PATH_POINTS if path > 0 and path == max(longest_paths) else 0)
+        for score, path in zip(scores, longest_paths)
+    ]
+
+
+def _removed_connections(case: Case) -> List[Connection]:
+    """
+    Every other connection of the map: the ones the builder check removes.
+    """
+    return sort_connections(case.trains_map.get_connections())[::2]
+
+
+def _builder_destinations(case: Case) -> Set[Destination]:
+    builder = MapBuilder.from_map(case.trains_map)
+    for connection in _removed_connections(case):
+        builder.remove_connection(connection)
+    return builder.get_destinations()
+
+
+def _reference_builder_destinations(case: Case) -> Set[Destination]:
+    removed = set(_removed_connections(case))
+    return reference_destinations(case.trains_map.get_cities(), case.trains_map.get_connections() - removed)
+
+
+def _candidate_connections(trains_map: Map) -> List[Connection]:
+    """
+    The map's connections, and connections that are not in the map between the same cities, in every other color.
+    """
+    connections = sort_connections(trains_map.get_connections())
+    others = [
+        Connection(c.get_cities(), length=c.get_length(), color=color)
+        for c in connections for color in COLORS
+        if color != c.get_color()
+    ]
+    return connections + [c for c in others if c not in trains_map.get_connections()]
+
+
+def _legality(case: Case) -> List[List[bool]]:
+    candidates = _candidate_connections(case.trains_map)
+    return [
+        [pgs.can_acquire_connection(c, case.trains_map) for c in candidates]
+        for pgs in case.get_player_game_states()
+    ]
+
+
+def _reference_legality(case: Case) -> List[List[bool]]:
+    candidates = _candidate_connections(case.trains_map)
+    return [
+        [reference_can_acquire(player, case.players, c, case.trains_map) for c in candidates]
+        for player in case.players
+    ]
+
+
+def _reference_obtainable(case: Case) -> List[Set[Connection]]:
+    return [
+        set(c for c in case.trains_map.get_connections()
+            if reference_can_acquire(player, case.players, c, case.trains_map))
+        for player in case.players
+    ]
+
+
+def _map_summary(trains_map: Map) -> Tuple[Any, ...]:
+    return (
+        trains_map.get_width(),
+        trains_map.get_height(),
+        trains_map.get_cities(),
+        trains_map.get_connections(),
+        trains_map.get_destinations(),
+    )
+
+
+def _cached_map_translation(case: Case) -> Tuple[Any, ...]:
+    map_as_text = json.dumps(MapTranslation.map_to_json(case.trains_map))
+    cache = MapCache()
+    cache.get_from_json_text(map_as_text)
+    # the second lookup is answered from the cache
+    return _map_summary(cache.get_from_json_text(map_as_text))
+
+
+def _translatable_players(case: Case) -> List[int]:
+    return [
+        i for i, player in enumerate(case.players)
+        if len(player["destinations"]) == GAME.NUM_DESTINATIONS_PER_PLAYER
+    ]
+
+
+def _reference_player_states(case: Case) -> List[Tuple[Any, ...]]:
+    total_conns = [player["acquired_connections"] for player in case.players]
+    return [
+        (
+            case.players[i]["acquired_connections"],
+            case.players[i]["destinations"],
+            case.players[i]["num_rails"],
+            {color: case.players[i]["cards"].get(color, 0) for color in Color.get_all_color_enums()},
+            total_conns[i:] + total_conns[:i],
+        )
+        for i in _translatable_players(case)
+    ]
+
+
+def _translated_player_states(case: Case) -> List[Tuple[Any, ...]]:
+    player_game_states = case.get_player_game_states()
+    output = []
+    for i in _translatable_players(case):
+        pgs = PlayerStateTranslation.json_to_player_state(
+            json.loads(json.dumps(PlayerStateTranslation.player_state_to_json(player_game_states[i]))),
+            case.trains_map
+        )
+        output.append((
+            pgs.get_acquired_connections(),
+            pgs.get_destinations(),
+            pgs.get_num_rails(),
+            pgs.get_cards(),
+            pgs.get_all_player_connections(),
+        ))
+    return output
+
+
+class Check:
+    """
+    A named comparison between a reference implementation and the optimized one, which must return equal results
+    for every case.
+    """
+    def __init__(self, name: str, reference: Callable[[Case], Any], optimized: Callable[[Case], Any]):
+        self.name = name
+        self.reference = reference
+        self.optimized = optimized
+
+
+CHECKS = [
+    Check("destinations",
+          lambda case: reference_destinations(case.trains_map.get_cities(), case.trains_map.get_connections()),
+          lambda case: case.trains_map.get_destinations()),
+    Check("builder_destinations", _reference_builder_destinations, _builder_destinations),
+    Check("legality", _reference_legality, _legality),
+    Check("obtainable_connections", _reference_obtainable,
+          lambda case: [pgs.get_all_obtainable_connections_for_player(case.trains_map)
+                        for pgs in case.get_player_game_states()]),
+    Check("scoring", lambda case: reference_scores(case.players),
+          lambda case: score_players(case.get_player_game_states())),
+    Check("map_translation",
+          lambda case: _map_summary(case.trains_map),
+          lambda case: _map_summary(MapTranslation.json_to_map(MapTranslation.map_to_json(case.trains_map)))),
+    Check("cached_map_translation", lambda case: _map_summary(case.trains_map), _cached_map_translation),
+    Check("player_state_translation", _reference_player_states, _translated_player_states),
+]
+
+
+def _run_side(side: Callable[[Case], Any], case: Case) -> Any:
+    # an error is a result like any other, so that both sides raising the same error agree
+    try:
+        return side(case)
+    except Exception as e:
+        return f"raised {e!r}"
+
+
+def find_difference(check: Check, case: Case) -> Optional[Tuple[Any, Any]]:
+    """
+    Run both sides of the check on the case, and return their results if they differ.
+    """
+    reference = _run_side(check.reference, case)
+    optimized = _run_side(check.optimized, case)
+    return None if reference == optimized else (reference, optimized)
+
+
+def _without_connection(case: Case, connection: Connection) -> Case:
+    trains_map = Map(case.trains_map.get_cities(), case.trains_map.get_connections() - {connection},
+                     height=case.trains_map.get_height(), width=case.trains_map.get_width())
+    players = [
+        dict(player, acquired_connections=player["acquired_connections"] - {connection}) for player in case.players
+    ]
+    return Case(trains_map, players)
+
+
+def _smaller_cases(case: Case) -> Iterator[Case]:
+    """
+    Every case one step smaller than the given one: without one of its players, connections, or cities that are in
+    no connection or destination.
+    """
+    if len(case.players) > 1:
+        for i in range(len(case.players)):
+            yield Case(case.trains_map, case.players[:i] + case.players[i + 1:])
+    for connection in sort_connections(case.trains_map.get_connections()):
+        yield _without_connection(case, connection)
+    used = set()
+    for connection in case.trains_map.get_connections():
+        used |= connection.get_cities()
+    for player in case.players:
+        for destination in player["destinations"]:
+            used |= destination.get_cities()
+    for city in sorted(case.trains_map.get_cities() - used, key=lambda city: city.get_name()):
+        trains_map = Map(case.trains_map.get_cities() - {city}, case.trains_map.get_connections(),
+                         height=case.trains_map.get_height(), width=case.trains_map.get_width())
+        yield Case(trains_map, case.players)
+
+
+def shrink(check: Check, case: Case) -> Case:
+    """
+    Shrink a case the check fails on, one step at a time, while the check still fails, so that the case reported
+    is (locally) minimal.
+    """
+    shrinking = True
+    while shrinking:
+        shrinking = False
+        for smaller in _smaller_cases(case):
+            if find_difference(check, smaller) is not None:
+                case = smaller
+                shrinking = True
+                break
+    return case
+
+
+def run_checks(seeds: Iterable[int], checks: Optional[List[Check]] = None) -> List[Dict[str, Any]]:
+    """
+    Run every check (CHECKS by default) on the case generated from each seed, and return a failure for every check
+    and seed where the reference and optimized implementations differ, with the shrunk case and both results.
+    """
+    checks = CHECKS if checks is None else checks
+    failures = []
+    for seed in seeds:
+        case = generate_case(seed)
+        for check in checks:
+            if find_difference(check, case) is None:
+                continue
+            shrunk = shrink(check, case)
+            reference, optimized = find_difference(check, shrunk)
+            failures.append({
+                "check": check.name,
+                "seed": seed,
+                "case": shrunk.to_json(),
+                "reference": repr(reference),
+                "optimized": repr(optimized),
+            })
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the optimized implementations of the game with reference ones on random cases."
+    )
+    parser.add_argument("--cases", type=int, default=DEFAULT_NUM_CASES, help="number of random cases")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first case; case i uses seed + i")
+    parser.add_argument("--only", nargs="+", help="names of the checks to run")
+    args = parser.parse_args(argv)
+
+    checks = [check for check in CHECKS if args.only is None or check.name in args.only]
+    failures = run_checks(range(args.seed, args.seed + args.cases), checks)
+    for failure in failures:
+        print(json.dumps(failure))
+    print(f"{args.cases} cases, {len(checks)} checks, {len(failures)} failures", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
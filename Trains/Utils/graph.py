@@ -0,0 +1,253 @@
+from array import array
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+# A mapping from every node to the nodes it has edges to; nodes missing from it have no edges, and undirected graphs
+# list every edge from both ends.
+# The csr_ functions take graphs in compressed sparse row form over integer node ids instead (see CityAdjacency): the
+# neighbors of node i are neighbors[offsets[i]:offsets[i + 1]], and edge_ids holds the id of the edge to each of them.
+# Every traversal marks nodes as seen when they are first reached, so each node is visited once.
+Graph = Mapping[T, Iterable[T]]
+
+
+def bfs_iter(root: T, graph: Graph) -> Iterator[T]:
+    """
+    Yield every node reachable from the root (the root first), in breadth-first order.
+    """
+    seen = {root}
+    frontier = deque([root])
+    while frontier:
+        node = frontier.popleft()
+        yield node
+        for neighbor in graph.get(node, ()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                frontier.append(neighbor)
+
+
+def dfs_iter(root: T, graph: Graph) -> Iterator[T]:
+    """
+    Yield every node reachable from the root (the root first), in depth-first preorder.
+    """
+    seen = {root}
+    yield root
+    stack = [iter(graph.get(root, ()))]
+    while stack:
+        for neighbor in stack[-1]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                yield neighbor
+                stack.append(iter(graph.get(neighbor, ())))
+                break
+        else:
+            stack.pop()
+
+
+def reachable(root: T, graph: Graph) -> Set[T]:
+    """
+    Return every node reachable from the root, including the root.
+    """
+    return set(bfs_iter(root, graph))
+
+
+def is_reachable(source: T, target: T, graph: Graph) -> bool:
+    """
+    Determine whether there is a path from the source to the target, stopping as soon as the target is reached.
+    """
+    return any(node == target for node in bfs_iter(source, graph))
+
+
+def connected_components(graph: Graph, nodes: Optional[Iterable[T]] = None) -> Dict[T, int]:
+    """
+    Label every node of an undirected graph with the id of its connected component, in one sweep. Components are
+    numbered in the order their first node comes in nodes (by default, the keys of the graph).
+    """
+    components: Dict[T, int] = {}
+    num_components = 0
+    for start in (graph if nodes is None else nodes):
+        if start in components:
+            continue
+        for node in bfs_iter(start, graph):
+            components[node] = num_components
+        num_components += 1
+    return components
+
+
+def to_csr(edges: Sequence[Tuple[T, T]]) -> Tuple[List[T], array, array, array]:
+    """
+    Turn a list of undirected edges, whose ids are their positions in the list, into compressed sparse row form.
+    Returns the nodes (in order of first appearance, their position being their id), offsets, neighbors and edge ids.
+    """
+    node_ids: Dict[T, int] = {}
+    ends = []
+    for edge in edges:
+        ends.append(tuple(node_ids.setdefault(node, len(node_ids)) for node in edge))
+    degrees = [0] * len(node_ids)
+    for node1, node2 in ends:
+        degrees[node1] += 1
+        degrees[node2] += 1
+    offsets = array("i", [0] * (len(node_ids) + 1))
+    for i, degree in enumerate(degrees):
+        offsets[i + 1] = offsets[i] + degree
+    neighbors = array("i", [0] * (2 * len(ends)))
+    edge_ids = array("i", [0] * (2 * len(ends)))
+    slots = list(offsets[:len(node_ids)])
+    for edge_id, (node1, node2) in enumerate(ends):
+        for node, neighbor in ((node1, node2), (node2, node1)):
+            neighbors[slots[node]] = neighbor
+            edge_ids[slots[node]] = edge_id
+            slots[node] += 1
+    return list(node_ids), offsets, neighbors, edge_ids
+
+
+def csr_bfs_iter(root: int, offsets: Sequence[int], neighbors: Sequence[int],
+                 edge_ids: Optional[Sequence[int]] = None, allowed_edges: Optional[int] = None) -> Iterator[int]:
+    """
+    Yield every node id reachable from the root (the root first), in breadth-first order.
+    If allowed_edges is given, only the edges whose bit is set in it (e.g. the bits of a ConnectionBitset) are used.
+    """
+    seen = bytearray(len(offsets) - 1)
+    seen[root] = 1
+    frontier = deque([root])
+    while frontier:
+        node = frontier.popleft()
+        yield node
+        for slot in range(offsets[node], offsets[node + 1]):
+            neighbor = neighbors[slot]
+            if not seen[neighbor] and (allowed_edges is None or allowed_edges >> edge_ids[slot] & 1):
+                seen[neighbor] = 1
+                frontier.append(neighbor)
+
+
+def csr_is_reachable(source: int, target: int, offsets: Sequence[int], neighbors: Sequence[int],
+                     edge_ids: Optional[Sequence[int]] = None, allowed_edges: Optional[int] = None) -> bool:
+    """
+    Determine whether there is a path from the source to the target (using only the allowed edges, if given),
+    stopping as soon as the target is reached.
+    """
+    return any(node == target for node in csr_bfs_iter(source, offsets, neighbors, edge_ids, allowed_edges))
+
+
+def csr_path_edges(source: int, target: int, offsets: Sequence[int], neighbors: Sequence[int],
+                   edge_ids: Sequence[int], allowed_edges: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Return the ids of the edges of a shortest path (by number of edges) from the source to the target, using only
+    the allowed edges if given, or None if there is no such path.
+    """
+    # the node each node was reached from, and the edge it was reached by
+    reached_by: Dict[int, Tuple[int, int]] = {source: (-1, -1)}
+    frontier = deque([source])
+    while frontier and target not in reached_by:
+        node = frontier.popleft()
+        for slot in range(offsets[node], offsets[node + 1]):
+            neighbor = neighbors[slot]
+            if neighbor not in reached_by and (allowed_edges is None or allowed_edges >> edge_ids[slot] & 1):
+                reached_by[neighbor] = (node, edge_ids[slot])
+                frontier.append(neighbor)
+    if target not in reached_by:
+        return None
+    path = []
+    node = target
+    while node != source:
+        node, edge = reached_by[node]
+        path.append(edge)
+    return path[::-1]
+
+
+def csr_component_ids(offsets: Sequence[int], neighbors: Sequence[int]) -> array:
+    """
+    Label every node id with the id of its connected component, in one sweep. Components are numbered in order of
+    their lowest node.
+    """
+    num_nodes = len(offsets) - 1
+    components = array("i", [-1] * num_nodes)
+    num_components = 0
+    for start in range(num_nodes):
+        if components[start] != -1:
+            continue
+        components[start] = num_components
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for slot in range(offsets[node], offsets[node + 1]):
+                neighbor = neighbors[slot]
+                if components[neighbor] == -1:
+                    components[neighbor] = num_components
+                    stack.append(neighbor)
+        num_components += 1
+    return components
+
+
+def csr_bridges_and_articulation_points(
+    offsets: Sequence[int],
+    neighbors: Sequence[int],
+    edge_ids: Sequence[int],
+    allowed_edges: Optional[int] = None,
+    roots: Optional[Iterable[int]] = None
+) -> Tuple[Set[int], Set[int]]:
+    """
+    Return the ids of the bridges (edges whose removal disconnects their component) and the articulation points
+    (nodes whose removal does) of an undirected graph, with Tarjan's low-link algorithm.
+    Iterative, so any graph size is fine, and edges are told apart by id, so parallel edges are never bridges.
+    If allowed_edges is given, only the edges whose bit is set in it are part of the graph. If roots are given, only
+    the components of those nodes are searched.
+    """
+    num_nodes = len(offsets) - 1
+    discovered = [-1] * num_nodes
+    low = [0] * num_nodes
+    bridges: Set[int] = set()
+    articulation_points: Set[int] = set()
+    time = 0
+    for root in (range(num_nodes) if roots is None else roots):
+        if discovered[root] != -1:
+            continue
+        discovered[root] = low[root] = time
+        time += 1
+        root_children = 0
+        # the path from the root: each node, the id of the edge it was reached by, and the next slot to look at
+        path_nodes, path_edges, path_slots = [root], [-1], [offsets[root]]
+        while path_nodes:
+            node, slot = path_nodes[-1], path_slots[-1]
+            if slot < offsets[node + 1]:
+                path_slots[-1] = slot + 1
+                edge = edge_ids[slot]
+                if edge == path_edges[-1] or (allowed_edges is not None and not allowed_edges >> edge & 1):
+                    continue
+                neighbor = neighbors[slot]
+                if discovered[neighbor] == -1:
+                    discovered[neighbor] = low[neighbor] = time
+                    time += 1
+                    if node == root:
+                        root_children += 1
+                    path_nodes.append(neighbor)
+                    path_edges.append(edge)
+                    path_slots.append(offsets[neighbor])
+                elif discovered[neighbor] < low[node]:
+                    low[node] = discovered[neighbor]
+                continue
+            path_nodes.pop()
+            path_slots.pop()
+            edge = path_edges.pop()
+            if not path_nodes:
+                break
+            parent = path_nodes[-1]
+            if low[node] < low[parent]:
+                low[parent] = low[node]
+            if low[node] > discovered[parent]:
+                bridges.add(edge)
+            if parent != root and low[node] >= discovered[parent]:
+                articulation_points.add(parent)
+        if root_children > 1:
+            articulation_points.add(root)
+    return bridges, articulation_points
+
+
+def bridges_and_articulation_points(edges: Sequence[Tuple[T, T]]) -> Tuple[Set[int], Set[T]]:
+    """
+    Return the bridges (as positions in the list of edges) and the articulation points of the undirected graph made
+    of the given edges. See csr_bridges_and_articulation_points.
+    """
+    nodes, offsets, neighbors, edge_ids = to_csr(edges)
+    bridges, articulation_points = csr_bridges_and_articulation_points(offsets, neighbors, edge_ids)
+    return bridges, {nodes[node] for node in articulation_points}
@@ -0,0 +1,260 @@
+import functools
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class OperationStats:
+    """
+    Counters for one instrumented operation.
+    total_time is inclusive (time spent in nested instrumented operations is counted for both), in seconds.
+    allocated_blocks is the net number of memory blocks still allocated when the operation returns, and is only
+    recorded when allocation tracking is on.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.allocated_blocks = 0
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "max_time": self.max_time,
+            "allocated_blocks": self.allocated_blocks,
+        }
+
+
+class Hook:
+    """
+    An attribute of a class (or module) to instrument under the given operation name.
+    If include_subclasses is True, the attribute is also instrumented on every subclass of owner that overrides it,
+    e.g. IStrategy.play for every strategy.
+    Errors with an AttributeError if owner has no such attribute, so that renaming a hooked attribute (e.g. a
+    name-mangled private method) breaks the hook loudly instead of silently instrumenting nothing.
+    """
+    def __init__(self, name: str, owner: Any, attribute: str, *, include_subclasses: bool = False):
+        if not hasattr(owner, attribute):
+            raise AttributeError(f"Cannot hook {name}: {owner!r} has no attribute {attribute!r}.")
+        self.name = name
+        self.owner = owner
+        self.attribute = attribute
+        self.include_subclasses = include_subclasses
+
+    def get_owners(self) -> List[Any]:
+        """
+        Return every owner that defines this attribute itself (so the hook patches each definition once).
+        """
+        owners = [self.owner]
+        if self.include_subclasses and isinstance(self.owner, type):
+            to_visit = list(self.owner.__subclasses__())
+            while to_visit:
+                subclass = to_visit.pop()
+                owners.append(subclass)
+                to_visit.extend(subclass.__subclasses__())
+        return [owner for owner in owners if self.attribute in vars(owner)]
+
+
+class Instrumentation:
+    """
+    Opt-in timing counters for hot operations.
+
+    When disabled, the hooked attributes are the original functions, so instrumentation costs nothing. enable()
+    swaps each hooked attribute for a wrapper that counts calls, time and (optionally) allocations; disable() puts
+    the originals back.
+    """
+    def __init__(self):
+        self.__hooks: List[Hook] = []
+        self.__stats: Dict[str, OperationStats] = {}
+        self.__patched: List[Tuple[Any, str, Any]] = []
+        self.__lock = threading.Lock()
+        self.__track_allocations = False
+        self.enabled = False
+
+    def add_hook(self, hook: Hook) -> None:
+        """
+        Register a hook. Takes effect on the next enable().
+        """
+        self.__hooks.append(hook)
+
+    def get_hooks(self) -> List[Hook]:
+        return list(self.__hooks)
+
+    def enable(self, *, track_allocations: bool = False) -> None:
+        """
+        Start recording every registered hook.
+        """
+        if self.enabled:
+            self.disable()
+        self.__track_allocations = track_allocations
+        for hook in self.__hooks:
+            for owner in hook.get_owners():
+                original = vars(owner)[hook.attribute]
+                setattr(owner, hook.attribute, self.__wrap(hook.name, original))
+                self.__patched.append((owner, hook.attribute, original))
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stop recording and restore the original attributes. Recorded stats are kept until reset().
+        """
+        for owner, attribute, original in reversed(self.__patched):
+            setattr(owner, attribute, original)
+        self.__patched = []
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Forget all recorded stats.
+        """
+        with self.__lock:
+            self.__stats = {}
+
+    def record(self, name: str, elapsed: float, allocated_blocks: int = 0) -> None:
+        """
+        Add one call of the given operation to the stats.
+        """
+        with self.__lock:
+            stats = self.__stats.get(name)
+            if stats is None:
+                stats = self.__stats[name] = OperationStats()
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            stats.allocated_blocks += allocated_blocks
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """
+        Record the enclosed block as one call of the given operation, if instrumentation is enabled.
+        """
+        if not self.enabled:
+            yield
+            return
+        blocks = sys.getallocatedblocks() if self.__track_allocations else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.__track_allocations:
+                blocks = sys.getallocatedblocks() - blocks
+            self.record(name, elapsed, blocks)
+
+    def __wrap(self, name: str, original: Any) -> Any:
+        """
+        Wrap a function (or staticmethod/classmethod) so that every call is recorded under name.
+        """
+        if isinstance(original, (staticmethod, classmethod)):
+            return type(original)(self.__wrap(name, original.__func__))
+
+        timed = self.timed
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return original(*args, **kwargs)
+        return wrapper
+
+    def get_stats(self) -> Dict[str, OperationStats]:
+        with self.__lock:
+            return dict(self.__stats)
+
+    def to_json(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the recorded stats as JSON, keyed by operation name.
+        """
+        return {name: stats.to_json() for name, stats in sorted(self.get_stats().items())}
+
+    def dump_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f, indent=2)
+
+    def report(self) -> str:
+        """
+        Return a plain text table of the recorded stats, slowest operation (by total time) first.
+        """
+        rows = sorted(self.get_stats().items(), key=lambda item: item[1].total_time, reverse=True)
+        name_width = max([len("operation")] + [len(name) for name, _ in rows])
+        lines = [f"{'operation':<{name_width}} {'calls':>10} {'total ms':>12} {'mean us':>12} {'max us':>12} "
+                 f"{'blocks':>10}"]
+        for name, stats in rows:
+            mean = stats.total_time / stats.calls if stats.calls else 0.0
+            lines.append(f"{name:<{name_width}} {stats.calls:>10} {stats.total_time * 1e3:>12.3f} "
+                         f"{mean * 1e6:>12.1f} {stats.max_time * 1e6:>12.1f} {stats.allocated_blocks:>10}")
+        return "\n".join(lines)
+
+
+def add_default_hooks(instrumentation: Instrumentation) -> None:
+    """
+    Register the hot operations of the game: map construction and destinations, connection legality, strategy
+    decisions and translations.
+    Imports are local so that importing this module does not import the whole game.
+    """
+    from Trains.Common.map import Map
+    from Trains.Common.player_game_state import PlayerGameState
+    from Trains.Player.strategy import IStrategy
+    from Trains.Translations.translations import (
+        CityTranslation, ConnectionsTranslation, DestinationTranslation, MapTranslation
+    )
+
+    hooks = [
+        Hook("Map.__init__", Map, "__init__"),
+        Hook("Map.calculate_all_destinations", Map, "_Map__calculate_all_destinations"),
+        Hook("Map.get_destinations", Map, "get_destinations"),
+        Hook("Map.copy", Map, "copy"),
+        Hook("PlayerGameState.can_acquire_connection", PlayerGameState, "can_acquire_connection"),
+        Hook("PlayerGameState.get_all_obtainable_connections_for_player", PlayerGameState,
+             "get_all_obtainable_connections_for_player"),
+        Hook("PlayerGameState.obtain_connection", PlayerGameState, "obtain_connection"),
+        Hook("IStrategy.setup", IStrategy, "setup", include_subclasses=True),
+        Hook("IStrategy.pick", IStrategy, "pick", include_subclasses=True),
+        Hook("IStrategy.play", IStrategy, "play", include_subclasses=True),
+    ]
+    for translation in [CityTranslation, ConnectionsTranslation, DestinationTranslation, MapTranslation]:
+        for attribute in vars(translation):
+            if "_to_" in attribute:
+                hooks.append(Hook(f"{translation.__name__}.{attribute}", translation, attribute))
+    for hook in hooks:
+        instrumentation.add_hook(hook)
+
+
+INSTRUMENTATION = Instrumentation()
+_default_hooks_added = False
+
+
+def enable(*, track_allocations: bool = False) -> Instrumentation:
+    """
+    Enable the shared instrumentation with the default hooks (added on first use).
+    """
+    global _default_hooks_added
+    if not _default_hooks_added:
+        add_default_hooks(INSTRUMENTATION)
+        _default_hooks_added = True
+    INSTRUMENTATION.enable(track_allocations=track_allocations)
+    return INSTRUMENTATION
+
+
+def disable() -> None:
+    INSTRUMENTATION.disable()
+
+
+@contextmanager
+def instrumented(*, track_allocations: bool = False) -> Iterator[Instrumentation]:
+    """
+    Enable the shared instrumentation for the enclosed block, e.g.:
+
+        with instrumented() as stats:
+            run_game()
+        print(stats.report())
+    """
+    instrumentation = enable(track_allocations=track_allocations)
+    try:
+        yield instrumentation
+    finally:
+        disable()
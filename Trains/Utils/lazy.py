@@ -0,0 +1,25 @@
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Make the module-level __getattr__ and __dir__ (PEP 562) of a package whose exports are only imported on first
+    access: exports maps each exported name to the submodule defining it, relative to the package.
+    Importing the package then imports none of its submodules, so that short-lived processes only pay for what they
+    use.
+
+    ASSUMPTION: Every submodule in exports defines the names mapped to it.
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package}.{exports[name]}"), name)
+        # cached in the package, so that __getattr__ is only called on first access
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(importlib.import_module(package))) | set(exports))
+
+    return __getattr__, __dir__
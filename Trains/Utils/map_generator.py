@@ -0,0 +1,174 @@
+import math
+import random
+from typing import List, Optional, Set, Tuple
+
+from Trains.Common.constants import CONNECTION, MAP
+from Trains.Common.map import COLORS, City, Connection, Map
+
+
+def generate_cities(
+    num_cities: int,
+    *,
+    width: int = MAP.MAX_WIDTH,
+    height: int = MAP.MAX_HEIGHT,
+    rng: Optional[random.Random] = None
+) -> List[City]:
+    """
+    Generate num_cities cities with unique names and unique coordinates within a width x height map.
+
+    The map is split into a uniform grid with at least num_cities cells, and each city is placed at a random point
+    inside its own randomly chosen cell, so no two cities can ever collide and no retries are needed.
+    """
+    rng = rng if rng else random.Random()
+    num_points = (width + 1) * (height + 1)
+    if not (isinstance(num_cities, int) and 0 <= num_cities <= num_points):
+        raise ValueError(f"Number of cities must be an int between 0 and {num_points}.")
+    if num_cities == 0:
+        return []
+
+    cell_size = max(1, int(math.sqrt(num_points / num_cities)))
+    while ((width + 1) // cell_size) * ((height + 1) // cell_size) < num_cities:
+        cell_size -= 1
+    num_cols = (width + 1) // cell_size
+
+    name_digits = len(str(num_cities - 1))
+    cities = []
+    for i, cell in enumerate(rng.sample(range(num_cols * ((height + 1) // cell_size)), num_cities)):
+        row, col = divmod(cell, num_cols)
+        x = col * cell_size + rng.randrange(cell_size)
+        y = row * cell_size + rng.randrange(cell_size)
+        cities.append(City(f"city{i:0{name_digits}d}", x, y))
+    return cities
+
+
+def split_into_components(cities: List[City], num_components: int, rng: random.Random) -> List[List[City]]:
+    """
+    Randomly partition the cities into num_components groups of (nearly) equal size.
+    """
+    if not (isinstance(num_components, int) and 1 <= num_components <= max(1, len(cities))):
+        raise ValueError("Number of components must be an int between 1 and the number of cities.")
+    shuffled = list(cities)
+    rng.shuffle(shuffled)
+    base_size, num_bigger = divmod(len(shuffled), num_components)
+    components = []
+    start = 0
+    for i in range(num_components):
+        size = base_size + (1 if i < num_bigger else 0)
+        components.append(shuffled[start:start + size])
+        start += size
+    return components
+
+
+def generate_connections(
+    cities: List[City],
+    *,
+    edge_density: float = 1.5,
+    num_components: int = 1,
+    rng: Optional[random.Random] = None
+) -> Set[Connection]:
+    """
+    Generate connections between the given cities such that the cities form exactly num_components connected
+    components.
+
+    Each component is first connected with a random spanning tree, then extra connections (between random pairs of
+    cities within the same component, in random colors and lengths) are added until the total number of connections
+    is edge_density * len(cities). Two connections never share both their cities and their color, so the result
+    always survives a round trip through the JSON representation of connections.
+    """
+    rng = rng if rng else random.Random()
+    if not (isinstance(edge_density, (int, float)) and edge_density >= 0):
+        raise ValueError("Edge density must be a non-negative number.")
+    components = split_into_components(cities, num_components, rng)
+
+    capacities = [len(c) * (len(c) - 1) // 2 * len(COLORS) for c in components]
+    num_tree_edges = sum(max(0, len(c) - 1) for c in components)
+    num_connections = max(num_tree_edges, round(edge_density * len(cities)))
+    if num_connections > sum(capacities):
+        raise ValueError(f"Cannot fit {num_connections} connections into {num_components} components "
+                         f"of {len(cities)} cities.")
+
+    # how many connections go in each component, proportional to the room the component has
+    num_extra = num_connections - num_tree_edges
+    free = [cap - max(0, len(c) - 1) for cap, c in zip(capacities, components)]
+    total_free = sum(free)
+    extra_per_component = [num_extra * f // total_free if total_free else 0 for f in free]
+    leftover = num_extra - sum(extra_per_component)
+    for i in sorted(range(len(components)), key=lambda j: free[j] - extra_per_component[j], reverse=True):
+        if leftover == 0:
+            break
+        if extra_per_component[i] < free[i]:
+            extra_per_component[i] += 1
+            leftover -= 1
+
+    connections = set()
+    for component, num_component_extra in zip(components, extra_per_component):
+        used = set()
+        for i in range(1, len(component)):
+            pair = (i, rng.randrange(i))
+            color_idx = rng.randrange(len(COLORS))
+            used.add((pair, color_idx))
+        used.update(_sample_extra_edges(len(component), num_component_extra, used, rng))
+
+        for (i, j), color_idx in used:
+            connections.add(
+                Connection(
+                    {component[i], component[j]},
+                    length=rng.choice(CONNECTION.LENGTHS),
+                    color=COLORS[color_idx]
+                )
+            )
+    return connections
+
+
+def _sample_extra_edges(
+    num_cities: int,
+    num_edges: int,
+    used: Set[Tuple[Tuple[int, int], int]],
+    rng: random.Random
+) -> Set[Tuple[Tuple[int, int], int]]:
+    """
+    Sample num_edges (pair, color) slots among num_cities cities that are not already in used.
+    Pairs are (i, j) with i > j.
+    """
+    free_slots = num_cities * (num_cities - 1) // 2 * len(COLORS) - len(used)
+    if num_edges * 2 > free_slots:
+        # dense: enumerate every free slot and sample from them
+        candidates = [
+            ((i, j), color_idx)
+            for i in range(num_cities)
+            for j in range(i)
+            for color_idx in range(len(COLORS))
+            if ((i, j), color_idx) not in used
+        ]
+        return set(rng.sample(candidates, num_edges))
+
+    # sparse: rejection sampling needs at most 2 tries per edge on average
+    output = set()
+    while len(output) < num_edges:
+        i, j = rng.sample(range(num_cities), 2)
+        slot = ((max(i, j), min(i, j)), rng.randrange(len(COLORS)))
+        if slot not in used and slot not in output:
+            output.add(slot)
+    return output
+
+
+def generate_map(
+    num_cities: int,
+    *,
+    edge_density: float = 1.5,
+    num_components: int = 1,
+    seed: Optional[int] = None,
+    width: int = MAP.MAX_WIDTH,
+    height: int = MAP.MAX_HEIGHT
+) -> Map:
+    """
+    Generate a random, valid Map with the given number of cities, connections per city and connected components.
+    The same seed always generates the same Map.
+
+    NOTE: Map computes every Destination up front, which is quadratic in the size of each component. Big maps should
+    therefore be split into many components (e.g. 10,000 cities in 100 components).
+    """
+    rng = random.Random(seed)
+    cities = generate_cities(num_cities, width=width, height=height, rng=rng)
+    connections = generate_connections(cities, edge_density=edge_density, num_components=num_components, rng=rng)
+    return Map(set(cities), connections, height=height, width=width)
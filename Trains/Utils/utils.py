@@ -1,5 +1,7 @@
 from typing import TypeVar, Set, Dict
 
+from Trains.Utils.graph import reachable
+
 T = TypeVar("T")
 
 
@@ -11,12 +13,4 @@ def bfs(root: T, root_to_neighbors: Dict[T, Set[T]]) -> Set[T]:
     ASSUMPTION: Assumes directed graph. This means the keys are the starting city, and the edges go in the direction
     "towards" the city in the set of values.
     """
-    frontier = [root]
-    seen_cities = set()
-    while frontier:
-        city = frontier.pop(0)
-        seen_cities.add(city)
-        for neighbor in root_to_neighbors.get(city, set()):
-            if neighbor not in seen_cities:
-                frontier.append(neighbor)
-    return seen_cities
+    return reachable(root, root_to_neighbors)